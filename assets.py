@@ -1,19 +1,149 @@
+"""
+Asset manager for Zombie Dungeon Escape
+Procedural textures, sprites and UI pieces packed into one atlas surface
+
+Every asset is drawn once, packed into a single atlas that is converted to
+the display's pixel format, and handed out as a subsurface of it. The baked
+atlas is saved as atlas-<key>.bmp (plus a .json layout) in the cache
+directory; the key hashes this module's source and the size settings, so
+changing how an asset is drawn simply bakes a new atlas. The image is left
+uncompressed because decoding a PNG costs about as much as drawing
+everything again.
+"""
+
+import hashlib
+import json
+import os
 import pygame
 from settings import *
 
+ATLAS_WIDTH = 256  # Pixels; assets are packed in rows (shelves) below each other
+
+def default_cache_dir():
+    """Per-user cache directory for baked assets"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'zombie-dungeon-escape')
+
+ASSET_CACHE_DIR = default_cache_dir()
+
+def atlas_key():
+    """Hash of everything the baked atlas depends on"""
+    digest = hashlib.sha256()
+    with open(__file__, 'rb') as f:
+        digest.update(f.read())
+    digest.update(repr((TEXTURE_SIZE, SKILL_ICON_SIZE, ATLAS_WIDTH, pygame.version.ver)).encode())
+    return digest.hexdigest()[:16]
+
+def pack_shelves(sizes, width):
+    """Place (w, h) boxes left to right in rows; return their (x, y) and the total height"""
+    positions = []
+    x = y = row_height = 0
+    for w, h in sizes:
+        if x + w > width:
+            x, y, row_height = 0, y + row_height, 0
+        positions.append((x, y))
+        x += w
+        row_height = max(row_height, h)
+    return positions, y + row_height
+
 class AssetManager:
-    def __init__(self):
-        """Initialize the asset manager with texture loading"""
+    CATEGORIES = ('textures', 'sprites', 'skill_icons', 'ui_elements')
+    
+    def __init__(self, cache_dir=ASSET_CACHE_DIR):
+        """Initialize the asset manager, loading the atlas from cache_dir if baked
+        
+        cache_dir=None always draws the assets and never touches the disk.
+        """
         self.textures = {}
         self.sprites = {}
         self.skill_icons = {}
         self.ui_elements = {}
+        self.atlas = None  # Surface holding every asset
+        self.regions = {}  # (category, name) -> (Rect in the atlas, surface alpha or None)
+        self.key = atlas_key()
+        self.loaded_from_cache = cache_dir is not None and self.load_atlas(cache_dir)
         
-        # Load all assets
+        if not self.loaded_from_cache:
+            self.bake_atlas()
+            if cache_dir is not None:
+                self.save_atlas(cache_dir)
+        
+        # One conversion for every asset; blits then copy pixels as they are
+        if pygame.display.get_surface() is not None:
+            self.atlas = self.atlas.convert()
+        self.slice_atlas()
+    
+    def bake_atlas(self):
+        """Draw every asset and pack them into a new atlas"""
         self.create_textures()
         self.create_sprites()
         self.create_skill_icons()
         self.create_ui_elements()
+        
+        entries = [(category, name, surface) for category in self.CATEGORIES
+                   for name, surface in getattr(self, category).items()]
+        positions, height = pack_shelves([surface.get_size() for _, _, surface in entries], ATLAS_WIDTH)
+        self.atlas = pygame.Surface((ATLAS_WIDTH, height))
+        for (category, name, surface), position in zip(entries, positions):
+            alpha = surface.get_alpha()
+            surface.set_alpha(None)  # Copy the raw pixels; the alpha goes on the subsurface
+            self.atlas.blit(surface, position)
+            self.regions[(category, name)] = (pygame.Rect(position, surface.get_size()), alpha)
+    
+    def slice_atlas(self):
+        """Point every asset dictionary at subsurfaces of the atlas"""
+        for (category, name), (rect, alpha) in self.regions.items():
+            surface = self.atlas.subsurface(rect)
+            if alpha is not None:
+                surface.set_alpha(alpha)
+            getattr(self, category)[name] = surface
+    
+    def cache_paths(self, cache_dir):
+        base = os.path.join(cache_dir, f"atlas-{self.key}")
+        return base + '.bmp', base + '.json'
+    
+    def load_atlas(self, cache_dir):
+        """Load a baked atlas and its layout; False if missing or unusable"""
+        image_path, layout_path = self.cache_paths(cache_dir)
+        try:
+            with open(layout_path) as f:
+                layout = json.load(f)
+            atlas = pygame.image.load(image_path)
+            regions = {}
+            for entry in layout['regions']:
+                if entry['category'] not in self.CATEGORIES:
+                    return False
+                rect = pygame.Rect(entry['rect'])
+                if not atlas.get_rect().contains(rect):
+                    return False
+                regions[(entry['category'], entry['name'])] = (rect, entry['alpha'])
+        except (OSError, ValueError, KeyError, TypeError, pygame.error):
+            return False
+        if layout.get('key') != self.key:
+            return False
+        self.atlas = atlas
+        self.regions = regions
+        return True
+    
+    def save_atlas(self, cache_dir):
+        """Write the baked atlas to the cache (best effort)"""
+        image_path, layout_path = self.cache_paths(cache_dir)
+        layout = {
+            'key': self.key,
+            'regions': [{'category': category, 'name': name, 'rect': list(rect), 'alpha': alpha}
+                        for (category, name), (rect, alpha) in self.regions.items()],
+        }
+        # Write under temporary names and rename, so a reader never sees half a file
+        suffix = f".{os.getpid()}.tmp"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            pygame.image.save(self.atlas, image_path[:-4] + suffix + '.bmp')
+            with open(layout_path + suffix, 'w') as f:
+                json.dump(layout, f)
+            os.replace(image_path[:-4] + suffix + '.bmp', image_path)
+            os.replace(layout_path + suffix, layout_path)
+        except (OSError, pygame.error):
+            pass  # No cache this time; the next startup bakes again
     
     def create_textures(self):
         """Create dungeon-style textures (32x32 pixels)"""
@@ -241,4 +371,9 @@ class AssetManager:
     
     def get_ui_element(self, name):
         """Get UI element by name"""
-        return self.ui_elements.get(name)
\ No newline at end of file
+        return self.ui_elements.get(name)
+    
+    def get_region(self, category, name):
+        """Atlas surface and the rect of an asset in it, for area blits"""
+        rect, _ = self.regions[(category, name)]
+        return self.atlas, rect
\ No newline at end of file
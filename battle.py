@@ -3,8 +3,9 @@ import random
 from settings import *
 
 class BattleSystem:
-    def __init__(self):
+    def __init__(self, rng=None):
         """Initialize the modern battle system with UI integration"""
+        self.rng = rng if rng is not None else random  # Dice and special rolls
         self.in_battle = False
         self.player = None
         self.zombie_info = {
@@ -102,7 +103,7 @@ class BattleSystem:
         if not self.player:
             return
             
-        attack_roll = random.randint(DICE_MIN, DICE_MAX)
+        attack_roll = self.rng.randint(DICE_MIN, DICE_MAX)
         base_damage = self.player.get_attack_power()
         total_damage = base_damage + attack_roll
         
@@ -147,15 +148,15 @@ class BattleSystem:
             return
             
         # Special: Buff attack for next turn or find item
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
             # Attack buff
             self.battle_log.append("Player focuses! Next attack deals extra damage!")
             # This would be implemented with a buff system
         else:
             # Find item
             from items import Item
-            item_type = random.choice(['potion', 'sword', 'shield'])
-            item = Item(item_type)
+            item_type = self.rng.choice(['potion', 'sword', 'shield'])
+            item = Item(item_type, rng=self.rng)
             if self.player.add_to_inventory(item):
                 self.battle_log.append(f"Found {item.name}!")
             else:
@@ -221,7 +222,7 @@ class BattleSystem:
             return
             
         # Zombie attacks
-        attack_roll = random.randint(DICE_MIN, DICE_MAX)
+        attack_roll = self.rng.randint(DICE_MIN, DICE_MAX)
         base_damage = self.zombie_info['attack'] + attack_roll
         
         # Apply defense if player was defending
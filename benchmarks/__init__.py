@@ -0,0 +1,4 @@
+"""
+Benchmarks for Zombie Dungeon Escape
+Run from the project root, e.g. python -m benchmarks.bench_tilemap
+"""
@@ -0,0 +1,38 @@
+"""
+Asset benchmark: drawing every asset vs loading the baked atlas from the
+disk cache, and blitting standalone unconverted surfaces vs atlas regions
+"""
+
+import tempfile
+import pygame
+from benchmarks.common import init_display, time_call, print_row
+
+from settings import *
+from assets import AssetManager
+
+def run(blits=1024):
+    screen = init_display()
+    target = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        AssetManager(cache_dir)  # Bake once so the next ones load
+        mean, best = time_call(lambda: AssetManager(cache_dir=None), repeat=20)
+        print_row("bake atlas", mean, best)
+        mean, best = time_call(lambda: AssetManager(cache_dir), repeat=20)
+        print_row("load cached atlas", mean, best)
+    
+    assets = AssetManager(cache_dir=None)
+    raw = pygame.Surface((TEXTURE_SIZE, TEXTURE_SIZE), depth=24)  # Not the display format
+    raw.blit(assets.get_texture('wall'), (0, 0))
+    atlas, rect = assets.get_region('textures', 'wall')
+    columns = SCREEN_WIDTH // TEXTURE_SIZE
+    positions = [(i % columns * TEXTURE_SIZE, i // columns % 16 * TEXTURE_SIZE) for i in range(blits)]
+    print(f"display {screen.get_bitsize()}-bit, atlas {atlas.get_bitsize()}-bit")
+    
+    mean, best = time_call(lambda: [target.blit(raw, position) for position in positions])
+    print_row(f"{blits} blits unconverted 24-bit", mean, best)
+    mean, best = time_call(lambda: [target.blit(atlas, position, rect) for position in positions])
+    print_row(f"{blits} blits atlas region", mean, best)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,54 @@
+"""
+Dirty-rectangle benchmark: a scripted stretch of level play drawn with full
+redraws and flips vs redrawing and pushing only the rects that changed
+
+The same seed and key presses drive both runs. Pixels pushed counts the
+screen area sent to the display per frame, which is what a slow display
+path (software rendering on a kiosk) pays for.
+"""
+
+import random
+import time
+import pygame
+from benchmarks.common import init_display
+
+from settings import *
+from main import Game
+
+MOVE_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT)
+
+def play(dirty_rects, frames, seed=1234):
+    """Draw frames of scripted play; return (draw seconds per frame, pixels pushed per frame)"""
+    game = Game(seed=seed, dirty_rects=dirty_rects, preload=False)
+    rng = random.Random(seed)
+    pushed = []
+    flip, update = pygame.display.flip, pygame.display.update
+    pygame.display.flip = lambda: (pushed.append(SCREEN_WIDTH * SCREEN_HEIGHT), flip())
+    pygame.display.update = lambda rects: (pushed.append(sum(rect.width * rect.height for rect in rects)),
+                                           update(rects))
+    elapsed = 0.0
+    try:
+        for frame in range(frames):
+            if game.game_state == "PLAYING":
+                keys = [rng.choice(MOVE_KEYS)] if frame % 4 == 0 else []
+            else:
+                keys = [pygame.K_q] if game.game_state == "BATTLE" else [pygame.K_r]
+            game.step(keys)
+            start = time.perf_counter()
+            game.draw((frame % 4) / 4)
+            elapsed += time.perf_counter() - start
+    finally:
+        pygame.display.flip, pygame.display.update = flip, update
+        game.level_preloader.shutdown()
+    return elapsed / frames, sum(pushed) / len(pushed)
+
+def run(frames=1000):
+    init_display()
+    print(f"{'mode':<24} {'draw':>12} {'pixels pushed':>16}")
+    for dirty_rects in (False, True):
+        seconds, pixels = play(dirty_rects, frames)
+        mode = "dirty rects" if dirty_rects else "full redraw + flip"
+        print(f"{mode:<24} {seconds * 1000:9.3f} ms {pixels:13.0f} px")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,46 @@
+"""
+Endless dungeon benchmark: chunk generation cost and memory while travelling
+"""
+
+import random
+import tracemalloc
+from benchmarks.common import time_call, print_row
+
+from chunked_world import ChunkedMaze, EndlessLabyrinth
+from fog_of_war import ChunkedFogOfWar
+from maze_generators import GENERATORS
+
+def travel(labyrinth, fog_of_war, steps, stride):
+    """Jump the view diagonally across the world, streaming as the game does"""
+    maze = labyrinth.maze
+    x = y = 1
+    for _ in range(steps):
+        x += stride
+        y += stride
+        while not maze.is_walkable(x, y):
+            x += 1
+        labyrinth.update(x, y)
+        labyrinth.take_dropped()
+        fog_of_war.update_visibility(x, y, maze)
+
+def run(chunk_sizes=(16, 32, 64), steps=(100, 1000)):
+    for chunk_tiles in chunk_sizes:
+        for name in GENERATORS:
+            chunk = iter(range(10 ** 9))
+            maze = ChunkedMaze(0, chunk_tiles, generator=name)
+            mean, best = time_call(lambda: maze._generate(next(chunk), 0), repeat=20)
+            print_row(f"{name} chunk {chunk_tiles}x{chunk_tiles}", mean, best)
+    
+    # Memory after travelling n steps should not grow with n
+    for count in steps:
+        tracemalloc.start()
+        labyrinth = EndlessLabyrinth(random.Random(count).getrandbits(32))
+        fog_of_war = ChunkedFogOfWar()
+        travel(labyrinth, fog_of_war, count, 40)
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"after {count} chunk hops: {len(labyrinth.maze.chunks)} maze chunks, "
+              f"{len(fog_of_war.explored)} fog chunks, {current / 1024:.0f} KiB traced")
+
+if __name__ == "__main__":
+    run()
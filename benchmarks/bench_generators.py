@@ -0,0 +1,48 @@
+"""
+Maze generator benchmark: every registered generator on the same MazeGrid
+sizes, plus Eller's algorithm streamed with no grid at all
+"""
+
+import random
+import time
+import tracemalloc
+from benchmarks.common import time_call, print_row
+
+from maze_grid import MazeGrid, FLOOR
+from maze_tree import MazeTreeIndex
+from maze_generators import GENERATORS, eller_rows
+
+def run(sizes=(21, 101, 301, 1001), stream_size=(4001, 4001), budget=2.0):
+    for size in sizes:
+        for name, generator in GENERATORS.items():
+            # Sanity check: every generator must carve a perfect maze
+            maze = MazeGrid(size, size)
+            generator(maze, random.Random(size))
+            assert MazeTreeIndex(maze).is_tree, name
+            
+            def fresh_maze():
+                nonlocal maze
+                maze = MazeGrid(size, size)
+            mean, best = time_call(lambda: generator(maze, random.Random(size)),
+                                   repeat=10, warmup=0, setup=fresh_maze, budget=budget)
+            print_row(f"{name} {size}x{size}", mean, best)
+    
+    # Streaming: rows are consumed and dropped, so memory is O(width)
+    width, height = stream_size
+    start = time.perf_counter()
+    floor_tiles = 0
+    for row in eller_rows(width, height, random.Random(0)):
+        floor_tiles += row.count(FLOOR)
+    elapsed = time.perf_counter() - start
+    print(f"eller streamed {width}x{height}: {elapsed:.2f} s, {floor_tiles} floor tiles")
+    
+    # Peak memory depends only on the width (tracemalloc is slow, so keep it short)
+    tracemalloc.start()
+    for row in eller_rows(width, 101, random.Random(0)):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"eller streamed {width} wide: peak {peak / 1024:.0f} KiB")
+
+if __name__ == "__main__":
+    run()
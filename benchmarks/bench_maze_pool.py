@@ -0,0 +1,39 @@
+"""
+Maze pool benchmark: generating a level vs loading it from a memory-mapped
+pool of pre-generated mazes
+"""
+
+import os
+import random
+import tempfile
+from benchmarks.common import time_call, print_row
+
+from labyrinth import Labyrinth
+from maze_pool import MazePool, build_pool
+
+def run(sizes=((20, 15), (81, 61), (301, 301), (1001, 1001)), count=4):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.pool')
+        build_pool(path, sizes, count)
+        print(f"pool of {count * len(sizes)} mazes: {os.path.getsize(path) / 1024:.0f} KiB")
+        pool = MazePool(path)
+        
+        for width, height in sizes:
+            label = f"{width}x{height}"
+            record = pool[pool.by_size()[(width, height)][0]]
+            
+            mean, best = time_call(
+                lambda: Labyrinth(width, height, rng=random.Random(1), chest_rng=random.Random(1)),
+                repeat=5, warmup=0, budget=5.0)
+            print_row(f"generate {label}", mean, best)
+            
+            mean, best = time_call(record.to_grid, repeat=100)
+            print_row(f"pool to_grid {label}", mean, best)
+            
+            mean, best = time_call(lambda: Labyrinth.from_record(record, chest_rng=random.Random(1)),
+                                   repeat=100)
+            print_row(f"pool Labyrinth {label}", mean, best)
+        pool.close()
+
+if __name__ == "__main__":
+    run()
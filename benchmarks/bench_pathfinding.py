@@ -0,0 +1,129 @@
+"""
+Pathfinding benchmark: A* and utils.find_path against plain BFS, on Labyrinth
+mazes (perfect, so find_path reads paths from the tree index) and on the
+same mazes with loops knocked into them (find_path falls back to A*)
+"""
+
+import random
+from benchmarks.common import time_call, print_row, random_floor_tiles
+
+from labyrinth import Labyrinth
+from maze_grid import FLOOR
+from maze_tree import MazeTreeIndex
+from utils import AStarPathfinder, find_path, clear_path_cache, tree_index_for
+
+def bfs_path_length(maze, start, goal):
+    """Reference breadth-first search returning the path length (or None)"""
+    cells = maze.cells
+    offsets = maze.neighbor_offsets
+    start_index = maze.index(*start)
+    goal_index = maze.index(*goal)
+    seen = bytearray(len(cells))
+    seen[start_index] = 1
+    frontier = [start_index]
+    distance = 0
+    
+    while frontier:
+        if goal_index in frontier:
+            return distance
+        distance += 1
+        next_frontier = []
+        for index in frontier:
+            for offset in offsets:
+                neighbor = index + offset
+                if not seen[neighbor] and cells[neighbor] == FLOOR:
+                    seen[neighbor] = 1
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    
+    return None
+
+def add_loops(maze, fraction, rng):
+    """Open a fraction of the walls that separate two floor tiles in a line"""
+    cells = maze.cells
+    candidates = []
+    for y in range(maze.height):
+        for x in range(maze.width):
+            index = maze.index(x, y)
+            if cells[index] == FLOOR:
+                continue
+            for offset in (1, maze.stride):
+                if cells[index - offset] == FLOOR and cells[index + offset] == FLOOR:
+                    candidates.append(index)
+                    break
+    for index in rng.sample(candidates, int(len(candidates) * fraction)):
+        cells[index] = FLOOR
+    maze.touch()
+
+def time_queries(label, maze, pairs, repeat, pathfinder):
+    """Time BFS, A* and uncached find_path over the pairs, after checking them
+    
+    find_path's A* fallback gives up after PATH_SEARCH_LIMIT tiles; the
+    queries it gave up on are counted, not failed.
+    """
+    queries = len(pairs)
+    gave_up = 0
+    for start, goal in pairs:
+        expected = bfs_path_length(maze, start, goal)
+        assert len(pathfinder.find_path(maze, start, goal)) == expected
+        path = find_path(start[0], start[1], goal[0], goal[1], maze)
+        if path is None:
+            gave_up += 1
+        else:
+            assert len(path) == expected
+    
+    mean, best = time_call(lambda: [bfs_path_length(maze, s, g) for s, g in pairs], repeat=repeat, warmup=1)
+    print_row(f"BFS {label} (per query)", mean / queries, best / queries)
+    
+    mean, best = time_call(lambda: [pathfinder.find_path(maze, s, g) for s, g in pairs], repeat=repeat, warmup=1)
+    print_row(f"A* {label} (per query)", mean / queries, best / queries)
+    
+    mean, best = time_call(lambda: [find_path(s[0], s[1], g[0], g[1], maze) for s, g in pairs],
+                           repeat=repeat, warmup=1, setup=clear_path_cache)
+    print_row(f"find_path {label} (per query)", mean / queries, best / queries)
+    if gave_up:
+        print(f"  find_path gave up on {gave_up}/{queries} queries (PATH_SEARCH_LIMIT)")
+
+def run(sizes=(31, 101, 301, 1001), queries=20):
+    rng = random.Random(0)
+    
+    for size in sizes:
+        random.seed(size)
+        labyrinth = Labyrinth(size, size)
+        maze = labyrinth.maze
+        pairs = list(zip(random_floor_tiles(maze, queries, rng), random_floor_tiles(maze, queries, rng)))
+        pathfinder = AStarPathfinder()
+        repeat = 3 if size > 300 else 10
+        
+        mean, best = time_call(lambda: MazeTreeIndex(maze), repeat=1, warmup=0)
+        print_row(f"tree index build {size}x{size}", mean, best)
+        tree_index = tree_index_for(maze)  # The game builds both with Labyrinth.prepare_paths
+        mean, best = time_call(tree_index.build_chains, repeat=1, warmup=0)
+        print_row(f"tree path chains build {size}x{size}", mean, best)
+        time_queries(f"{size}x{size}", maze, pairs, repeat, pathfinder)
+        
+        # Short hops, like a zombie a few corridors away from the player
+        near_pairs = []
+        for start in random_floor_tiles(maze, queries, rng):
+            goal = start
+            for _ in range(30):
+                step = rng.choice(maze.neighbor_offsets)
+                index = maze.index(*goal) + step
+                if maze.is_walkable_index(index):
+                    goal = maze.position(index)
+            near_pairs.append((start, goal))
+        mean, best = time_call(lambda: [pathfinder.find_path(maze, s, g) for s, g in near_pairs], repeat=repeat)
+        print_row(f"A* {size}x{size} short hop (per query)", mean / queries, best / queries)
+        
+        clear_path_cache()
+        for s, g in pairs:
+            find_path(s[0], s[1], g[0], g[1], maze)
+        mean, best = time_call(lambda: [find_path(s[0], s[1], g[0], g[1], maze) for s, g in pairs], repeat=repeat)
+        print_row(f"cached find_path {size}x{size} (per query)", mean / queries, best / queries)
+        
+        # Loops make the maze a graph, not a tree: find_path runs A*
+        add_loops(maze, 0.1, rng)
+        time_queries(f"{size}x{size} with loops", maze, pairs, repeat, pathfinder)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,91 @@
+"""
+Startup benchmark: time from launching the game to its first frame
+
+Each run is a fresh interpreter started with -X importtime, so the numbers
+include everything a player waits for. The first run bakes the asset atlas
+into an empty cache directory; later runs load it. The import breakdown
+lists what main imports directly, by cumulative time, from the fastest run.
+
+pygame.pkgdata imports pkg_resources (setuptools) only to locate pygame's
+own files. That import is a known cost the game cannot avoid without
+changing how pygame is imported for the whole process, so it is reported
+on its own line.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.common import PROJECT_ROOT
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+game = main.Game(seed=1, preload=False)
+created = time.perf_counter()
+game.draw()
+drawn = time.perf_counter()
+print(json.dumps({'import': imported - start, 'game': created - imported, 'frame': drawn - created}))
+"""
+
+def parse_importtime(stderr):
+    """Modules imported directly by main as (cumulative seconds, name), slowest first"""
+    children = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        if depth == 0:
+            if name == 'main':
+                return sorted(children, reverse=True)
+            children = []
+        elif depth == 1:
+            children.append((int(cumulative) / 1e6, name))
+    return []
+
+def module_time(stderr, module):
+    """Cumulative seconds spent importing a module anywhere in the tree (0 if never)"""
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.strip() == module:
+            return int(cumulative) / 1e6
+    return 0.0
+
+def startup_run(cache_dir):
+    """Launch one game process and return (wall seconds, phases, imports)"""
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy',
+               PYGAME_HIDE_SUPPORT_PROMPT='1', XDG_CACHE_HOME=cache_dir)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD], cwd=PROJECT_ROOT,
+                            env=env, capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    phases = json.loads(result.stdout.strip().splitlines()[-1])
+    phases['pkg_resources'] = module_time(result.stderr, 'pkg_resources')
+    return wall, phases, parse_importtime(result.stderr)
+
+def run(runs=5, top=10):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        results = [startup_run(cache_dir) for _ in range(runs)]
+    
+    print(f"{'run':<24} {'process':>9} {'imports':>9} {'Game()':>9} {'frame':>9}")
+    for i, (wall, phases, _) in enumerate(results):
+        label = "cold asset cache" if i == 0 else f"warm #{i}"
+        print(f"{label:<24} {wall * 1000:6.1f} ms {phases['import'] * 1000:6.1f} ms "
+              f"{phases['game'] * 1000:6.1f} ms {phases['frame'] * 1000:6.1f} ms")
+    
+    _, phases, imports = min(results[1:] or results, key=lambda result: result[0])
+    print(f"\nknown cost: pygame importing pkg_resources {phases['pkg_resources'] * 1000:.1f} ms")
+    print("\nslowest imports of main (cumulative)")
+    for seconds, name in imports[:top]:
+        print(f"  {name:<22} {seconds * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,70 @@
+"""
+Text rendering benchmark: rendering the HUD and battle strings of a frame
+with font.render vs the cached text service and digit glyphs, and how much
+of a profiled battle frame is still spent in font.render
+"""
+
+import cProfile
+import pstats
+from benchmarks.common import init_display, time_call, print_row
+
+from settings import *
+from fonts import get_font, render_text, glyph_atlas
+from main import Game
+
+def frame_strings(frame):
+    """Strings a battle frame draws, with the timer and HP changing"""
+    seconds = LEVEL_TIME - frame // 60
+    static = ["Q", "W", "E", "R", "Attack", "Defend", "Heal Potion", "Special", "1", "2", "3",
+              "Map", "Level: 3", "BATTLE MODE", "Turn: Player", "You rolled 4 and hit for 12!"]
+    numbers = [f"{seconds // 60:02d}:{seconds % 60:02d}", f"{100 - frame % 50}/100"]
+    return static, numbers
+
+def render_raw(font, frame):
+    static, numbers = frame_strings(frame)
+    for text in static + numbers:
+        font.render(text, True, WHITE)
+
+def render_cached(font, frame, target):
+    static, numbers = frame_strings(frame)
+    for text in static:
+        render_text(font, text, WHITE)
+    atlas = glyph_atlas(font, WHITE)
+    for text in numbers:
+        atlas.draw(target, text, (0, 0))
+
+def profile_battle_frames(frames):
+    """Share of draw() time spent in font.render over frames of a battle screen"""
+    game = Game(seed=1234, preload=False)
+    game.game_state = "BATTLE"
+    game.battle.start_battle(game.player, 40, 5, "Zombie")
+    profiler = cProfile.Profile()
+    profiler.enable()
+    for frame in range(frames):
+        game.level_timer -= 1 / 60
+        game.draw()
+    profiler.disable()
+    game.level_preloader.shutdown()
+    
+    stats = pstats.Stats(profiler)
+    total = sum(entry[2] for entry in stats.stats.values())
+    rendering = sum(entry[2] for (_, _, name), entry in stats.stats.items()
+                    if name == "<method 'render' of 'pygame.font.Font' objects>")
+    return rendering, total
+
+def run(frames=600):
+    screen = init_display()
+    font = get_font(24)
+    counter = iter(range(10 ** 9))
+    
+    mean, best = time_call(lambda: render_raw(font, next(counter)), repeat=200)
+    print_row("frame strings, font.render", mean, best)
+    mean, best = time_call(lambda: render_cached(font, next(counter), screen), repeat=200)
+    print_row("frame strings, cached + glyphs", mean, best)
+    
+    rendering, total = profile_battle_frames(frames)
+    print(f"{frames} battle frames: font.render {rendering * 1000:.1f} ms of {total * 1000:.1f} ms "
+          f"({rendering / total:.1%})")
+
+if __name__ == "__main__":
+    run()
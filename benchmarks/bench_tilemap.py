@@ -0,0 +1,57 @@
+"""
+Tilemap frame-time benchmark: per-tile blitting vs the cached tile layer
+"""
+
+import random
+from benchmarks.common import init_display, time_call, print_row
+
+from settings import *
+from labyrinth import Labyrinth
+from fog_of_war import FogOfWar
+from maze_grid import WALL
+from camera import Camera
+from ui import UI
+
+def draw_tilemap_per_tile(screen, labyrinth, fog_of_war, assets, offset_x, offset_y):
+    """The old draw path: one texture blit per explored tile, every frame"""
+    for y in range(labyrinth.height):
+        maze_row = labyrinth.maze.row(y)
+        for x in range(labyrinth.width):
+            if not fog_of_war.is_explored(x, y):
+                continue
+            if maze_row[x] == WALL:
+                texture = assets.get_texture('wall')
+            else:
+                texture = assets.get_texture('floor')
+            screen.blit(texture, (offset_x + x * CELL_SIZE, offset_y + y * CELL_SIZE))
+
+def run(sizes=((30, 20), (300, 300)), repeat=30):
+    screen = init_display()
+    ui = UI()
+    random.seed(0)
+    
+    for width, height in sizes:
+        labyrinth = Labyrinth(width, height)
+        fog_of_war = FogOfWar(width, height)
+        fog_of_war.explore_all()  # Worst case: every tile explored
+        
+        camera = Camera.centered_on(width, height)
+        offset_x, offset_y = camera.offset_x, camera.offset_y
+        
+        mean, best = time_call(
+            lambda: draw_tilemap_per_tile(screen, labyrinth, fog_of_war, ui.assets, offset_x, offset_y),
+            repeat=repeat)
+        print_row(f"per-tile blits {width}x{height}", mean, best)
+        
+        mean, best = time_call(lambda: ui.tilemap_cache.build(labyrinth, fog_of_war), repeat=3, warmup=0)
+        print_row(f"cache build {width}x{height}", mean, best)
+        
+        def cached_frame():
+            ui.tilemap_cache.sync(fog_of_war)
+            ui.tilemap_cache.draw(screen, camera)
+        
+        mean, best = time_call(cached_frame, repeat=repeat)
+        print_row(f"cached layer {width}x{height}", mean, best)
+
+if __name__ == "__main__":
+    run()
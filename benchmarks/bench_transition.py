@@ -0,0 +1,88 @@
+"""
+Level-transition benchmark: the frame on which the player reaches the exit,
+with the next level built on the spot vs preloaded in the background
+
+A transition frame is next_level() plus the first simulation tick and world
+draw of the new level. With preloading the benchmark waits for the worker
+between transitions, as playing the level would.
+
+The worker competes with the main thread for the GIL while it builds, so
+the frames played during a build are timed too: one simulation tick and
+world draw each, from the moment the next level is requested until it is
+ready, against the same frames with no build running.
+"""
+
+import time
+from benchmarks.common import init_display
+
+from settings import *
+from main import Game
+
+def sized_game(width, height, preload):
+    """A windowed Game whose every level is width x height"""
+    class SizedGame(Game):
+        def level_size(self, level):
+            return width, height
+    return SizedGame(seed=1234, preload=preload)
+
+def transition_frames(game, count):
+    """Time count transition frames and return the timings in seconds"""
+    timings = []
+    for _ in range(count):
+        # Playing the level gives the worker time to build the next one
+        game.preload_next_level()
+        game.level_preloader.wait()
+        start = time.perf_counter()
+        game.next_level()
+        game.update(game.tick_dt)
+        game.draw_world()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def frames_during_build(game, idle_frames=60):
+    """Time ordinary frames with and without a level build on the worker
+    
+    Returns (idle timings, timings while building) in seconds.
+    """
+    def frame():
+        start = time.perf_counter()
+        game.update(game.tick_dt)
+        game.draw_world()
+        return time.perf_counter() - start
+    
+    for _ in range(10):
+        frame()  # The first frames of a level also build its render caches
+    idle = [frame() for _ in range(idle_frames)]
+    game.level_preloader.cancel()
+    game.preload_next_level()
+    building = []
+    while not game.level_preloader.is_ready():
+        building.append(frame())
+    return idle, building
+
+def run(sizes=((MAX_MAZE_WIDTH, MAX_MAZE_HEIGHT), (301, 301), (1001, 1001)), count=5):
+    init_display()
+    print(f"{'transition frame':<32} {'worst':>10} {'mean':>10}")
+    for width, height in sizes:
+        for preload in (False, True):
+            game = sized_game(width, height, preload)
+            timings = transition_frames(game, count)
+            game.level_preloader.shutdown()
+            
+            mode = "preloaded" if preload else "on the spot"
+            print(f"{f'{width}x{height} {mode}':<32} {max(timings) * 1000:7.2f} ms "
+                  f"{sum(timings) / len(timings) * 1000:7.2f} ms")
+    
+    print(f"\n{'frame while the next level builds':<32} {'worst':>10} {'mean':>10} {'frames':>7}")
+    for width, height in sizes:
+        game = sized_game(width, height, True)
+        game.level_timer = float('inf')  # Keep playing however long the build takes
+        idle, building = frames_during_build(game)
+        game.level_preloader.shutdown()
+        for label, timings in (("idle", idle), ("building", building)):
+            if timings:
+                print(f"{f'{width}x{height} {label}':<32} {max(timings) * 1000:7.2f} ms "
+                      f"{sum(timings) / len(timings) * 1000:7.2f} ms {len(timings):7d}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,52 @@
+"""
+Zombie AI benchmark: per-object Zombie.update against the batched ZombieHorde
+"""
+
+import random
+from benchmarks.common import time_call, print_row
+
+from labyrinth import Labyrinth
+from flow_field import FlowField
+from zombie import Zombie
+from zombie_horde import ZombieHorde
+
+def floor_tiles(maze):
+    """List every walkable tile"""
+    return [(x, y) for y in range(maze.height) for x in range(maze.width) if maze.is_walkable(x, y)]
+
+def run(maze_size=301, counts=(10, 1000, 10000), dt=0.1, repeat=20):
+    random.seed(0)
+    labyrinth = Labyrinth(maze_size, maze_size)
+    maze = labyrinth.maze
+    tiles = floor_tiles(maze)
+    player_x, player_y = 1, 1
+    
+    flow_field = FlowField(maze)
+    mean, best = time_call(lambda: flow_field._build(player_x, player_y), repeat=5, warmup=0)
+    print_row(f"flow field rebuild {maze_size}x{maze_size}", mean, best)
+    flow_field.update(player_x, player_y)
+    
+    for count in counts:
+        spawns = [random.choice(tiles) for _ in range(count)]
+        
+        zombies = [Zombie(x, y, 1.0) for x, y in spawns]
+        def update_objects():
+            for zombie in zombies:
+                zombie.update(player_x, player_y, maze, dt, flow_field)
+        
+        # dt = 0.1 and a 0.5 s cooldown: one frame in five moves every zombie
+        mean, best = time_call(update_objects, repeat=repeat)
+        print_row(f"Zombie objects x{count} (per tick)", mean, best)
+        
+        horde = ZombieHorde()
+        for x, y in spawns:
+            horde.spawn(x, y, 1.0)
+        def update_horde():
+            horde.update(dt, flow_field)
+            horde.find_at(player_x, player_y)
+        
+        mean, best = time_call(update_horde, repeat=repeat)
+        print_row(f"ZombieHorde x{count} (per tick)", mean, best)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,63 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+
+import os
+import sys
+import time
+
+# Benchmarks never need a real window or audio device
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# The game modules live in the project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pygame
+
+def init_display(width=None, height=None):
+    """Initialize pygame with a (dummy) display so surfaces can be converted"""
+    from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+    pygame.display.init()
+    pygame.font.init()
+    return pygame.display.set_mode((width or SCREEN_WIDTH, height or SCREEN_HEIGHT))
+
+def time_call(func, repeat=50, warmup=2, setup=None, budget=None):
+    """Run func repeatedly and return (mean, best) seconds per call
+    
+    setup, if given, runs untimed before every call. With a budget (seconds)
+    timing stops early once the timed calls have used it up, so slow cases
+    on huge mazes still finish; at least one call is always timed.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+        if budget is not None and sum(timings) >= budget:
+            break
+    
+    return sum(timings) / len(timings), min(timings)
+
+def random_floor_tiles(maze, count, rng):
+    """Pick random walkable tiles"""
+    tiles = []
+    while len(tiles) < count:
+        x = rng.randrange(maze.width)
+        y = rng.randrange(maze.height)
+        if maze.is_walkable(x, y):
+            tiles.append((x, y))
+    return tiles
+
+def print_row(name, mean, best):
+    """Print one benchmark result line in milliseconds"""
+    print(f"{name:<40} mean {mean * 1000:9.3f} ms   best {best * 1000:9.3f} ms")
@@ -0,0 +1,348 @@
+"""
+Benchmark suite: maze generation, visibility, zombie AI, battles, rendering
+and game startup at several maze sizes
+
+Results are written as JSON and can be compared against a saved baseline:
+    python -m benchmarks.suite --save-baseline      # record benchmarks/baseline.json
+    python -m benchmarks.suite --compare            # later, after a change
+    python -m benchmarks.suite --groups render --sizes 20x15 101x101
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import time
+import numpy as np
+from benchmarks.common import PROJECT_ROOT, init_display, time_call, print_row, random_floor_tiles
+
+import pygame
+from settings import *
+from labyrinth import Labyrinth
+from maze_grid import MazeGrid
+from maze_generators import GENERATORS
+from spatial_index import OccupancyIndex
+from fog_of_war import FogOfWar
+from flow_field import FlowField, WindowedFlowField
+from chunked_world import EndlessLabyrinth
+from maze_tree import MazeTreeIndex
+from zombie import Zombie
+from zombie_horde import ZombieHorde
+from battle import BattleSystem
+from player import Player
+from camera import Camera
+from ui import UI
+
+SEED = 1234
+# Odd sizes: with an even width and height the exit corner lands on a wall
+# post of the carving lattice and the maze is not connected
+SIZES = ((MAZE_WIDTH, MAZE_HEIGHT), (101, 101), (301, 301), (1001, 1001))
+ZOMBIE_COUNTS = (10, 100, 1000)
+BATTLES_PER_CALL = 100
+SPRITE_ZOMBIES = 100
+GROUPS = ('generation', 'visibility', 'zombies', 'battle', 'render', 'startup')
+
+BASELINE_PATH = os.path.join(PROJECT_ROOT, 'benchmarks', 'baseline.json')
+REGRESSION_THRESHOLD = 0.10  # Best time this much slower than baseline fails
+
+def check_tree(maze, label):
+    """Fail if a benchmark maze is not a perfect maze, like the ones the game plays"""
+    if not MazeTreeIndex(maze).is_tree:
+        raise ValueError(f"{label} maze is not a perfect maze (loops or disconnected areas)")
+
+class Suite:
+    """Runs timed cases and collects their results by name"""
+    
+    def __init__(self, repeat=20, budget=1.0):
+        self.repeat = repeat
+        self.budget = budget
+        self.results = {}
+    
+    def time(self, name, func, setup=None, repeat=None, per_call=1):
+        """Time one case and record (and print) its seconds per operation
+        
+        per_call is how many operations one call of func performs.
+        """
+        mean, best = time_call(func, repeat=repeat or self.repeat, warmup=1,
+                               setup=setup, budget=self.budget)
+        mean /= per_call
+        best /= per_call
+        self.results[name] = {'mean': mean, 'best': best}
+        print_row(name, mean, best)
+
+def bench_generation(suite, labyrinth, label):
+    """Labyrinth.generate_maze (every generator) and spawn_chests, fresh each call"""
+    maze = labyrinth.maze
+    generator = labyrinth.generator
+    chests = labyrinth.chests
+    occupancy = labyrinth.occupancy
+    
+    def fresh_maze():
+        labyrinth.maze = MazeGrid(labyrinth.width, labyrinth.height)
+        labyrinth.rng = random.Random(SEED)
+    for name in GENERATORS:
+        labyrinth.generator = name
+        suite.time(f"generate_maze {name} {label}", labyrinth.generate_maze, setup=fresh_maze)
+        check_tree(labyrinth.maze, f"{name} {label}")
+    labyrinth.maze = maze
+    labyrinth.generator = generator
+    
+    def fresh_chests():
+        labyrinth.chests = []
+        labyrinth.occupancy = OccupancyIndex()
+        labyrinth.chest_rng = random.Random(SEED)
+    suite.time(f"spawn_chests {label}", labyrinth.spawn_chests, setup=fresh_chests)
+    labyrinth.chests = chests
+    labyrinth.occupancy = occupancy
+
+def bench_visibility(suite, labyrinth, fog_of_war, tiles, label, screen=None):
+    """FogOfWar.update_visibility from a new tile every call, then draw_fog"""
+    maze = labyrinth.maze
+    positions = itertools.cycle(tiles)
+    camera = Camera()
+    
+    def update():
+        x, y = next(positions)
+        fog_of_war.update_visibility(x, y, maze)
+        camera.follow(x, y, labyrinth.width, labyrinth.height)
+    suite.time(f"update_visibility {label}", update, setup=fog_of_war.invalidate)
+    
+    if screen is None:
+        return
+    
+    # Each drawn frame follows a player step, so the mask has tiles to repaint
+    # and the camera has moved
+    def step():
+        fog_of_war.invalidate()
+        update()
+    suite.time(f"draw_fog {label}", lambda: fog_of_war.draw_fog(screen, camera), setup=step)
+
+def bench_zombies(suite, labyrinth, tiles, label, counts=ZOMBIE_COUNTS):
+    """ZombieHorde.update for N zombies on the shared flow field, every zombie moving
+    
+    The chase_player rows time the per-object Zombie class the game used
+    before the horde, for comparison.
+    """
+    maze = labyrinth.maze
+    player_x, player_y = 1, 1
+    flow_field = FlowField(maze)
+    flow_field.update(player_x, player_y)
+    rng = random.Random(SEED)
+    
+    for count in counts:
+        spawns = [rng.choice(tiles) for _ in range(count)]
+        horde = ZombieHorde(rng=np.random.default_rng(SEED))
+        for x, y in spawns:
+            horde.spawn(x, y, 1.0)
+        suite.time(f"ZombieHorde.update x{count} {label}", lambda: horde.update(0.0, flow_field),
+                   setup=lambda: reset_horde(horde, spawns))
+        
+        zombies = [Zombie(x, y, 1.0, rng=random.Random(SEED)) for x, y in spawns]
+        def respawn():
+            for zombie, (x, y) in zip(zombies, spawns):
+                zombie.x, zombie.y = x, y
+        def chase():
+            for zombie in zombies:
+                zombie.chase_player(player_x, player_y, maze, flow_field)
+        suite.time(f"chase_player x{count} {label}", chase, setup=respawn)
+
+def bench_endless_zombies(suite, counts=ZOMBIE_COUNTS):
+    """ZombieHorde.update_windowed for N zombies around the player in the endless dungeon
+    
+    Zombies are spread over the populated chunks, so some follow the
+    windowed flow field and the rest step greedily.
+    """
+    labyrinth = EndlessLabyrinth(SEED)
+    player_x, player_y = 1, 1
+    chunks = labyrinth.update(player_x, player_y)
+    tiles = [tile for chunk in chunks for tile in labyrinth.chunk_floor_tiles(*chunk)]
+    flow_field = WindowedFlowField(labyrinth.maze)
+    flow_field.update(player_x, player_y)
+    rng = random.Random(SEED)
+    
+    for count in counts:
+        spawns = [rng.choice(tiles) for _ in range(count)]
+        horde = ZombieHorde(rng=np.random.default_rng(SEED))
+        for x, y in spawns:
+            horde.spawn(x, y, 1.0)
+        suite.time(f"ZombieHorde.update_windowed x{count} endless",
+                   lambda: horde.update_windowed(0.0, flow_field, player_x, player_y),
+                   setup=lambda: reset_horde(horde, spawns))
+
+def reset_horde(horde, spawns):
+    """Put every zombie back on its spawn, due to move on the next update"""
+    count = len(spawns)
+    horde.xs[:count] = [x for x, _ in spawns]
+    horde.ys[:count] = [y for _, y in spawns]
+    horde.move_timers[:count] = horde.move_cooldowns[:count]
+
+def bench_battle(suite):
+    """Resolve whole battles (attack every turn) until one side falls"""
+    battle = BattleSystem(random.Random(SEED))
+    player = Player(1, 1)
+    
+    def full_battles():
+        for _ in range(BATTLES_PER_CALL):
+            player.hp = player.max_hp
+            battle.start_battle(player, ZOMBIE_BASE_HP, ZOMBIE_BASE_ATTACK, "Zombie", 1)
+            result = None
+            while result is None:
+                if battle.waiting_for_input:
+                    battle.use_skill('Q')
+                result = battle.update()
+            battle.end_battle()
+    suite.time("BattleSystem full battle", full_battles, per_call=BATTLES_PER_CALL)
+
+def bench_render(suite, ui, screen, labyrinth, fog_of_war, tiles, label):
+    """UI.draw_tilemap, draw_minimap and draw_sprites on the dummy display"""
+    rng = random.Random(SEED)
+    player = Player(*tiles[0])
+    horde = ZombieHorde(rng=rng)
+    for x, y in (rng.choice(tiles) for _ in range(SPRITE_ZOMBIES)):
+        horde.spawn(x, y, 1.0)
+    
+    ui.camera.follow(player.x, player.y, labyrinth.width, labyrinth.height)
+    ui.prepare_level(labyrinth, fog_of_war)
+    suite.time(f"draw_tilemap {label}", lambda: ui.draw_tilemap(screen, labyrinth, fog_of_war))
+    
+    suite.time(f"draw_minimap {label}",
+               lambda: ui.draw_minimap(screen, labyrinth, player, horde, fog_of_war))
+    suite.time(f"draw_sprites x{SPRITE_ZOMBIES} {label}",
+               lambda: ui.draw_sprites(screen, labyrinth, player, horde, fog_of_war))
+
+def bench_startup(suite):
+    """Game() construction, windowed and headless"""
+    from main import Game
+    suite.time("Game() startup", lambda: Game(seed=SEED), repeat=5)
+    suite.time("Game(headless=True) startup", lambda: Game(headless=True, seed=SEED), repeat=5)
+
+def run(sizes=SIZES, groups=GROUPS, repeat=20, budget=1.0):
+    """Run the selected benchmark groups and return the results by case name"""
+    suite = Suite(repeat, budget)
+    screen = ui = None
+    if 'visibility' in groups or 'render' in groups:
+        screen = init_display()
+        ui = UI()
+    
+    for width, height in sizes:
+        label = f"{width}x{height}"
+        labyrinth = Labyrinth(width, height, rng=random.Random(SEED), chest_rng=random.Random(SEED))
+        fog_of_war = FogOfWar(width, height)
+        check_tree(labyrinth.maze, label)
+        tiles = random_floor_tiles(labyrinth.maze, 64, random.Random(SEED))
+        
+        if 'generation' in groups:
+            bench_generation(suite, labyrinth, label)
+        if 'visibility' in groups:
+            bench_visibility(suite, labyrinth, fog_of_war, tiles, label, screen)
+        if 'zombies' in groups:
+            bench_zombies(suite, labyrinth, tiles, label)
+        if 'render' in groups:
+            bench_render(suite, ui, screen, labyrinth, fog_of_war, tiles, label)
+    
+    if 'zombies' in groups:
+        bench_endless_zombies(suite)
+    if 'battle' in groups:
+        bench_battle(suite)
+    if 'startup' in groups:
+        bench_startup(suite)
+    
+    return suite.results
+
+def describe_environment():
+    """Machine and library details stored alongside the results"""
+    return {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+def save_results(path, results, sizes):
+    """Write results (seconds per operation) as JSON"""
+    data = {
+        'environment': describe_environment(),
+        'sizes': [f"{width}x{height}" for width, height in sizes],
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+def load_results(path):
+    """Read the results written by save_results"""
+    with open(path) as f:
+        return json.load(f)['results']
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print each case against the baseline and return the names that regressed
+    
+    Cases are compared on their best time, which is the least noisy.
+    """
+    regressions = []
+    print(f"\n{'case':<40} {'baseline':>12} {'current':>12}   ratio")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<40} {'-':>12} {result['best'] * 1000:9.3f} ms   new")
+            continue
+        
+        ratio = result['best'] / max(base['best'], 1e-12)
+        if ratio > 1 + threshold:
+            verdict = "SLOWER"
+            regressions.append(name)
+        elif ratio < 1 / (1 + threshold):
+            verdict = "faster"
+        else:
+            verdict = ""
+        print(f"{name:<40} {base['best'] * 1000:9.3f} ms {result['best'] * 1000:9.3f} ms"
+              f"   {ratio:5.2f}x {verdict}")
+    
+    missing = sorted(set(baseline) - set(results))
+    if missing:
+        print(f"{len(missing)} baseline case(s) not run this time")
+    return regressions
+
+def parse_size(text):
+    """Parse a WIDTHxHEIGHT command-line size"""
+    width, _, height = text.lower().partition('x')
+    return int(width), int(height or width)
+
+def main():
+    parser = argparse.ArgumentParser(description="Zombie Dungeon Escape benchmark suite")
+    parser.add_argument('--sizes', nargs='+', type=parse_size, default=SIZES, metavar='WxH',
+                        help="maze sizes to run (default: 20x15 101x101 301x301 1001x1001)")
+    parser.add_argument('--groups', nargs='+', choices=GROUPS, default=GROUPS,
+                        help="benchmark groups to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=20,
+                        help="timed calls per case (default: 20)")
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help="stop timing a case after this many seconds (default: 1.0)")
+    parser.add_argument('--output', metavar='PATH',
+                        help="write the results as JSON to PATH")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f"write the results to the baseline file ({BASELINE_PATH})")
+    parser.add_argument('--compare', nargs='?', const=BASELINE_PATH, metavar='PATH',
+                        help="compare against a saved baseline (default: the baseline file)")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="relative slowdown counted as a regression (default: 0.10)")
+    args = parser.parse_args()
+    
+    results = run(args.sizes, args.groups, args.repeat, args.budget)
+    
+    if args.output:
+        save_results(args.output, results, args.sizes)
+    if args.save_baseline:
+        save_results(BASELINE_PATH, results, args.sizes)
+        print(f"Saved baseline to {BASELINE_PATH}")
+    if args.compare:
+        regressions = compare(results, load_results(args.compare), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Camera for Zombie Dungeon Escape
+Converts between world tiles and screen pixels once per frame
+"""
+
+import pygame
+from settings import *
+
+class Camera:
+    """Viewport onto the maze, following a focus tile (the player)
+    
+    The viewport is the top-left viewport_width x viewport_height pixels of
+    the screen (by default everything above the skill toolbar). A maze that
+    fits the viewport is centred in it. A larger maze scrolls to keep the
+    focus in the middle, clamped so the view never leaves the maze; an
+    unbounded maze (size None) is never clamped. Draw code asks the camera
+    which tiles are in view and only draws those, so render cost depends on
+    the screen size, not the maze.
+    """
+    
+    def __init__(self, viewport_width=SCREEN_WIDTH, viewport_height=SCREEN_HEIGHT - TOOLBAR_HEIGHT,
+                 cell_size=CELL_SIZE):
+        self.viewport_width = viewport_width
+        self.viewport_height = viewport_height
+        self.cell_size = cell_size
+        self.offset_x = 0  # Screen position of the world origin
+        self.offset_y = 0
+    
+    @classmethod
+    def centered_on(cls, width, height):
+        """Camera looking at the middle of a width x height maze"""
+        camera = cls()
+        camera.follow(width // 2, height // 2, width, height)
+        return camera
+    
+    def follow(self, focus_x, focus_y, world_width=None, world_height=None):
+        """Position the view for this frame and return self"""
+        self.offset_x = self._axis_offset(focus_x, world_width, self.viewport_width)
+        self.offset_y = self._axis_offset(focus_y, world_height, self.viewport_height)
+        return self
+    
+    def _axis_offset(self, focus, world_tiles, viewport):
+        """Offset along one axis: centred if the maze fits, else scrolled"""
+        cell_size = self.cell_size
+        if world_tiles is not None and world_tiles * cell_size <= viewport:
+            return (viewport - world_tiles * cell_size) // 2
+        offset = viewport // 2 - int(focus * cell_size) - cell_size // 2
+        if world_tiles is not None:
+            offset = max(viewport - world_tiles * cell_size, min(0, offset))
+        return offset
+    
+    def world_to_screen(self, x, y):
+        """Screen pixel of a tile's top-left corner (x, y may be fractional)"""
+        return (self.offset_x + x * self.cell_size, self.offset_y + y * self.cell_size)
+    
+    def screen_to_world(self, screen_x, screen_y):
+        """Tile under a screen pixel"""
+        return ((screen_x - self.offset_x) // self.cell_size,
+                (screen_y - self.offset_y) // self.cell_size)
+    
+    def visible_tiles(self):
+        """Inclusive tile range (first_x, first_y, last_x, last_y) overlapping the view"""
+        first_x, first_y = self.screen_to_world(0, 0)
+        last_x, last_y = self.screen_to_world(self.viewport_width - 1, self.viewport_height - 1)
+        return first_x, first_y, last_x, last_y
+    
+    def visible_tiles_in(self, width, height):
+        """Tile range in view clipped to a width x height maze (may be empty)"""
+        first_x, first_y, last_x, last_y = self.visible_tiles()
+        return max(first_x, 0), max(first_y, 0), min(last_x, width - 1), min(last_y, height - 1)
+    
+    def is_visible(self, x, y):
+        """Check if any part of tile (x, y) is on screen"""
+        screen_x, screen_y = self.world_to_screen(x, y)
+        return (-self.cell_size < screen_x < self.viewport_width and
+                -self.cell_size < screen_y < self.viewport_height)
+    
+    def tile_rect(self, x, y):
+        """Screen rectangle covered by a tile"""
+        screen_x, screen_y = self.world_to_screen(x, y)
+        return pygame.Rect(int(screen_x), int(screen_y), self.cell_size, self.cell_size)
@@ -9,24 +9,24 @@ from items import Item
 class Chest:
     """Treasure chest that contains loot"""
     
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=None):
         self.x = x
         self.y = y
         self.is_open = False
         self.animation_timer = 0
-        self.contents = self._generate_contents()
+        self.contents = self._generate_contents(rng if rng is not None else random)
     
-    def _generate_contents(self):
+    def _generate_contents(self, rng):
         """Generate random contents for the chest"""
         contents = []
         
         # Always has at least one item
         item_types = ['potion', 'sword', 'shield', 'armor', 'gold']
-        num_items = random.randint(1, 3)
+        num_items = rng.randint(1, 3)
         
         for _ in range(num_items):
-            item_type = random.choice(item_types)
-            item = Item(item_type)
+            item_type = rng.choice(item_types)
+            item = Item(item_type, rng=rng)
             contents.append(item)
         
         return contents
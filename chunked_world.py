@@ -0,0 +1,249 @@
+"""
+Endless dungeon for Zombie Dungeon Escape
+An unbounded maze split into chunks that are generated on demand and evicted
+through an LRU, so memory stays flat however far the player travels
+"""
+
+from collections import OrderedDict
+from settings import *
+from maze_grid import MazeGrid, WALL, FLOOR
+from maze_generators import generate
+from rng import RandomStreams
+from spatial_index import ChunkedOccupancyIndex
+
+class ChunkLRU:
+    """Per-chunk values keyed by (chunk_x, chunk_y), least recently used first
+    
+    Holds at most max_chunks values. on_evict(key, value), if given, is
+    called for every value dropped to make room.
+    """
+    
+    def __init__(self, max_chunks, on_evict=None):
+        self.max_chunks = max_chunks
+        self.on_evict = on_evict
+        self.values = OrderedDict()
+    
+    def get(self, key):
+        """Get a value and mark it as recently used, or None"""
+        value = self.values.get(key)
+        if value is not None:
+            self.values.move_to_end(key)
+        return value
+    
+    def peek(self, key):
+        """Get a value without touching its recency, or None"""
+        return self.values.get(key)
+    
+    def put(self, key, value):
+        """Store a value, evicting the least recently used ones if full"""
+        self.values[key] = value
+        self.values.move_to_end(key)
+        while len(self.values) > self.max_chunks:
+            old_key, old_value = self.values.popitem(last=False)
+            if self.on_evict:
+                self.on_evict(old_key, old_value)
+    
+    def pop(self, key):
+        """Drop a value without calling on_evict"""
+        return self.values.pop(key, None)
+    
+    def clear(self):
+        self.values.clear()
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def __contains__(self, key):
+        return key in self.values
+
+def chunk_capacity(budget, chunk_bytes, minimum):
+    """Chunks that fit a byte budget, never fewer than the working set"""
+    return max(minimum, budget // chunk_bytes)
+
+class ChunkedMaze:
+    """Unbounded read-only maze built from deterministic chunks
+    
+    Chunk (cx, cy) covers tiles cx * chunk_tiles .. (cx + 1) * chunk_tiles - 1
+    on each axis. Its contents depend only on the seed and its coordinate: a
+    perfect maze over the cells at odd local coordinates, plus one door
+    through the west wall column and one through the north wall row it owns.
+    Every chunk is connected inside and to all four neighbours, so the whole
+    world is connected. Evicted chunks are simply regenerated when needed.
+    
+    Supports the read side of MazeGrid (get, is_wall, is_walkable), so
+    players, zombies and the field of view work on it unchanged.
+    """
+    
+    def __init__(self, seed, chunk_tiles=ENDLESS_CHUNK_TILES, budget=ENDLESS_MAZE_BUDGET,
+                 generator=ENDLESS_GENERATOR, min_chunks=None):
+        if chunk_tiles < 2 or chunk_tiles % 2:
+            raise ValueError("chunk_tiles must be an even number of at least 2")
+        self.streams = RandomStreams(seed)
+        self.chunk_tiles = chunk_tiles
+        self.generator = generator
+        self.version = 0  # Chunks never change once generated
+        
+        if min_chunks is None:
+            min_chunks = (2 * ENDLESS_LOAD_RADIUS + 2) ** 2
+        self.chunks = ChunkLRU(chunk_capacity(budget, chunk_tiles * chunk_tiles, min_chunks),
+                               self._evicted)
+        self.on_evict = None  # Called with (chunk_x, chunk_y) when a chunk is dropped
+        self.generated = 0  # Chunks generated so far, including regenerations
+        self._last_key = None
+        self._last_tiles = None
+    
+    def chunk(self, chunk_x, chunk_y):
+        """Get a chunk's tiles (row-major bytes), generating it if needed"""
+        key = (chunk_x, chunk_y)
+        if key == self._last_key:
+            return self._last_tiles
+        tiles = self.chunks.get(key)
+        if tiles is None:
+            tiles = self._generate(chunk_x, chunk_y)
+            self.chunks.put(key, tiles)
+        self._last_key = key
+        self._last_tiles = tiles
+        return tiles
+    
+    def is_loaded(self, chunk_x, chunk_y):
+        """Check if a chunk is currently held in memory"""
+        return (chunk_x, chunk_y) in self.chunks
+    
+    def _generate(self, chunk_x, chunk_y):
+        """Carve one chunk from its own random stream"""
+        size = self.chunk_tiles
+        rng = self.streams.stream('chunk', chunk_x, chunk_y)
+        
+        # One column and row wider, so the lattice reaches the last tile; the
+        # extra column and row are the neighbours' west and north walls
+        scratch = MazeGrid(size + 1, size + 1)
+        generate(scratch, rng, self.generator)
+        tiles = bytearray(size * size)
+        for y in range(size):
+            tiles[y * size:(y + 1) * size] = scratch.row(y)[:size]
+        
+        # Doors into the west and north neighbours
+        cells = size // 2
+        tiles[(2 * rng.randrange(cells) + 1) * size] = FLOOR
+        tiles[2 * rng.randrange(cells) + 1] = FLOOR
+        
+        self.generated += 1
+        return bytes(tiles)
+    
+    def _evicted(self, key, tiles):
+        if key == self._last_key:
+            self._last_key = self._last_tiles = None
+        if self.on_evict:
+            self.on_evict(*key)
+    
+    def get(self, x, y):
+        """Get tile value at any world coordinate"""
+        size = self.chunk_tiles
+        chunk_x, local_x = divmod(x, size)
+        chunk_y, local_y = divmod(y, size)
+        return self.chunk(chunk_x, chunk_y)[local_y * size + local_x]
+    
+    def in_bounds(self, x, y):
+        """Every coordinate lies inside an endless maze"""
+        return True
+    
+    def is_wall(self, x, y):
+        """Check if tile is a wall"""
+        return self.get(x, y) == WALL
+    
+    def is_walkable(self, x, y):
+        """Check if tile is a floor"""
+        return self.get(x, y) == FLOOR
+    
+    def read_row(self, x, y, length):
+        """Get tiles (x .. x + length - 1, y) as a bytearray"""
+        size = self.chunk_tiles
+        chunk_y, local_y = divmod(y, size)
+        row = bytearray()
+        while length > 0:
+            chunk_x, local_x = divmod(x, size)
+            take = min(length, size - local_x)
+            start = local_y * size + local_x
+            row += self.chunk(chunk_x, chunk_y)[start:start + take]
+            x += take
+            length -= take
+        return row
+
+class EndlessLabyrinth:
+    """The endless dungeon level: chunked maze plus per-chunk entity index
+    
+    update() keeps the chunks within load_radius of the player's chunk in
+    memory and reports the ones that entered that area, so the game can
+    populate them. Entities standing in a chunk when it is depopulated or
+    evicted, or standing outside the populated chunks, are dropped from the
+    index and queued for the game to remove.
+    """
+    
+    def __init__(self, seed, chunk_tiles=ENDLESS_CHUNK_TILES, budget=ENDLESS_MAZE_BUDGET,
+                 generator=ENDLESS_GENERATOR, load_radius=ENDLESS_LOAD_RADIUS):
+        self.maze = ChunkedMaze(seed, chunk_tiles, budget, generator,
+                                min_chunks=(2 * load_radius + 2) ** 2)
+        self.maze.on_evict = self._chunk_evicted
+        self.chunk_tiles = chunk_tiles
+        self.width = self.height = None  # Unbounded (the camera never clamps)
+        self.load_radius = load_radius
+        self.occupancy = ChunkedOccupancyIndex(chunk_tiles)
+        self.chests = []
+        self.exit_pos = None  # No way out of an endless dungeon
+        self.populated = set()  # Chunks whose entities are currently live
+        self.dropped = []  # Entities evicted with their chunk, not yet collected
+    
+    def update(self, player_x, player_y):
+        """Load the chunks around the player; return the newly populated ones
+        
+        Chunks more than one chunk beyond the load radius are depopulated,
+        so only the neighbourhood of the player is ever simulated. Entities
+        are dropped by the chunk they stand in now, so one that wandered
+        out of the populated chunks is dropped too.
+        """
+        size = self.chunk_tiles
+        center_x = int(player_x) // size
+        center_y = int(player_y) // size
+        radius = self.load_radius
+        entered = []
+        for chunk_y in range(center_y - radius, center_y + radius + 1):
+            for chunk_x in range(center_x - radius, center_x + radius + 1):
+                self.maze.chunk(chunk_x, chunk_y)
+                key = (chunk_x, chunk_y)
+                if key not in self.populated:
+                    self.populated.add(key)
+                    entered.append(key)
+        
+        for chunk_x, chunk_y in list(self.populated):
+            if max(abs(chunk_x - center_x), abs(chunk_y - center_y)) > radius + 1:
+                self.depopulate(chunk_x, chunk_y)
+        
+        # Entities that walked out of the populated area go with it
+        for chunk in list(self.occupancy.chunk_members):
+            if chunk not in self.populated:
+                self.dropped.extend(self.occupancy.drop_chunk(*chunk))
+        return entered
+    
+    def depopulate(self, chunk_x, chunk_y):
+        """Drop a chunk's entities; they respawn if it is populated again"""
+        self.populated.discard((chunk_x, chunk_y))
+        self.dropped.extend(self.occupancy.drop_chunk(chunk_x, chunk_y))
+    
+    def take_dropped(self):
+        """Get and forget the entities dropped by evictions since the last call"""
+        dropped = self.dropped
+        self.dropped = []
+        return dropped
+    
+    def _chunk_evicted(self, chunk_x, chunk_y):
+        self.depopulate(chunk_x, chunk_y)
+    
+    def chunk_floor_tiles(self, chunk_x, chunk_y):
+        """List the floor tiles of a chunk in world coordinates"""
+        size = self.chunk_tiles
+        tiles = self.maze.chunk(chunk_x, chunk_y)
+        base_x = chunk_x * size
+        base_y = chunk_y * size
+        return [(base_x + index % size, base_y + index // size)
+                for index in range(size * size) if tiles[index] == FLOOR]
+
@@ -0,0 +1,87 @@
+"""
+Dirty-rectangle tracking for Zombie Dungeon Escape
+Works out which parts of the screen changed since the last frame
+"""
+
+import pygame
+from settings import *
+
+def merge_rects(rects):
+    """Union overlapping rects until no two of them overlap"""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+class RetainedFrame:
+    """What the screen showed after the last frame, piece by piece
+    
+    Each frame is described by a view key, sprite states and HUD widgets.
+    A sprite state is a tuple starting with its screen rect, followed by
+    anything else that changes its look (flash alpha, boss or not); a
+    widget is a (rect, key) pair whose key changes whenever its pixels
+    would. diff() compares a frame with the previous one and returns the
+    screen rects that need redrawing, or None when the whole screen must
+    be redrawn: the first frame, a new view key (camera offset, level), or
+    more change than DIRTY_RECT_MAX_COUNT / DIRTY_RECT_MAX_AREA allow.
+    """
+    
+    def __init__(self, screen_size=(SCREEN_WIDTH, SCREEN_HEIGHT),
+                 max_count=DIRTY_RECT_MAX_COUNT, max_area=DIRTY_RECT_MAX_AREA):
+        self.screen_rect = pygame.Rect((0, 0), screen_size)
+        self.max_count = max_count
+        self.max_area = max_area * self.screen_rect.width * self.screen_rect.height
+        self.valid = False
+        self.view_key = None
+        self.sprites = {}
+        self.widgets = {}
+    
+    def invalidate(self):
+        """Make the next diff() ask for a full redraw"""
+        self.valid = False
+    
+    def diff(self, view_key, sprites, widgets, changed_rects=()):
+        """Record a frame and return the rects that changed (None: redraw everything)
+        
+        changed_rects are extra screen areas known to have changed, such as
+        tiles whose fog was repainted.
+        """
+        previous_sprites, previous_widgets = self.sprites, self.widgets
+        full = not self.valid or view_key != self.view_key
+        self.valid = True
+        self.view_key = view_key
+        self.sprites = sprites
+        self.widgets = widgets
+        if full:
+            return None
+        
+        rects = list(changed_rects)
+        for key, state in sprites.items():
+            old = previous_sprites.get(key)
+            if old != state:
+                rects.append(state[0])
+                if old is not None:
+                    rects.append(old[0])
+        for key in previous_sprites.keys() - sprites.keys():
+            rects.append(previous_sprites[key][0])
+        for name, widget in widgets.items():
+            old = previous_widgets.get(name)
+            if old != widget:
+                rects.append(widget[0])
+                if old is not None:
+                    rects.append(old[0])
+        for name in previous_widgets.keys() - widgets.keys():
+            rects.append(previous_widgets[name][0])
+        
+        screen_rect = self.screen_rect
+        rects = [rect.clip(screen_rect) for rect in merge_rects(rects)]
+        rects = [rect for rect in rects if rect.width and rect.height]
+        if (len(rects) > self.max_count or
+                sum(rect.width * rect.height for rect in rects) > self.max_area):
+            return None
+        return rects
@@ -0,0 +1,145 @@
+"""
+Flow field pathfinding for Zombie Dungeon Escape
+A shared BFS distance map towards the player that every zombie walks down
+"""
+
+from array import array
+from settings import ENDLESS_CHASE_RADIUS
+from maze_grid import MazeGrid, FLOOR
+
+UNREACHABLE = -1
+
+class FlowField:
+    """Distance from every maze tile to a target tile
+    
+    The field is rebuilt with one BFS only when the target tile (or the maze)
+    changes, so any number of zombies can pick their next step with a
+    constant-time look at their four neighbours.
+    """
+    
+    def __init__(self, maze):
+        self.maze = maze
+        self.distances = array('i', [UNREACHABLE]) * len(maze.cells)
+        self.target = None
+        self.maze_version = None
+    
+    def update(self, target_x, target_y):
+        """Rebuild the field if the target tile or maze changed
+        
+        Returns True when the field was rebuilt.
+        """
+        target = (int(target_x), int(target_y))
+        if target == self.target and self.maze_version == self.maze.version:
+            return False
+        
+        self.target = target
+        self.maze_version = self.maze.version
+        self._build(*target)
+        return True
+    
+    def _build(self, target_x, target_y):
+        """Breadth-first search outwards from the target over buffer indices"""
+        maze = self.maze
+        cells = maze.cells
+        offsets = maze.neighbor_offsets
+        distances = array('i', [UNREACHABLE]) * len(cells)
+        self.distances = distances
+        
+        if not maze.is_walkable(target_x, target_y):
+            return
+        
+        start = maze.index(target_x, target_y)
+        distances[start] = 0
+        frontier = [start]
+        distance = 0
+        
+        # Level-by-level BFS; the wall border keeps every step in the buffer
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for index in frontier:
+                for offset in offsets:
+                    neighbor = index + offset
+                    if distances[neighbor] == UNREACHABLE and cells[neighbor] == FLOOR:
+                        distances[neighbor] = distance
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+    
+    def distance(self, x, y):
+        """Get path distance from (x, y) to the target, or UNREACHABLE"""
+        if not self.maze.in_bounds(x, y):
+            return UNREACHABLE
+        return self.distances[self.maze.index(x, y)]
+    
+    def next_step(self, x, y):
+        """Get the neighbouring tile one step closer to the target
+        
+        Returns None when (x, y) is the target or cannot reach it.
+        """
+        if not self.maze.in_bounds(x, y):
+            return None
+        
+        distances = self.distances
+        index = self.maze.index(x, y)
+        best = distances[index]
+        if best <= 0:
+            return None
+        
+        step = None
+        for offset in self.maze.neighbor_offsets:
+            neighbor_distance = distances[index + offset]
+            if UNREACHABLE < neighbor_distance < best:
+                best = neighbor_distance
+                step = index + offset
+        
+        if step is None:
+            return None
+        return self.maze.position(step)
+
+class WindowedFlowField:
+    """Flow field over a square window of an unbounded (chunked) maze
+    
+    When the target tile changes, the tiles within radius of it are copied
+    into a small MazeGrid and a FlowField is rebuilt over that, so the cost
+    depends on the radius and not on how much of the world is loaded. Tiles
+    outside the window get no step, and zombies there chase greedily.
+    """
+    
+    def __init__(self, maze, radius=ENDLESS_CHASE_RADIUS):
+        self.maze = maze
+        self.radius = radius
+        self.side = 2 * radius + 1
+        self.window = MazeGrid(self.side, self.side)
+        self.field = FlowField(self.window)
+        self.origin = (0, 0)
+        self.target = None
+    
+    def update(self, target_x, target_y):
+        """Re-copy the window and rebuild the field if the target tile changed
+        
+        Returns True when the field was rebuilt.
+        """
+        target = (int(target_x), int(target_y))
+        if target == self.target:
+            return False
+        
+        self.target = target
+        origin_x = target[0] - self.radius
+        origin_y = target[1] - self.radius
+        self.origin = (origin_x, origin_y)
+        for row in range(self.side):
+            self.window.set_row(row, self.maze.read_row(origin_x, origin_y + row, self.side))
+        return self.field.update(self.radius, self.radius)
+    
+    def distance(self, x, y):
+        """Get path distance (inside the window) to the target, or UNREACHABLE"""
+        origin_x, origin_y = self.origin
+        return self.field.distance(x - origin_x, y - origin_y)
+    
+    def next_step(self, x, y):
+        """Get the world tile one step closer to the target, or None"""
+        origin_x, origin_y = self.origin
+        step = self.field.next_step(x - origin_x, y - origin_y)
+        if step is None:
+            return None
+        return (step[0] + origin_x, step[1] + origin_y)
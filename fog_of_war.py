@@ -1,140 +1,407 @@
 import pygame
-import math
+from array import array
 from settings import *
+from fov import compute_fov
+from chunked_world import ChunkLRU, chunk_capacity
 
 class FogOfWar:
-    def __init__(self, maze_width, maze_height):
+    def __init__(self, maze_width, maze_height, vision_radius=VISION_RADIUS,
+                 soft_edges=FOG_SOFT_EDGES):
         """Initialize fog of war system"""
         self.width = maze_width
         self.height = maze_height
+        self.vision_radius = vision_radius
+        self.soft_edges = soft_edges
         
-        # Track explored areas
-        self.explored = [[False for _ in range(maze_width)] for _ in range(maze_height)]
+        # Explored and visible flags are bit-packed, one bit per tile at bit
+        # index y * width + x (least significant bit first). The buffers only
+        # grow, so later levels that fit reuse them without reallocating
+        self.explored = bytearray(bitset_size(maze_width, maze_height))
+        self.visible = bytearray(len(self.explored))
+        self.visible_tiles = set()  # Tiles marked visible by the last update
         
-        # Track currently visible areas
-        self.visible = [[False for _ in range(maze_width)] for _ in range(maze_height)]
+        # Changes made by the last recompute (see update_visibility)
+        self.became_visible = set()
+        self.became_hidden = set()
+        self.newly_explored = []
+        self.delta_version = 0
         
-        # Create fog overlay surface
-        self.fog_overlay = pygame.Surface((maze_width * CELL_SIZE, maze_height * CELL_SIZE))
-        self.fog_overlay.set_alpha(FOG_ALPHA)
+        # Player tile and maze state the current visibility was computed for
+        self.view_key = None
         
-        # Create shadow overlay surface for explored but not visible areas
-        self.shadow_overlay = pygame.Surface((maze_width * CELL_SIZE, maze_height * CELL_SIZE))
-        self.shadow_overlay.set_alpha(SHADOW_ALPHA)
+        # Indices (y * width + x) in the order tiles were first explored, so
+        # renderers can reveal new tiles incrementally by remembering how far
+        # they have read
+        self.explored_log = array('I')
+        
+        # Bumped on every reset so caches can tell levels apart
+        self.generation = 0
+        
+        # Fog mask at tile resolution, one pixel per tile: FOG_ALPHA over
+        # unexplored tiles, SHADOW_ALPHA over explored but not visible ones,
+        # clear where visible. Only tiles whose state changed are repainted
+        # before the next draw, and only the part in view is scaled up to
+        # pixels. Surfaces are created on first draw, so a headless game
+        # never allocates them
+        self.tile_mask = None
+        self.mask_dirty_tiles = set()
+        self.mask_needs_rebuild = True
+        self.mask_version = 0  # Bumped whenever the tile mask is repainted
+        
+        # The tile mask scaled up for the tiles in view, and what it shows
+        self.fog_mask = None
+        self.fog_mask_key = None
     
-    def update_visibility(self, player_x, player_y, maze):
-        """Update visibility based on player position"""
-        # Clear current visibility
-        for y in range(self.height):
-            for x in range(self.width):
-                self.visible[y][x] = False
-        
-        # Calculate visible tiles using simple distance check
-        player_tile_x = int(player_x)
-        player_tile_y = int(player_y)
-        
-        for y in range(max(0, player_tile_y - VISION_RADIUS), 
-                      min(self.height, player_tile_y + VISION_RADIUS + 1)):
-            for x in range(max(0, player_tile_x - VISION_RADIUS), 
-                          min(self.width, player_tile_x + VISION_RADIUS + 1)):
-                
-                # Check if within vision radius
-                distance = math.sqrt((x - player_x)**2 + (y - player_y)**2)
-                if distance <= VISION_RADIUS:
-                    # Simple line of sight check (can be improved with raycasting)
-                    if self.has_line_of_sight(player_x, player_y, x, y, maze):
-                        self.visible[y][x] = True
-                        self.explored[y][x] = True
+    def _ensure_mask(self):
+        """Create the tile mask, reusing the old one if it is big enough"""
+        if not _surface_fits(self.tile_mask, (self.width, self.height)):
+            self.tile_mask = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
     
-    def has_line_of_sight(self, x1, y1, x2, y2, maze):
-        """Simple line of sight check - can be improved with proper raycasting"""
-        # For simplicity, we'll use a basic distance check
-        # In a more advanced version, you would implement Bresenham's line algorithm
-        # to check for walls blocking the view
+    def update_visibility(self, player_x, player_y, maze):
+        """Recompute visibility if the player tile or the maze changed
         
-        dx = abs(x2 - x1)
-        dy = abs(y2 - y1)
-        steps = max(dx, dy)
+        Returns True when visibility was recomputed. The changes are then
+        available in became_visible, became_hidden and newly_explored until
+        the next recompute, and delta_version is bumped so consumers can
+        tell fresh deltas from ones they have already applied.
+        """
+        origin_x = int(player_x)
+        origin_y = int(player_y)
+        view_key = (origin_x, origin_y, id(maze), maze.version)
+        if view_key == self.view_key:
+            return False
+        self.view_key = view_key
         
-        if steps == 0:
-            return True
+        width = self.width
+        height = self.height
+        new_visible = set()
         
-        x_step = (x2 - x1) / steps
-        y_step = (y2 - y1) / steps
+        def mark_visible(x, y):
+            if 0 <= x < width and 0 <= y < height:
+                new_visible.add((x, y))
         
-        for i in range(int(steps) + 1):
-            check_x = int(x1 + x_step * i)
-            check_y = int(y1 + y_step * i)
-            
-            # Check bounds
-            if (check_x < 0 or check_x >= self.width or 
-                check_y < 0 or check_y >= self.height):
+        compute_fov(origin_x, origin_y, self.vision_radius, maze.is_wall, mark_visible)
+        
+        # Apply only the difference against the previous view
+        visible = self.visible
+        explored = self.explored
+        explored_log = self.explored_log
+        self.became_hidden = self.visible_tiles - new_visible
+        self.became_visible = new_visible - self.visible_tiles
+        self.newly_explored = []
+        
+        self.mask_dirty_tiles |= self.became_hidden
+        self.mask_dirty_tiles |= self.became_visible
+        
+        for x, y in self.became_hidden:
+            index = y * width + x
+            visible[index >> 3] &= ~(1 << (index & 7))
+        for x, y in self.became_visible:
+            index = y * width + x
+            bit = 1 << (index & 7)
+            visible[index >> 3] |= bit
+            if not explored[index >> 3] & bit:
+                explored[index >> 3] |= bit
+                explored_log.append(index)
+                self.newly_explored.append((x, y))
+        
+        self.visible_tiles = new_visible
+        self.delta_version += 1
+        return True
+    
+    def invalidate(self):
+        """Force the next update_visibility call to recompute"""
+        self.view_key = None
+    
+    def has_line_of_sight(self, x1, y1, x2, y2, maze):
+        """Check a straight Bresenham line between two tiles for walls"""
+        x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        step_x = 1 if x1 < x2 else -1
+        step_y = 1 if y1 < y2 else -1
+        error = dx + dy
+        
+        while (x1, y1) != (x2, y2):
+            # Walls block the view, but the target wall itself can be seen
+            if maze.is_wall(x1, y1):
                 return False
             
-            # If we hit a wall, line of sight is blocked
-            if maze[check_y][check_x] == 1:
-                # Allow seeing the wall itself, but not beyond it
-                return i == steps
+            double_error = 2 * error
+            if double_error >= dy:
+                error += dy
+                x1 += step_x
+            if double_error <= dx:
+                error += dx
+                y1 += step_y
         
-        return True
+        return maze.in_bounds(x2, y2)
+    
+    def explore_all(self):
+        """Mark the whole map as explored (map reveal / benchmarks)"""
+        explored = self.explored
+        for index in range(self.width * self.height):
+            bit = 1 << (index & 7)
+            if not explored[index >> 3] & bit:
+                explored[index >> 3] |= bit
+                self.explored_log.append(index)
+        self.mask_needs_rebuild = True
     
     def is_visible(self, x, y):
         """Check if a tile is currently visible"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.visible[y][x]
+            index = y * self.width + x
+            return bool(self.visible[index >> 3] & (1 << (index & 7)))
         return False
     
     def is_explored(self, x, y):
         """Check if a tile has been explored"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.explored[y][x]
+            index = y * self.width + x
+            return bool(self.explored[index >> 3] & (1 << (index & 7)))
         return False
     
     def should_show_entity(self, x, y):
         """Check if an entity should be visible (enemies only show if in current vision)"""
         return self.is_visible(x, y)
     
-    def draw_fog(self, screen, offset_x, offset_y):
-        """Draw fog of war overlay"""
-        # Clear fog overlay
-        self.fog_overlay.fill((0, 0, 0))
-        self.shadow_overlay.fill((0, 0, 0))
-        
-        for y in range(self.height):
-            for x in range(self.width):
-                tile_x = x * CELL_SIZE
-                tile_y = y * CELL_SIZE
-                tile_rect = pygame.Rect(tile_x, tile_y, CELL_SIZE, CELL_SIZE)
-                
-                if not self.explored[y][x]:
-                    # Completely unexplored - full fog
-                    pygame.draw.rect(self.fog_overlay, (0, 0, 0), tile_rect)
-                elif not self.visible[y][x]:
-                    # Explored but not currently visible - shadow
-                    pygame.draw.rect(self.shadow_overlay, (0, 0, 0), tile_rect)
-        
-        # Blit fog overlays to screen
-        screen.blit(self.fog_overlay, (offset_x, offset_y))
-        screen.blit(self.shadow_overlay, (offset_x, offset_y))
+    def get_tile_alpha(self, x, y):
+        """Get fog mask alpha for a tile"""
+        if not self.is_explored(x, y):
+            return FOG_ALPHA
+        if not self.is_visible(x, y):
+            return SHADOW_ALPHA
+        return 0
+    
+    def refresh_mask(self):
+        """Repaint the tile mask for tiles whose fog state changed
+        
+        Returns the repainted tiles, or None if the whole mask was rebuilt.
+        """
+        if self.mask_needs_rebuild:
+            self._ensure_mask()
+            
+            # Every visible tile is also explored, so the log covers them all
+            width = self.width
+            tiles = [(index % width, index // width) for index in self.explored_log]
+            self.tile_mask.fill((0, 0, 0, FOG_ALPHA))
+            self.mask_needs_rebuild = False
+            changed = None
+        elif self.mask_dirty_tiles:
+            tiles = changed = self.mask_dirty_tiles
+        else:
+            return ()
+        
+        for x, y in tiles:
+            self.tile_mask.set_at((x, y), (0, 0, 0, self.get_tile_alpha(x, y)))
+        self.mask_dirty_tiles = set()
+        self.mask_version += 1
+        return changed
+    
+    def draw_fog(self, screen, camera):
+        """Draw fog of war over the tiles in the camera's view
+        
+        The visible part of the tile mask is scaled up to pixels when the
+        view moves; while it stays put only the tiles that changed are
+        repainted, so a steady frame is a single blit.
+        """
+        painted_version = self.mask_version
+        changed = self.refresh_mask()
+        first_x, first_y, last_x, last_y = camera.visible_tiles_in(self.width, self.height)
+        if first_x > last_x or first_y > last_y:
+            return
+        
+        tiles = pygame.Rect(first_x, first_y, last_x - first_x + 1, last_y - first_y + 1)
+        size = (tiles.width * CELL_SIZE, tiles.height * CELL_SIZE)
+        area = pygame.Rect((0, 0), size)
+        fog_mask_key = (tuple(tiles), self.mask_version)
+        
+        if (changed and not self.soft_edges and
+                self.fog_mask_key == (fog_mask_key[0], painted_version)):
+            # Same view as the last frame: fill just the changed tiles
+            for x, y in changed:
+                if tiles.collidepoint(x, y):
+                    tile_rect = pygame.Rect((x - first_x) * CELL_SIZE, (y - first_y) * CELL_SIZE,
+                                            CELL_SIZE, CELL_SIZE)
+                    self.fog_mask.fill((0, 0, 0, self.get_tile_alpha(x, y)), tile_rect)
+        elif fog_mask_key != self.fog_mask_key:
+            if not _surface_fits(self.fog_mask, size):
+                self.fog_mask = pygame.Surface(size, pygame.SRCALPHA)
+            scale = pygame.transform.smoothscale if self.soft_edges else pygame.transform.scale
+            scale(self.tile_mask.subsurface(tiles), size, self.fog_mask.subsurface(area))
+        self.fog_mask_key = fog_mask_key
+        
+        screen.blit(self.fog_mask, camera.world_to_screen(first_x, first_y), area)
     
     def reset(self, new_width, new_height):
-        """Reset fog of war for new level"""
+        """Reset fog of war for new level, reusing buffers and surfaces"""
         self.width = new_width
         self.height = new_height
-        self.explored = [[False for _ in range(new_width)] for _ in range(new_height)]
-        self.visible = [[False for _ in range(new_width)] for _ in range(new_height)]
         
-        # Recreate overlay surfaces
-        self.fog_overlay = pygame.Surface((new_width * CELL_SIZE, new_height * CELL_SIZE))
-        self.fog_overlay.set_alpha(FOG_ALPHA)
-        self.shadow_overlay = pygame.Surface((new_width * CELL_SIZE, new_height * CELL_SIZE))
-        self.shadow_overlay.set_alpha(SHADOW_ALPHA)
+        size = bitset_size(new_width, new_height)
+        if size > len(self.explored):
+            self.explored = bytearray(size)
+            self.visible = bytearray(size)
+        else:
+            # Single C-level clear of the bytes this level uses
+            self.explored[:size] = bytes(size)
+            self.visible[:size] = bytes(size)
+        
+        self.visible_tiles = set()
+        self.became_visible = set()
+        self.became_hidden = set()
+        self.newly_explored = []
+        self.delta_version += 1
+        self.view_key = None
+        del self.explored_log[:]
+        self.generation += 1
+        
+        # Surfaces are resized (or reused) on the next draw
+        self.mask_dirty_tiles = set()
+        self.mask_needs_rebuild = True
+        self.fog_mask_key = None
     
     def get_minimap_data(self):
-        """Get explored and visible data for minimap rendering"""
+        """Get zero-copy views of the bit-packed explored and visible data"""
+        size = bitset_size(self.width, self.height)
         return {
-            'explored': self.explored,
-            'visible': self.visible,
+            'explored': memoryview(self.explored)[:size],
+            'visible': memoryview(self.visible)[:size],
             'width': self.width,
             'height': self.height
-        }
\ No newline at end of file
+        }
+
+class ChunkedFogOfWar:
+    """Fog of war for the endless dungeon, stored per world chunk
+    
+    Visibility is recomputed around the player exactly as in FogOfWar and
+    the same deltas are published. Explored flags are bit-packed per chunk
+    (bit index local_y * chunk_tiles + local_x) in an LRU bounded by a byte
+    budget, so chunks far behind the player are eventually forgotten and
+    memory stays flat.
+    """
+    
+    def __init__(self, chunk_tiles=ENDLESS_CHUNK_TILES, budget=ENDLESS_FOG_BUDGET,
+                 vision_radius=VISION_RADIUS):
+        self.chunk_tiles = chunk_tiles
+        self.vision_radius = vision_radius
+        self.chunk_bytes = bitset_size(chunk_tiles, chunk_tiles)
+        
+        # The vision circle touches at most four chunks
+        self.explored = ChunkLRU(chunk_capacity(budget, self.chunk_bytes, 4))
+        self.visible_tiles = set()
+        self.became_visible = set()
+        self.became_hidden = set()
+        self.newly_explored = []
+        self.delta_version = 0
+        self.view_key = None
+        self.generation = 0
+        
+        # Screen-sized overlay, repainted when the view or the offset changes
+        self.overlay = None
+        self.overlay_key = None
+    
+    def update_visibility(self, player_x, player_y, maze):
+        """Recompute visibility if the player tile changed (see FogOfWar)"""
+        origin_x = int(player_x)
+        origin_y = int(player_y)
+        view_key = (origin_x, origin_y, id(maze), maze.version)
+        if view_key == self.view_key:
+            return False
+        self.view_key = view_key
+        
+        new_visible = set()
+        compute_fov(origin_x, origin_y, self.vision_radius, maze.is_wall,
+                    lambda x, y: new_visible.add((x, y)))
+        
+        self.became_hidden = self.visible_tiles - new_visible
+        self.became_visible = new_visible - self.visible_tiles
+        self.newly_explored = []
+        
+        size = self.chunk_tiles
+        for x, y in self.became_visible:
+            chunk_x, local_x = divmod(x, size)
+            chunk_y, local_y = divmod(y, size)
+            bits = self.explored_bits(chunk_x, chunk_y, create=True)
+            index = local_y * size + local_x
+            bit = 1 << (index & 7)
+            if not bits[index >> 3] & bit:
+                bits[index >> 3] |= bit
+                self.newly_explored.append((x, y))
+        
+        self.visible_tiles = new_visible
+        self.delta_version += 1
+        return True
+    
+    def invalidate(self):
+        """Force the next update_visibility call to recompute"""
+        self.view_key = None
+    
+    def explored_bits(self, chunk_x, chunk_y, create=False):
+        """Get a chunk's explored bitset (None if nothing there is explored)"""
+        key = (chunk_x, chunk_y)
+        bits = self.explored.get(key)
+        if bits is None and create:
+            bits = bytearray(self.chunk_bytes)
+            self.explored.put(key, bits)
+        return bits
+    
+    def is_visible(self, x, y):
+        """Check if a tile is currently visible"""
+        return (x, y) in self.visible_tiles
+    
+    def is_explored(self, x, y):
+        """Check if a tile has been explored (and not forgotten)"""
+        size = self.chunk_tiles
+        chunk_x, local_x = divmod(x, size)
+        chunk_y, local_y = divmod(y, size)
+        bits = self.explored.peek((chunk_x, chunk_y))
+        if bits is None:
+            return False
+        index = local_y * size + local_x
+        return bool(bits[index >> 3] & (1 << (index & 7)))
+    
+    def should_show_entity(self, x, y):
+        """Check if an entity should be visible (enemies only show if in current vision)"""
+        return self.is_visible(x, y)
+    
+    def draw_fog(self, screen, camera):
+        """Shade everything on screen except the tiles in view
+        
+        Unexplored tiles are never painted by the tile layer, so they stay
+        black under the shade without a separate fog alpha.
+        """
+        size = screen.get_size()
+        if self.overlay is None or self.overlay.get_size() != size:
+            self.overlay = pygame.Surface(size, pygame.SRCALPHA)
+            self.overlay_key = None
+        
+        overlay_key = (self.delta_version, camera.offset_x, camera.offset_y)
+        if overlay_key != self.overlay_key:
+            self.overlay_key = overlay_key
+            self.overlay.fill((0, 0, 0, SHADOW_ALPHA))
+            for x, y in self.visible_tiles:
+                self.overlay.fill((0, 0, 0, 0), camera.tile_rect(x, y))
+        screen.blit(self.overlay, (0, 0))
+    
+    def reset(self):
+        """Forget everything for a new dungeon"""
+        self.explored.clear()
+        self.visible_tiles = set()
+        self.became_visible = set()
+        self.became_hidden = set()
+        self.newly_explored = []
+        self.delta_version += 1
+        self.view_key = None
+        self.generation += 1
+
+def bitset_size(width, height):
+    """Number of bytes needed to hold one bit per tile"""
+    return (width * height + 7) // 8
+
+def _surface_fits(surface, size):
+    """Check if an existing surface is at least the given size"""
+    if surface is None:
+        return False
+    width, height = surface.get_size()
+    return width >= size[0] and height >= size[1]
@@ -0,0 +1,113 @@
+"""
+Fonts and text rendering for Zombie Dungeon Escape
+Loads each font once, and caches rendered text so HUD strings are not
+re-rendered every frame
+"""
+
+from collections import OrderedDict
+import pygame
+from settings import *
+
+NUMBER_GLYPHS = "0123456789:/.-+ "  # Characters a GlyphAtlas holds by default
+
+_fonts = {}  # (name, size) -> pygame.font.Font
+_texts = OrderedDict()  # (font, text, color) -> rendered Surface, least recently used first
+_glyph_atlases = {}  # (font, color, chars) -> GlyphAtlas
+_font_caches = []  # Other modules' caches keyed by Font, emptied by clear()
+
+def get_font(size, name=None):
+    """Font of the given size (name None is pygame's default font)"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if not _fonts:
+            # Fonts cannot render after pygame.quit(), so forget them then
+            pygame.register_quit(clear)
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
+
+def render_text(font, text, color):
+    """Anti-aliased text surface, shared with every other caller of the same text
+    
+    color must be hashable (an (r, g, b) tuple). The TEXT_CACHE_SIZE most
+    recently used surfaces are kept; never draw on the returned surface.
+    """
+    key = (font, text, color)
+    surface = _texts.get(key)
+    if surface is not None:
+        _texts.move_to_end(key)
+        return surface
+    
+    surface = _texts[key] = font.render(text, True, color)
+    if len(_texts) > TEXT_CACHE_SIZE:
+        _texts.popitem(last=False)
+    return surface
+
+def glyph_atlas(font, color, chars=NUMBER_GLYPHS):
+    """Shared GlyphAtlas of a font, color and character set"""
+    key = (font, color, chars)
+    atlas = _glyph_atlases.get(key)
+    if atlas is None:
+        atlas = _glyph_atlases[key] = GlyphAtlas(font, color, chars)
+    return atlas
+
+def register_cache(cache):
+    """Have clear() also empty a cache (anything with a clear() method) keyed by fonts"""
+    _font_caches.append(cache)
+    return cache
+
+def clear():
+    """Forget every font, rendered text, glyph atlas and registered cache"""
+    _fonts.clear()
+    _texts.clear()
+    _glyph_atlases.clear()
+    for cache in _font_caches:
+        cache.clear()
+
+class GlyphAtlas:
+    """A few characters of one font and color, rendered once into a strip
+    
+    For text that changes all the time, like the timer and hit points,
+    which would miss the text cache on almost every frame. Text is drawn
+    glyph by glyph at the font's whole-pixel advances, so it can come out
+    a pixel or two narrower than font.render() would make it. Text with a
+    character outside the set falls back to render_text().
+    """
+    
+    def __init__(self, font, color, chars=NUMBER_GLYPHS):
+        self.font = font
+        self.color = color
+        self.chars = frozenset(chars)
+        glyphs = [font.render(char, True, color) for char in chars]
+        self.height = max(glyph.get_height() for glyph in glyphs)
+        self.strip = pygame.Surface((sum(glyph.get_width() for glyph in glyphs), self.height),
+                                    pygame.SRCALPHA)
+        
+        self.glyphs = {}  # char -> (area in the strip, advance in pixels)
+        x = 0
+        for char, glyph, metrics in zip(chars, glyphs, font.metrics(chars)):
+            self.strip.blit(glyph, (x, 0))
+            self.glyphs[char] = (pygame.Rect(x, 0, glyph.get_width(), self.height), metrics[4])
+            x += glyph.get_width()
+    
+    def size(self, text):
+        """Width and height text is drawn at"""
+        if not self.chars.issuperset(text):
+            return self.font.size(text)
+        glyphs = self.glyphs
+        return sum(glyphs[char][1] for char in text), self.height
+    
+    def draw(self, surface, text, position):
+        """Draw text with its top-left corner at position"""
+        if not self.chars.issuperset(text):
+            surface.blit(render_text(self.font, text, self.color), position)
+            return
+        x, y = position
+        strip = self.strip
+        glyphs = self.glyphs
+        for char in text:
+            area, advance = glyphs[char]
+            surface.blit(strip, (x, y), area)
+            x += advance
@@ -0,0 +1,65 @@
+"""
+Field of view for Zombie Dungeon Escape
+Symmetric recursive shadowcasting over the maze grid
+
+Each quadrant is scanned row by row outwards from the origin. Rows are
+narrowed by the walls found in the previous row, so every tile inside the
+radius is examined at most once per quadrant and the work grows with the
+number of visible tiles. Slopes are kept as integer (numerator, denominator)
+pairs so there is no float truncation and no Fraction overhead.
+"""
+
+# Quadrant transforms: (depth, col) -> (dx, dy) as (xx, xy, yx, yy)
+_QUADRANTS = (
+    (0, 1, -1, 0),  # North
+    (1, 0, 0, 1),   # East
+    (0, 1, 1, 0),   # South
+    (-1, 0, 0, 1),  # West
+)
+
+def compute_fov(origin_x, origin_y, radius, is_blocking, mark_visible):
+    """Call mark_visible(x, y) for every tile visible from the origin
+    
+    is_blocking(x, y) must return True for walls and for anything outside
+    the map. Walls that bound the visible area are marked visible too.
+    Visibility is symmetric: if A can see B then B can see A.
+    """
+    mark_visible(origin_x, origin_y)
+    radius_sq = radius * radius
+    
+    for xx, xy, yx, yy in _QUADRANTS:
+        _scan(origin_x, origin_y, xx, xy, yx, yy, radius, radius_sq,
+              is_blocking, mark_visible, 1, -1, 1, 1, 1)
+
+def _scan(ox, oy, xx, xy, yx, yy, radius, radius_sq, is_blocking, mark_visible,
+          depth, start_num, start_den, end_num, end_den):
+    """Scan one row of a quadrant, recursing into the rows behind it"""
+    while depth <= radius:
+        # Columns covered by the row, rounding ties towards the centre line
+        min_col = (2 * depth * start_num + start_den) // (2 * start_den)
+        max_col = -((end_den - 2 * depth * end_num) // (2 * end_den))
+        
+        prev_blocking = None
+        for col in range(min_col, max_col + 1):
+            x = ox + depth * xx + col * xy
+            y = oy + depth * yx + col * yy
+            blocking = is_blocking(x, y)
+            
+            # Walls are always revealed; floors only when symmetric
+            if depth * depth + col * col <= radius_sq and (
+                    blocking or (col * start_den >= depth * start_num and
+                                 col * end_den <= depth * end_num)):
+                mark_visible(x, y)
+            
+            if prev_blocking and not blocking:
+                # Leaving a wall: the visible wedge now starts at this tile
+                start_num, start_den = 2 * col - 1, 2 * depth
+            elif prev_blocking is False and blocking:
+                # Entering a wall: scan the open wedge before it
+                _scan(ox, oy, xx, xy, yx, yy, radius, radius_sq, is_blocking, mark_visible,
+                      depth + 1, start_num, start_den, 2 * col - 1, 2 * depth)
+            prev_blocking = blocking
+        
+        if prev_blocking is not False:
+            return
+        depth += 1
@@ -9,12 +9,12 @@ from settings import *
 class Item:
     """Represents an item in the game with rarity and equipment capabilities"""
     
-    def __init__(self, item_type, rarity='common'):
+    def __init__(self, item_type, rarity='common', rng=None):
         self.type = item_type
         self.rarity = rarity
         self.is_equipment = item_type in ['sword', 'shield', 'armor', 'helmet']
         self.equipment_slot = self._get_equipment_slot()
-        self.stats = self._get_stats()
+        self.stats = self._get_stats(rng if rng is not None else random)
         self.name = self._get_name()
         self.description = self._get_description()
         self.value = self._get_value()
@@ -61,7 +61,7 @@ class Item:
         
         return 'No description'
     
-    def _get_stats(self):
+    def _get_stats(self, rng):
         """Get item stat bonuses based on type and rarity"""
         rarity_multiplier = {
             'common': 1.0,
@@ -79,7 +79,7 @@ class Item:
             'shield': {'defense': int(3 * multiplier)},
             'armor': {'defense': int(4 * multiplier), 'health': int(10 * multiplier)},
             'helmet': {'defense': int(2 * multiplier), 'health': int(5 * multiplier)},
-            'gold': {'gold': random.randint(5, 20)}
+            'gold': {'gold': rng.randint(5, 20)}
         }
         
         return base_stats.get(self.type, {})
@@ -232,28 +232,30 @@ class Inventory:
         """Check if inventory is full"""
         return len(self.items) >= self.max_size
 
-def generate_random_item():
+def generate_random_item(rng=None):
     """Generate a random item with random rarity"""
+    rng = rng if rng is not None else random
     item_types = ['potion', 'sword', 'shield', 'armor', 'helmet', 'gold']
     rarities = ['common', 'common', 'common', 'uncommon', 'uncommon', 'rare', 'epic', 'legendary']
     
-    item_type = random.choice(item_types)
-    rarity = random.choice(rarities)
+    item_type = rng.choice(item_types)
+    rarity = rng.choice(rarities)
     
-    return Item(item_type, rarity)
+    return Item(item_type, rarity, rng)
 
-def generate_zombie_loot():
+def generate_zombie_loot(rng=None):
     """Generate loot that zombies can drop"""
-    if random.random() < 0.3:  # 30% chance to drop something
-        if random.random() < 0.6:  # 60% chance for common items
+    rng = rng if rng is not None else random
+    if rng.random() < 0.3:  # 30% chance to drop something
+        if rng.random() < 0.6:  # 60% chance for common items
             item_types = ['potion', 'gold']
         else:  # 40% chance for equipment
             item_types = ['sword', 'shield', 'armor', 'helmet']
         
-        item_type = random.choice(item_types)
-        rarity = random.choices(['common', 'uncommon', 'rare', 'epic', 'legendary'], 
-                               weights=[60, 25, 10, 4, 1])[0]
+        item_type = rng.choice(item_types)
+        rarity = rng.choices(['common', 'uncommon', 'rare', 'epic', 'legendary'], 
+                            weights=[60, 25, 10, 4, 1])[0]
         
-        return Item(item_type, rarity)
+        return Item(item_type, rarity, rng)
     
     return None
\ No newline at end of file
@@ -2,99 +2,110 @@ import pygame
 import random
 from settings import *
 from chest import Chest
+from maze_grid import MazeGrid, WALL, FLOOR
+from maze_tree import MazeTreeIndex
+from maze_generators import generate
+from spatial_index import OccupancyIndex
+from utils import find_path
+from camera import Camera
 
 class Labyrinth:
-    def __init__(self, width, height):
+    def __init__(self, width, height, rng=None, chest_rng=None, generator='backtracker', record=None):
         """
         Initialize the labyrinth with specified dimensions
-        Uses recursive backtracking algorithm to generate maze
+        generator names the maze generator (recursive backtracking by default)
+        rng carves the maze and chest_rng places and fills chests (both
+        default to the global random module)
+        record, a stored maze (see maze_pool.MazeRecord), replaces generation:
+        its tiles, exit and chest positions are used as they are and only
+        the chest contents are rolled from chest_rng
         """
         self.width = width
         self.height = height
-        self.maze = [[1 for _ in range(width)] for _ in range(height)]  # 1 = wall, 0 = path
+        self.generator = generator
+        self.rng = rng if rng is not None else random
+        self.chest_rng = chest_rng if chest_rng is not None else random
+        self.maze = MazeGrid(width, height)  # WALL = 1, FLOOR = 0
         self.exit_pos = (width - 2, height - 2)  # Exit near bottom-right
         self.chests = []  # List of treasure chests
+        self.occupancy = OccupancyIndex()  # Entities by tile for this level
+        self._tree_index = None
+        
+        if record is not None:
+            self.maze = record.to_grid()
+            self.exit_pos = record.exit_pos
+            self.exit_distance = record.exit_distance
+            self.place_chests(record.chest_positions)
+            return
         
         # Generate the maze
         self.generate_maze()
         
         # Ensure exit is accessible
-        self.maze[self.exit_pos[1]][self.exit_pos[0]] = 0
+        self.maze.set(self.exit_pos[0], self.exit_pos[1], FLOOR)
+        
+        # Builds the distance oracle now, so it is ready before the level starts
+        self.exit_distance = self.path_distance(1, 1, self.exit_pos[0], self.exit_pos[1])
         
         # Spawn treasure chests
         self.spawn_chests()
     
-    def generate_maze(self):
-        """Generate maze using recursive backtracking algorithm"""
-        # Start from top-left corner (1, 1)
-        start_x, start_y = 1, 1
-        self.maze[start_y][start_x] = 0
-        
-        # Stack for backtracking
-        stack = [(start_x, start_y)]
-        
-        while stack:
-            current_x, current_y = stack[-1]
-            
-            # Get unvisited neighbors
-            neighbors = self.get_unvisited_neighbors(current_x, current_y)
-            
-            if neighbors:
-                # Choose random neighbor
-                next_x, next_y = random.choice(neighbors)
-                
-                # Remove wall between current cell and chosen neighbor
-                wall_x = (current_x + next_x) // 2
-                wall_y = (current_y + next_y) // 2
-                self.maze[wall_y][wall_x] = 0
-                self.maze[next_y][next_x] = 0
-                
-                # Add neighbor to stack
-                stack.append((next_x, next_y))
-            else:
-                # No unvisited neighbors, backtrack
-                stack.pop()
+    @classmethod
+    def from_record(cls, record, chest_rng=None):
+        """Load a stored maze (see maze_pool) instead of generating one"""
+        return cls(record.width, record.height, chest_rng=chest_rng, record=record)
     
-    def get_unvisited_neighbors(self, x, y):
-        """Get list of unvisited neighbors that are 2 cells away"""
-        neighbors = []
-        directions = [(0, -2), (2, 0), (0, 2), (-2, 0)]  # Up, Right, Down, Left
-        
-        for dx, dy in directions:
-            new_x, new_y = x + dx, y + dy
-            
-            # Check bounds
-            if (0 < new_x < self.width - 1 and 
-                0 < new_y < self.height - 1 and 
-                self.maze[new_y][new_x] == 1):
-                neighbors.append((new_x, new_y))
+    @property
+    def tree_index(self):
+        """Exact distance oracle (every generator carves a tree), built on first use"""
+        if self._tree_index is None:
+            self._tree_index = MazeTreeIndex(self.maze)
+        return self._tree_index
+    
+    def prepare_paths(self):
+        """Build the tree index and its path chains now instead of on first use
         
-        return neighbors
+        Both take seconds on a 1001x1001 maze, so levels are prepared while
+        they are built (see Game.create_labyrinth), off the frame loop.
+        """
+        if self.tree_index.is_valid() and self.tree_index.chain_head is None:
+            self.tree_index.build_chains()
+    
+    def generate_maze(self):
+        """Carve the maze with the selected generator (see maze_generators)"""
+        generate(self.maze, self.rng, self.generator)
     
     def is_valid_position(self, x, y):
         """Check if position is valid (not a wall and within bounds)"""
-        if x < 0 or x >= self.width or y < 0 or y >= self.height:
-            return False
-        return self.maze[y][x] == 0
+        return self.maze.is_walkable(x, y)
+    
+    def path_distance(self, x1, y1, x2, y2):
+        """Get walking distance between two tiles (None if unreachable)"""
+        distance = self.tree_index.distance(x1, y1, x2, y2)
+        if distance is None and not self.tree_index.is_valid():
+            # Maze has loops or was edited: fall back to A*
+            path = find_path(x1, y1, x2, y2, self.maze, self.tree_index)
+            distance = None if path is None else len(path)
+        return distance
     
-    def draw(self, screen):
-        """Draw the labyrinth on the screen"""
-        # Calculate offset to center the maze
-        maze_pixel_width = self.width * CELL_SIZE
-        maze_pixel_height = self.height * CELL_SIZE
-        offset_x = (SCREEN_WIDTH - maze_pixel_width) // 2
-        offset_y = (SCREEN_HEIGHT - maze_pixel_height) // 2
+    def next_step_towards(self, x1, y1, x2, y2):
+        """Get the next tile on the shortest path between two tiles"""
+        if self.tree_index.is_valid():
+            return self.tree_index.next_step(x1, y1, x2, y2)
+        path = find_path(x1, y1, x2, y2, self.maze, self.tree_index)
+        return path[0] if path else None
+    
+    def draw(self, screen, camera=None):
+        """Draw the labyrinth tiles in the camera's view (centred by default)"""
+        if camera is None:
+            camera = Camera.centered_on(self.width, self.height)
+        first_x, first_y, last_x, last_y = camera.visible_tiles_in(self.width, self.height)
         
-        for y in range(self.height):
-            for x in range(self.width):
-                rect = pygame.Rect(
-                    offset_x + x * CELL_SIZE,
-                    offset_y + y * CELL_SIZE,
-                    CELL_SIZE,
-                    CELL_SIZE
-                )
+        for y in range(first_y, last_y + 1):
+            for x in range(first_x, last_x + 1):
+                rect = camera.tile_rect(x, y)
                 
-                if self.maze[y][x] == 1:
+                if self.maze.get(x, y) == WALL:
                     # Draw wall
                     pygame.draw.rect(screen, BROWN, rect)
                 else:
@@ -105,58 +116,54 @@ class Labyrinth:
                 pygame.draw.rect(screen, BLACK, rect, 1)
         
         # Draw exit
-        exit_rect = pygame.Rect(
-            offset_x + self.exit_pos[0] * CELL_SIZE,
-            offset_y + self.exit_pos[1] * CELL_SIZE,
-            CELL_SIZE,
-            CELL_SIZE
-        )
-        pygame.draw.rect(screen, GREEN, exit_rect)
-        
+        if camera.is_visible(*self.exit_pos):
+            pygame.draw.rect(screen, GREEN, camera.tile_rect(*self.exit_pos))
+    
     def spawn_chests(self):
         """Spawn treasure chests randomly in the maze"""
         chest_count = max(2, (self.width * self.height) // 50)  # 1 chest per ~50 cells
         attempts = 0
         max_attempts = 100
+        rng = self.chest_rng
         
         while len(self.chests) < chest_count and attempts < max_attempts:
-            x = random.randint(2, self.width - 3)
-            y = random.randint(2, self.height - 3)
+            x = rng.randint(2, self.width - 3)
+            y = rng.randint(2, self.height - 3)
             
             # Check if position is valid (path, not exit, not near start)
-            if (self.maze[y][x] == 0 and 
+            if (self.maze.is_walkable(x, y) and 
                 (x, y) != self.exit_pos and 
                 (x > 3 or y > 3)):  # Not too close to start
                 
                 # Check if there's already a chest nearby
-                too_close = False
-                for chest in self.chests:
-                    if abs(chest.x - x) < 3 and abs(chest.y - y) < 3:
-                        too_close = True
-                        break
+                too_close = self.occupancy.within_square(x, y, 2, Chest)
                 
                 if not too_close:
-                    self.chests.append(Chest(x, y))
+                    chest = Chest(x, y, rng)
+                    self.chests.append(chest)
+                    self.occupancy.add(chest)
             
             attempts += 1
     
+    def place_chests(self, positions):
+        """Put chests on the given tiles, rolling their contents from chest_rng"""
+        for x, y in positions:
+            chest = Chest(x, y, self.chest_rng)
+            self.chests.append(chest)
+            self.occupancy.add(chest)
+    
     def get_chest_at_position(self, x, y):
         """Get chest at specific position if exists"""
-        for chest in self.chests:
-            if chest.x == x and chest.y == y:
-                return chest
-        return None
+        return self.occupancy.first_at(x, y, Chest)
     
     def remove_chest(self, chest):
         """Remove a chest from the maze"""
-        if chest in self.chests:
+        if chest in self.occupancy:
             self.chests.remove(chest)
+            self.occupancy.remove(chest)
     
-    def get_screen_position(self, x, y):
-        """Convert maze coordinates to screen coordinates"""
-        maze_pixel_width = self.width * CELL_SIZE
-        maze_pixel_height = self.height * CELL_SIZE
-        offset_x = (SCREEN_WIDTH - maze_pixel_width) // 2
-        offset_y = (SCREEN_HEIGHT - maze_pixel_height) // 2
-        
-        return (offset_x + x * CELL_SIZE, offset_y + y * CELL_SIZE)
+    def get_screen_position(self, x, y, camera=None):
+        """Convert maze coordinates to screen coordinates (centred maze by default)"""
+        if camera is None:
+            camera = Camera.centered_on(self.width, self.height)
+        return camera.world_to_screen(x, y)
@@ -0,0 +1,88 @@
+"""
+Level preloading for Zombie Dungeon Escape
+Builds the next level on a worker thread while the current one is played
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+class PreparedLevel:
+    """A level's content, built ahead of the transition
+    
+    Holds everything that depends only on (run, level) and the seed: the
+    labyrinth with its chests and distance index, a flow field already
+    built towards the player's start tile, and the zombie spawns as
+    (x, y, speed) tuples.
+    """
+    
+    def __init__(self, run_number, level, labyrinth, flow_field, spawns):
+        self.run_number = run_number
+        self.level = level
+        self.labyrinth = labyrinth
+        self.flow_field = flow_field
+        self.spawns = spawns
+
+class LevelPreloader:
+    """Runs build(run_number, level) for the upcoming level in the background
+    
+    Only one level is ever prepared at a time. Every level draws from its
+    own RNG streams, so a level built on the worker is identical to one
+    built on the spot; take() falls back to building synchronously when
+    the level was not requested (or preloading is off), and waits for the
+    worker if the player gets there before it finishes.
+    
+    A thread is used rather than a process: the worker shares the game's
+    RandomStreams and hands back live objects, with nothing to pickle.
+    """
+    
+    def __init__(self, build, background=True):
+        self.build = build
+        self.executor = None
+        if background:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level-preload')
+        self.key = None
+        self.future = None
+    
+    def request(self, run_number, level):
+        """Start preparing a level, dropping any other level in progress"""
+        key = (run_number, level)
+        if key == self.key:
+            return
+        self.cancel()
+        self.key = key
+        if self.executor is not None:
+            self.future = self.executor.submit(self.build, run_number, level)
+    
+    def is_ready(self):
+        """Check if the requested level has finished building"""
+        return self.future is not None and self.future.done()
+    
+    def wait(self):
+        """Block until the requested level has finished building"""
+        if self.future is not None:
+            self.future.result()
+    
+    def take(self, run_number, level):
+        """Get a prepared level, building it now if it was not requested"""
+        if self.key == (run_number, level):
+            future = self.future
+            self.key = self.future = None
+        else:
+            future = None
+            self.cancel()
+        if future is not None:
+            return future.result()  # Re-raises anything the worker raised
+        return self.build(run_number, level)
+    
+    def cancel(self):
+        """Forget the requested level (a build already running is discarded)"""
+        if self.future is not None:
+            self.future.cancel()
+        self.key = None
+        self.future = None
+    
+    def shutdown(self):
+        """Stop the worker thread"""
+        self.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
@@ -3,38 +3,88 @@ import sys
 from settings import *
 from player import Player
 from labyrinth import Labyrinth
-from zombie import Zombie
+from zombie_horde import ZombieHorde
 from battle import BattleSystem
 from items import Item, LootDrop, generate_random_item
 from ui import UI
-from fog_of_war import FogOfWar
+from fog_of_war import FogOfWar, ChunkedFogOfWar
+from flow_field import FlowField, WindowedFlowField
+from chunked_world import EndlessLabyrinth
+from level_preloader import LevelPreloader, PreparedLevel
 from chest import Chest
+from rng import RandomStreams
+from recording import InputRecording
+from fonts import get_font, render_text
+from dirty_rects import RetainedFrame
 from utils import *
-import random
 import time
+import argparse
 
 class Game:
-    def __init__(self):
-        """Initialize the game with pygame and game state variables"""
-        pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Zombie Dungeon Escape")
-        self.clock = pygame.time.Clock()
+    def __init__(self, headless=False, seed=None, record=False, tick_rate=TICK_RATE, endless=False,
+                 preload=True, maze_pool=None, dirty_rects=DIRTY_RECTS, zombie_count=None):
+        """Initialize the game with pygame and game state variables
+        
+        A headless game opens no window, creates no UI, assets or fonts and
+        never draws; drive it with step() as fast as the CPU allows. All
+        randomness comes from streams derived from seed (random if None), and
+        with record=True every key press is logged to self.recording. An
+        endless game plays one unbounded, chunk-streamed dungeon instead of
+        levels with an exit. With preload, each next level is built on a
+        worker thread while the current one is played. maze_pool (a path
+        or MazePool) supplies pre-generated mazes for the level sizes it
+        holds; other sizes are still generated. With dirty_rects, level
+        play redraws and pushes only the parts of the screen that changed.
+        zombie_count fixes how many zombies each level tries to spawn, past
+        the MAX_ZOMBIES cap the normal ramp keeps for balance.
+        """
+        self.headless = headless
+        self.endless = endless
+        self.rng = RandomStreams(seed)
+        if isinstance(maze_pool, str):
+            from maze_pool import MazePool  # Only pool users pay for its imports
+            maze_pool = MazePool(maze_pool)
+        self.maze_pool = maze_pool
+        self.zombie_count = zombie_count
+        self.recording = InputRecording(self.rng.seed, tick_rate) if record else None
+        if headless:
+            self.screen = None
+            self.clock = None
+        else:
+            # Only the modules the game uses; pygame.init() would also start
+            # audio, joysticks and the rest
+            pygame.display.init()
+            pygame.font.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Zombie Dungeon Escape")
+            self.clock = pygame.time.Clock()
         
         # Game state
         self.running = True
         self.game_state = "PLAYING"  # PLAYING, BATTLE, GAME_OVER, VICTORY
         self.level = 1
         self.level_timer = LEVEL_TIME
-        self.last_time = time.time()
+        self.tick_dt = 1.0 / tick_rate  # Fixed simulation step in seconds
+        self.tick = 0  # Simulation ticks run so far
+        self.run_number = 0  # Restarts so far; keys the per-level RNG streams
+        self.level_preloader = LevelPreloader(self.build_level, background=preload)
+        self.slowest_transition = 0.0  # Longest next_level call so far, in seconds
+        self.preload_tick = None  # Tick at which the next level starts building
         
         # Initialize game objects
-        self.labyrinth = Labyrinth(MAZE_WIDTH, MAZE_HEIGHT)
+        if endless:
+            self.labyrinth = self.create_endless_labyrinth()
+            self.fog_of_war = ChunkedFogOfWar()
+            self.flow_field = WindowedFlowField(self.labyrinth.maze)
+        else:
+            self.labyrinth = self.create_labyrinth(*self.level_size(self.level))
+            self.fog_of_war = FogOfWar(self.labyrinth.width, self.labyrinth.height)
+            self.flow_field = FlowField(self.labyrinth.maze)  # Shared zombie pathfinding
+        self.zombies = ZombieHorde(rng=self.rng.zombies)  # In endless mode, spawned as chunks are populated
         self.player = Player(1, 1)  # Start position in maze
-        self.zombies = []
-        self.battle = BattleSystem()
-        self.ui = UI()
-        self.fog_of_war = FogOfWar(MAZE_WIDTH, MAZE_HEIGHT)
+        self.battle = BattleSystem(self.rng.battle)
+        self.ui = None if headless else UI()
+        self.retained_frame = RetainedFrame() if dirty_rects and not headless else None
         self.loot_drops = []  # Items dropped on the ground
         self.popup_messages = []  # Pickup and notification messages
         self.inventory_open = False  # Inventory panel state
@@ -42,34 +92,146 @@ class Game:
         # Connect UI to battle system for animations
         self.battle.set_ui_reference(self.ui)
         
-        # Spawn initial zombies
+        # Build the cached tile layer for the first level
+        self.prepare_rendering()
+        
+        # Spawn initial zombies and start building level 2
         self.spawn_zombies()
+        self.schedule_preload()
+        
+        # Fonts for the game over and victory screens (shared with the UI)
+        if not headless:
+            self.font = get_font(36)
+            self.small_font = get_font(24)
+    
+    def level_size(self, level):
+        """Maze size of a level (bigger every third level, up to the maximum)"""
+        if level % 3 == 0:
+            growth = 2 * (level // 3)
+            return min(MAZE_WIDTH + growth, MAX_MAZE_WIDTH), min(MAZE_HEIGHT + growth, MAX_MAZE_HEIGHT)
+        return MAZE_WIDTH, MAZE_HEIGHT
+    
+    def create_labyrinth(self, width, height, run_number=None, level=None):
+        """Generate the maze for a level (the current one by default) from its own RNG streams
+        
+        Its path index is built here too (see Labyrinth.prepare_paths), so
+        path queries during play never pay for it.
+        """
+        if run_number is None:
+            run_number = self.run_number
+        if level is None:
+            level = self.level
+        labyrinth = None
+        if self.maze_pool is not None:
+            record = self.maze_pool.pick(width, height, self.rng.stream('pool', run_number, level))
+            if record is not None:
+                labyrinth = Labyrinth.from_record(record, chest_rng=self.rng.stream('chests', run_number, level))
+        if labyrinth is None:
+            labyrinth = Labyrinth(width, height,
+                                  rng=self.rng.stream('maze', run_number, level),
+                                  chest_rng=self.rng.stream('chests', run_number, level),
+                                  generator=MAZE_GENERATORS[(level - 1) % len(MAZE_GENERATORS)])
+        labyrinth.prepare_paths()
+        return labyrinth
+    
+    def build_level(self, run_number, level):
+        """Build a level's content (runs on the preload worker thread)
+        
+        Touches nothing but the level's own RNG streams, so the result is
+        the same whichever thread builds it and whenever it runs. Any path
+        finding (Labyrinth falls back to A* on mazes with loops) uses the
+        worker thread's own utils.PathfindingState.
+        """
+        labyrinth = self.create_labyrinth(*self.level_size(level), run_number, level)
+        flow_field = FlowField(labyrinth.maze)
+        flow_field.update(1, 1)  # The player starts every level at (1, 1)
+        spawns = self.plan_zombie_spawns(labyrinth, run_number, level)
+        return PreparedLevel(run_number, level, labyrinth, flow_field, spawns)
+    
+    def schedule_preload(self):
+        """Build the level after this one once this one is under way
+        
+        The worker competes with the main thread for the GIL, so it is not
+        started on the transition frame itself.
+        """
+        self.preload_tick = self.tick + PRELOAD_DELAY_TICKS
+    
+    def preload_next_level(self):
+        """Start building the level after this one in the background"""
+        if not self.endless:
+            self.level_preloader.request(self.run_number, self.level + 1)
+    
+    def create_endless_labyrinth(self):
+        """Create the endless dungeon for the current run"""
+        return EndlessLabyrinth(self.rng.derive('endless', self.run_number))
+    
+    def spawn_zombies(self, spawns=None):
+        """Spawn zombies from the edges of the maze
         
-        # Font for UI (keeping for compatibility)
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        spawns is the level's plan from plan_zombie_spawns, made now if None.
+        """
+        self.zombies.clear()
+        if self.endless:
+            # Zombies arrive with the chunks they live in
+            self.stream_chunks()
+            return
         
-    def spawn_zombies(self):
-        """Spawn zombies from the edges of the maze"""
-        self.zombies = []
-        zombie_count = min(3 + self.level, 10)  # Increase zombies per level, max 10
+        if spawns is None:
+            spawns = self.plan_zombie_spawns(self.labyrinth, self.run_number, self.level)
+        for x, y, zombie_speed in spawns:
+            zombie = self.zombies.spawn(x, y, zombie_speed)
+            self.labyrinth.occupancy.add(zombie)
+    
+    def plan_zombie_spawns(self, labyrinth, run_number, level):
+        """Pick a level's zombie spawns on the maze edges as (x, y, speed)"""
+        zombie_count = self.zombie_count
+        if zombie_count is None:
+            zombie_count = min(3 + level, MAX_ZOMBIES)  # Increase zombies per level
+        rng = self.rng.stream('spawns', run_number, level)
+        spawns = []
         
         for _ in range(zombie_count):
             # Spawn from edges
-            edge = random.choice(['top', 'bottom', 'left', 'right'])
+            edge = rng.choice(['top', 'bottom', 'left', 'right'])
             if edge == 'top':
-                x, y = random.randint(1, self.labyrinth.width-2), 1
+                x, y = rng.randint(1, labyrinth.width-2), 1
             elif edge == 'bottom':
-                x, y = random.randint(1, self.labyrinth.width-2), self.labyrinth.height-2
+                x, y = rng.randint(1, labyrinth.width-2), labyrinth.height-2
             elif edge == 'left':
-                x, y = 1, random.randint(1, self.labyrinth.height-2)
+                x, y = 1, rng.randint(1, labyrinth.height-2)
             else:  # right
-                x, y = self.labyrinth.width-2, random.randint(1, self.labyrinth.height-2)
+                x, y = labyrinth.width-2, rng.randint(1, labyrinth.height-2)
             
             # Make sure spawn position is not a wall
-            if self.labyrinth.maze[y][x] == 0:
-                zombie_speed = min(ZOMBIE_BASE_SPEED + (self.level * 0.1), 2.0)
-                self.zombies.append(Zombie(x, y, zombie_speed))
+            if labyrinth.maze.is_walkable(x, y):
+                zombie_speed = min(ZOMBIE_BASE_SPEED + (level * 0.1), 2.0)
+                spawns.append((x, y, zombie_speed))
+        return spawns
+    
+    def stream_chunks(self):
+        """Stream chunks around the player and sync zombies with them (endless mode)"""
+        labyrinth = self.labyrinth
+        for chunk_x, chunk_y in labyrinth.update(self.player.x, self.player.y):
+            self.spawn_chunk_zombies(chunk_x, chunk_y)
+        for zombie in labyrinth.take_dropped():
+            self.zombies.remove(zombie)
+    
+    def spawn_chunk_zombies(self, chunk_x, chunk_y):
+        """Spawn a newly populated chunk's zombies from its own RNG stream"""
+        rng = self.rng.stream('chunk-spawns', self.run_number, chunk_x, chunk_y)
+        count = rng.randint(0, ENDLESS_ZOMBIES_PER_CHUNK)
+        if count == 0:
+            return
+        
+        tiles = self.labyrinth.chunk_floor_tiles(chunk_x, chunk_y)
+        for _ in range(count):
+            x, y = rng.choice(tiles)
+            
+            # Never spawn in sight of the player
+            if abs(x - self.player.x) + abs(y - self.player.y) <= VISION_RADIUS * 2:
+                continue
+            zombie = self.zombies.spawn(x, y, ZOMBIE_BASE_SPEED)
+            self.labyrinth.occupancy.add(zombie)
     
     def handle_events(self):
         """Handle pygame events"""
@@ -78,15 +240,27 @@ class Game:
                 self.running = False
             
             elif event.type == pygame.KEYDOWN:
-                if self.game_state == "PLAYING":
-                    self.handle_movement(event.key)
-                elif self.game_state == "BATTLE":
-                    self.battle.handle_skill_input(event.key)
-                elif self.game_state in ["GAME_OVER", "VICTORY"]:
-                    if event.key == pygame.K_r:
-                        self.restart_game()
-                    elif event.key == pygame.K_q:
-                        self.running = False
+                self.handle_key(event.key)
+            
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                # The window contents were lost; repaint all of it
+                if self.retained_frame is not None:
+                    self.retained_frame.invalidate()
+    
+    def handle_key(self, key):
+        """Handle a key press for the current game state"""
+        if self.recording is not None:
+            self.recording.record(self.tick, key)
+        
+        if self.game_state == "PLAYING":
+            self.handle_movement(key)
+        elif self.game_state == "BATTLE":
+            self.battle.handle_skill_input(key)
+        elif self.game_state in ["GAME_OVER", "VICTORY"]:
+            if key == pygame.K_r:
+                self.restart_game()
+            elif key == pygame.K_q:
+                self.running = False
     
     def handle_movement(self, key):
         """Handle player movement"""
@@ -103,43 +277,91 @@ class Game:
         if dx != 0 or dy != 0:
             self.player.move(dx, dy, self.labyrinth.maze)
     
-    def update(self):
-        """Update game state"""
+    def step(self, actions=(), n_ticks=1):
+        """Apply key presses, then advance the simulation n_ticks fixed ticks
+        
+        actions is an iterable of pygame key codes handled exactly like
+        KEYDOWN events. Nothing is drawn and nothing sleeps, so this runs as
+        fast as the simulation allows. Returns the game state afterwards.
+        """
+        for key in actions:
+            self.handle_key(key)
+        for _ in range(n_ticks):
+            if not self.running:
+                break
+            self.update(self.tick_dt)
+        return self.game_state
+    
+    def update(self, dt):
+        """Advance the simulation by one fixed tick of dt seconds"""
+        self.tick += 1
         if self.game_state == "PLAYING":
-            self.update_playing()
+            self.update_playing(dt)
         elif self.game_state == "BATTLE":
             self.update_battle()
     
-    def update_playing(self):
+    def update_playing(self, dt):
         """Update game state during playing mode"""
-        current_time = time.time()
-        dt = current_time - self.last_time
-        self.last_time = current_time
+        if self.endless:
+            self.update_endless(dt)
+            return
         
-        # Update fog of war based on player position
+        # Update fog of war (a no-op unless the player tile or maze changed)
         self.fog_of_war.update_visibility(self.player.x, self.player.y, self.labyrinth.maze)
         
+        if self.preload_tick is not None and self.tick >= self.preload_tick:
+            self.preload_tick = None
+            self.preload_next_level()
+        
         # Update timer
         self.level_timer -= dt
         if self.level_timer <= 0:
             self.game_state = "GAME_OVER"
             return
         
-        # Update zombies
-        for zombie in self.zombies:
-            zombie.update(self.player.x, self.player.y, self.labyrinth.maze, dt)
-            
-            # Check collision with player
-            if abs(zombie.x - self.player.x) < 0.8 and abs(zombie.y - self.player.y) < 0.8:
-                self.start_battle(zombie, self.zombies.index(zombie))
-                return
+        # Rebuild the zombie flow field (a no-op unless the player moved)
+        self.flow_field.update(self.player.x, self.player.y)
+        
+        # Update all zombies in one batch, then re-bucket the ones that moved
+        moved = self.zombies.update(dt, self.flow_field)
+        occupancy = self.labyrinth.occupancy
+        for zombie in self.zombies.views_for(moved):
+            occupancy.move(zombie)
+        
+        # Check collision with player
+        zombie = self.zombies.find_at(self.player.x, self.player.y)
+        if zombie:
+            self.start_battle(zombie, zombie.uid)
+            return
         
         # Check if player reached exit
         exit_x, exit_y = self.labyrinth.exit_pos
         if abs(self.player.x - exit_x) < 0.8 and abs(self.player.y - exit_y) < 0.8:
             self.next_level()
     
-    def start_battle(self, zombie, zombie_index):
+    def update_endless(self, dt):
+        """Update the endless dungeon: stream chunks, then fog and zombies
+        
+        There is no exit and no level timer; the run lasts until the player
+        falls.
+        """
+        player_x, player_y = self.player.x, self.player.y
+        maze = self.labyrinth.maze
+        self.stream_chunks()
+        self.fog_of_war.update_visibility(player_x, player_y, maze)
+        self.flow_field.update(player_x, player_y)
+        
+        # Zombies outside the flow field's window chase greedily
+        moved = self.zombies.update_windowed(dt, self.flow_field, player_x, player_y)
+        occupancy = self.labyrinth.occupancy
+        for zombie in self.zombies.views_for(moved):
+            occupancy.move(zombie)
+        
+        zombie = self.zombies.find_at(player_x, player_y)
+        if zombie:
+            self.start_battle(zombie, zombie.uid)
+    
+    def start_battle(self, zombie, zombie_id):
         """Start battle mode with a zombie"""
         self.game_state = "BATTLE"
         
@@ -154,7 +376,7 @@ class Game:
             zombie_attack = ZOMBIE_BASE_ATTACK + (self.level // 2)
             zombie_name = f"Zombie (Lv.{self.level})"
         
-        self.battle.start_battle(self.player, zombie_hp, zombie_attack, zombie_name, zombie_index)
+        self.battle.start_battle(self.player, zombie_hp, zombie_attack, zombie_name, zombie_id)
         self.current_battle_zombie = zombie
     
     def update_battle(self):
@@ -165,56 +387,99 @@ class Game:
             # Remove the defeated zombie
             if self.current_battle_zombie in self.zombies:
                 self.zombies.remove(self.current_battle_zombie)
+                self.labyrinth.occupancy.remove(self.current_battle_zombie)
             self.game_state = "PLAYING"
             self.battle.end_battle()
-            
+        
         elif battle_result == "player_lost":
             self.game_state = "GAME_OVER"
             self.battle.end_battle()
     
     def next_level(self):
-        """Progress to the next level"""
+        """Progress to the next level
+        
+        The new level was normally built in the background while this one
+        was played (see LevelPreloader), so this only swaps it in.
+        """
+        started = time.perf_counter()
         self.level += 1
         self.level_timer = LEVEL_TIME - (self.level * 5)  # Decrease time each level
         self.level_timer = max(self.level_timer, 30)  # Minimum 30 seconds
         
-        # Generate new maze (bigger every few levels)
-        maze_width = MAZE_WIDTH
-        maze_height = MAZE_HEIGHT
-        if self.level % 3 == 0:
-            maze_width = min(MAZE_WIDTH + 2, 30)
-            maze_height = min(MAZE_HEIGHT + 2, 20)
-        
-        self.labyrinth = Labyrinth(maze_width, maze_height)
-        self.fog_of_war.reset(maze_width, maze_height)  # Reset fog of war for new level
+        # Swap in the new maze (bigger every few levels; the camera scrolls
+        # mazes larger than the screen)
+        prepared = self.level_preloader.take(self.run_number, self.level)
+        self.labyrinth = prepared.labyrinth
+        self.fog_of_war.reset(self.labyrinth.width, self.labyrinth.height)  # Reset fog of war for new level
+        self.prepare_rendering()
+        self.flow_field = prepared.flow_field
         self.player.x, self.player.y = 1, 1  # Reset player position
-        self.spawn_zombies()
+        self.spawn_zombies(prepared.spawns)
+        self.schedule_preload()
         
         # Add level completion reward
-        if random.random() < 0.7:  # 70% chance for item
-            item_type = random.choice(['potion', 'sword', 'shield'])
-            item = Item(item_type)
+        rng = self.rng.rewards
+        if rng.random() < 0.7:  # 70% chance for item
+            item_type = rng.choice(['potion', 'sword', 'shield'])
+            item = Item(item_type, rng=rng)
             self.player.add_to_inventory(item)
+        
+        self.slowest_transition = max(self.slowest_transition, time.perf_counter() - started)
     
     def restart_game(self):
         """Restart the game"""
         self.level = 1
         self.level_timer = LEVEL_TIME
         self.game_state = "PLAYING"
-        self.labyrinth = Labyrinth(MAZE_WIDTH, MAZE_HEIGHT)
-        self.fog_of_war.reset(MAZE_WIDTH, MAZE_HEIGHT)  # Reset fog of war
+        self.run_number += 1
         self.player = Player(1, 1)
+        if self.endless:
+            self.labyrinth = self.create_endless_labyrinth()
+            self.fog_of_war.reset()
+            self.flow_field = WindowedFlowField(self.labyrinth.maze)
+        else:
+            self.labyrinth = self.create_labyrinth(*self.level_size(self.level))
+            self.fog_of_war.reset(self.labyrinth.width, self.labyrinth.height)  # Reset fog of war
+            self.prepare_rendering()
+            self.flow_field = FlowField(self.labyrinth.maze)
         self.spawn_zombies()
-        self.last_time = time.time()
+        self.schedule_preload()
+    
+    def save_recording(self, path):
+        """Write the input recorded so far (see InputRecording) to a file"""
+        self.recording.ticks = self.tick
+        self.recording.save(path)
     
-    def draw(self):
-        """Draw everything on the screen"""
+    def prepare_rendering(self):
+        """Build per-level render caches (nothing to do when headless)"""
+        if self.ui and not self.endless:
+            self.ui.prepare_level(self.labyrinth, self.fog_of_war)
+    
+    def draw(self, alpha=1.0):
+        """Draw everything on the screen
+        
+        alpha is how far the render time is between the last two simulation
+        ticks (0..1) and is used to interpolate moving sprites.
+        """
+        if self.headless:
+            return
+        
+        if self.game_state == "PLAYING" and self.retained_frame is not None and not self.endless:
+            rects = self.draw_playing_retained(alpha)
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+        if self.retained_frame is not None:
+            self.retained_frame.invalidate()
+        
         self.screen.fill(BLACK)
         
         if self.game_state == "PLAYING":
-            self.draw_playing()
+            self.draw_playing(alpha)
         elif self.game_state == "BATTLE":
-            self.draw_battle()
+            self.draw_battle(alpha)
         elif self.game_state == "GAME_OVER":
             self.draw_game_over()
         elif self.game_state == "VICTORY":
@@ -222,28 +487,76 @@ class Game:
         
         pygame.display.flip()
     
-    def draw_playing(self):
+    def draw_playing(self, alpha=1.0):
         """Draw the playing state with modern UI and fog of war"""
-        # Draw improved tilemap with fog of war
-        self.ui.draw_tilemap(self.screen, self.labyrinth, self.fog_of_war)
+        # Draw improved tilemap and entities with fog of war
+        self.draw_world(alpha)
         
-        # Draw entities with better sprites and fog of war
-        self.ui.draw_sprites(self.screen, self.labyrinth, self.player, self.zombies, self.fog_of_war)
-        
-        # Draw modern UI elements
+        # Draw modern UI elements (an endless dungeon has no timer or minimap)
         self.ui.draw_health_bars(self.screen, self.player)
-        self.ui.draw_timer(self.screen, self.level_timer)
+        if not self.endless:
+            self.ui.draw_timer(self.screen, self.level_timer)
         self.ui.draw_level_info(self.screen, self.level)
-        self.ui.draw_minimap(self.screen, self.labyrinth, self.player, self.zombies, self.fog_of_war)
+        if not self.endless:
+            self.ui.draw_minimap(self.screen, self.labyrinth, self.player, self.zombies, self.fog_of_war)
         self.ui.draw_skill_toolbar(self.screen, self.player, in_battle=False)
     
-    def draw_battle(self):
-        """Draw the battle state with modern UI and fog of war"""
-        # Draw background maze with fog of war (dimmed)
-        self.ui.draw_tilemap(self.screen, self.labyrinth, self.fog_of_war)
+    def draw_playing_retained(self, alpha=1.0):
+        """Draw the playing state, repainting only what changed since the last frame
+        
+        Each changed rect is repainted in full (tiles, exit glow, fog,
+        sprites and the HUD widgets it overlaps) with the screen clipped to
+        it, so the result matches draw_playing pixel for pixel. Returns the
+        rects to push to the display, or None after a full redraw.
+        """
+        ui = self.ui
+        screen = self.screen
+        labyrinth = self.labyrinth
+        fog_of_war = self.fog_of_war
+        camera = ui.camera.follow(self.player.x, self.player.y, labyrinth.width, labyrinth.height)
+        
+        # Read the fog changes before drawing applies them
+        if fog_of_war.mask_needs_rebuild or not ui.tilemap_cache.is_current(labyrinth, fog_of_war):
+            self.retained_frame.invalidate()
+        changed_rects = ui.fog_change_rects(fog_of_war)
+        ui.sync_tilemap(labyrinth, fog_of_war)
         
-        # Draw entities with fog of war
-        self.ui.draw_sprites(self.screen, self.labyrinth, self.player, self.zombies, self.fog_of_war)
+        glow = ui.exit_glow(labyrinth, fog_of_war)
+        sprites = ui.sprite_states(self.player, self.zombies, fog_of_war, alpha)
+        widgets = ui.hud_widgets(screen, labyrinth, self.player, self.zombies, fog_of_war,
+                                 self.level, self.level_timer)
+        
+        view_key = (camera.offset_x, camera.offset_y, id(labyrinth), fog_of_war.generation)
+        tracked_sprites = dict(sprites, exit_glow=glow) if glow else sprites
+        rects = self.retained_frame.diff(view_key, tracked_sprites,
+                                         {name: (rect, key) for name, rect, key, _ in widgets},
+                                         changed_rects)
+        
+        for clip in (rects if rects is not None else [screen.get_rect()]):
+            screen.set_clip(clip)
+            screen.fill(BLACK)
+            ui.blit_tilemap(screen, fog_of_war, glow)
+            ui.blit_sprites(screen, sprites)
+            for _, widget_rect, _, draw in widgets:
+                if widget_rect.colliderect(clip):
+                    draw()
+        screen.set_clip(None)
+        return rects
+    
+    def draw_world(self, alpha=1.0):
+        """Draw the maze and entities under fog of war"""
+        self.ui.camera.follow(self.player.x, self.player.y, self.labyrinth.width, self.labyrinth.height)
+        if self.endless:
+            self.ui.draw_endless(self.screen, self.labyrinth, self.player, self.zombies, self.fog_of_war)
+            return
+        
+        self.ui.draw_tilemap(self.screen, self.labyrinth, self.fog_of_war)
+        self.ui.draw_sprites(self.screen, self.labyrinth, self.player, self.zombies, self.fog_of_war, alpha)
+    
+    def draw_battle(self, alpha=1.0):
+        """Draw the battle state with modern UI and fog of war"""
+        # Draw background maze and entities with fog of war
+        self.draw_world(alpha)
         
         # Draw battle UI
         zombie_info = self.battle.get_zombie_info()
@@ -251,7 +564,7 @@ class Game:
         self.ui.draw_battle_overlay(self.screen, self.battle.battle_log, self.battle.turn)
         self.ui.draw_skill_toolbar(self.screen, self.player, in_battle=True)
     
-
+    
     
     def draw_game_over(self):
         """Draw game over screen"""
@@ -262,17 +575,17 @@ class Game:
         self.screen.blit(overlay, (0, 0))
         
         # Game over text
-        game_over_text = self.font.render("GAME OVER!", True, RED)
+        game_over_text = render_text(self.font, "GAME OVER!", RED)
         text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50))
         self.screen.blit(game_over_text, text_rect)
         
         # Instructions
-        restart_text = self.small_font.render("Press R to Restart or Q to Quit", True, WHITE)
+        restart_text = render_text(self.small_font, "Press R to Restart or Q to Quit", WHITE)
         text_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 20))
         self.screen.blit(restart_text, text_rect)
         
         # Final level
-        level_text = self.small_font.render(f"Reached Level: {self.level}", True, WHITE)
+        level_text = render_text(self.small_font, f"Reached Level: {self.level}", WHITE)
         text_rect = level_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
         self.screen.blit(level_text, text_rect)
     
@@ -284,25 +597,98 @@ class Game:
         overlay.fill(BLACK)
         self.screen.blit(overlay, (0, 0))
         
-        victory_text = self.font.render("VICTORY!", True, GREEN)
+        victory_text = render_text(self.font, "VICTORY!", GREEN)
         text_rect = victory_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
         self.screen.blit(victory_text, text_rect)
     
     def run(self):
-        """Main game loop"""
+        """Main game loop: fixed-timestep simulation, free-running rendering
+        
+        Real time from the high-resolution clock is accumulated and spent in
+        fixed ticks of tick_dt, so frame rate never changes game speed. A slow
+        frame is caught up with extra ticks (at most MAX_CATCHUP_TICKS); any
+        backlog beyond that is dropped so the game cannot spiral.
+        """
+        if self.headless:
+            raise RuntimeError("a headless game has no main loop; use step()")
+        
+        tick_dt = self.tick_dt
+        accumulator = 0.0
+        previous = time.perf_counter()
+        
         while self.running:
+            now = time.perf_counter()
+            accumulator += now - previous
+            previous = now
+            
             self.handle_events()
-            self.update()
-            self.draw()
+            
+            ticks = 0
+            while accumulator >= tick_dt and ticks < MAX_CATCHUP_TICKS:
+                self.update(tick_dt)
+                accumulator -= tick_dt
+                ticks += 1
+            if accumulator >= tick_dt:
+                accumulator %= tick_dt  # Too far behind: drop the backlog
+            
+            self.draw(accumulator / tick_dt)
             self.clock.tick(FPS)
         
+        self.level_preloader.shutdown()
         pygame.quit()
-        sys.exit()
+
+def run_headless(ticks, seed=None, endless=False, maze_pool=None, zombie_count=None):
+    """Fast-forward a game without a window and print where it ended up"""
+    game = Game(headless=True, seed=seed, endless=endless, maze_pool=maze_pool,
+                zombie_count=zombie_count)
+    start = time.perf_counter()
+    game.step(n_ticks=ticks)
+    elapsed = time.perf_counter() - start
+    game.level_preloader.shutdown()
+    
+    print(f"seed={game.rng.seed} state={game.game_state} level={game.level} tick={game.tick} "
+          f"hp={game.player.hp} zombies={len(game.zombies)} "
+          f"timer={game.level_timer:.1f}s")
+    print(f"{ticks} ticks in {elapsed:.3f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+    if game.level > 1:
+        print(f"slowest level transition {game.slowest_transition * 1000:.2f} ms")
 
 def main():
     """Entry point of the game"""
-    game = Game()
+    parser = argparse.ArgumentParser(description="Zombie Dungeon Escape")
+    parser.add_argument('--headless', action='store_true',
+                        help="run the simulation without a window as fast as possible")
+    parser.add_argument('--ticks', type=int, default=LEVEL_TIME * TICK_RATE,
+                        help="ticks to simulate in headless mode (default: one level's time)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="seed for every random stream (default: random)")
+    parser.add_argument('--record', metavar='PATH',
+                        help="save the session's input to PATH for replay.py")
+    parser.add_argument('--endless', action='store_true',
+                        help="play one endless, chunk-streamed dungeon")
+    parser.add_argument('--maze-pool', metavar='PATH',
+                        help="load level mazes from a pool built by maze_pool.py")
+    parser.add_argument('--zombies', type=int, metavar='N',
+                        help=f"zombies to spawn per level, past the usual cap of {MAX_ZOMBIES}")
+    args = parser.parse_args()
+    if args.endless and args.record:
+        parser.error("--record does not support --endless (replays always play levels)")
+    if args.maze_pool and args.record:
+        parser.error("--record does not support --maze-pool (replays generate their mazes)")
+    if args.zombies is not None and args.record:
+        parser.error("--record does not support --zombies (replays use the normal spawns)")
+    
+    if args.headless:
+        run_headless(args.ticks, args.seed, args.endless, args.maze_pool, args.zombies)
+        return
+    
+    game = Game(seed=args.seed, record=bool(args.record), endless=args.endless,
+                maze_pool=args.maze_pool, zombie_count=args.zombies)
     game.run()
+    if args.record:
+        game.save_recording(args.record)
+        print(f"Recorded {game.tick} ticks with seed {game.rng.seed} to {args.record}")
+    sys.exit()
 
 if __name__ == "__main__":
     main()
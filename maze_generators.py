@@ -0,0 +1,318 @@
+"""
+Maze generators for Zombie Dungeon Escape
+Pluggable spanning-tree carvers that all write into a MazeGrid
+
+Cells sit on odd (x, y) tiles and the tiles between them are walls until a
+generator knocks them out, so every generator produces a perfect maze (one
+path between any two floor tiles) that MazeTreeIndex can index. Generators
+are plain functions taking (maze, rng) and are looked up by name in
+GENERATORS; register_generator adds new ones.
+"""
+
+from array import array
+from maze_grid import WALL, FLOOR
+
+def lattice_size(width, height):
+    """Number of cell columns and rows that fit strictly inside the maze"""
+    return max(0, (width - 1) // 2), max(0, (height - 1) // 2)
+
+class _Lattice:
+    """Maps cell ids (cy * cols + cx) to tile buffer indices of one maze"""
+    
+    def __init__(self, maze):
+        self.maze = maze
+        self.cols, self.rows = lattice_size(maze.width, maze.height)
+        self.count = self.cols * self.rows
+        self.stride = maze.stride
+    
+    def tile_index(self, cell):
+        """Buffer index of a cell's tile"""
+        cy, cx = divmod(cell, self.cols)
+        return (2 * cy + 2) * self.stride + 2 * cx + 2
+    
+    def neighbors(self, cell, out):
+        """Fill out with the cell's neighbours in order Up, Right, Down, Left"""
+        cols = self.cols
+        cx = cell % cols
+        out.clear()
+        if cell >= cols:
+            out.append(cell - cols)
+        if cx < cols - 1:
+            out.append(cell + 1)
+        if cell + cols < self.count:
+            out.append(cell + cols)
+        if cx > 0:
+            out.append(cell - 1)
+    
+    def carve(self, cell):
+        """Open a cell's tile"""
+        self.maze.cells[self.tile_index(cell)] = FLOOR
+    
+    def carve_passage(self, a, b):
+        """Open two neighbouring cells and the wall tile between them"""
+        cells = self.maze.cells
+        index_a = self.tile_index(a)
+        index_b = self.tile_index(b)
+        cells[index_a] = FLOOR
+        cells[(index_a + index_b) // 2] = FLOOR
+        cells[index_b] = FLOOR
+
+def carve_backtracker(maze, rng):
+    """Recursive backtracker (depth-first search with an explicit stack)
+    
+    Long winding corridors. The stack can hold every cell, so memory is
+    O(cells); the neighbour list is reused between steps.
+    """
+    lattice = _Lattice(maze)
+    if not lattice.count:
+        return
+    visited = bytearray(lattice.count)
+    neighbors = []
+    candidates = []
+    
+    lattice.carve(0)
+    visited[0] = 1
+    stack = [0]
+    
+    while stack:
+        current = stack[-1]
+        lattice.neighbors(current, neighbors)
+        candidates.clear()
+        for neighbor in neighbors:
+            if not visited[neighbor]:
+                candidates.append(neighbor)
+        
+        if candidates:
+            chosen = rng.choice(candidates)
+            lattice.carve_passage(current, chosen)
+            visited[chosen] = 1
+            stack.append(chosen)
+        else:
+            stack.pop()
+    
+    maze.touch()
+
+def carve_kruskal(maze, rng):
+    """Randomized Kruskal: join cells along shuffled walls with union-find
+    
+    Many short dead ends and no directional bias.
+    """
+    lattice = _Lattice(maze)
+    cols = lattice.cols
+    count = lattice.count
+    if not count:
+        return
+    
+    # Every wall as (cell, neighbour to the right or below)
+    edges = []
+    for cell in range(count):
+        if cell % cols < cols - 1:
+            edges.append((cell, cell + 1))
+        if cell + cols < count:
+            edges.append((cell, cell + cols))
+    rng.shuffle(edges)
+    
+    parent = array('i', range(count))
+    size = array('i', [1]) * count
+    
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]  # Path halving
+            cell = parent[cell]
+        return cell
+    
+    lattice.carve(0)
+    joined = 1
+    for a, b in edges:
+        root_a = find(a)
+        root_b = find(b)
+        if root_a == root_b:
+            continue
+        if size[root_a] < size[root_b]:
+            root_a, root_b = root_b, root_a
+        parent[root_b] = root_a
+        size[root_a] += size[root_b]
+        lattice.carve_passage(a, b)
+        joined += 1
+        if joined == count:
+            break
+    
+    maze.touch()
+
+def carve_prim(maze, rng):
+    """Randomized Prim: grow the maze from a random frontier cell
+    
+    Short branching corridors radiating from the start.
+    """
+    lattice = _Lattice(maze)
+    if not lattice.count:
+        return
+    IN_MAZE, FRONTIER = 1, 2
+    state = bytearray(lattice.count)
+    neighbors = []
+    frontier = []
+    linked = []
+    
+    def add(cell):
+        state[cell] = IN_MAZE
+        lattice.neighbors(cell, neighbors)
+        for neighbor in neighbors:
+            if not state[neighbor]:
+                state[neighbor] = FRONTIER
+                frontier.append(neighbor)
+    
+    lattice.carve(0)
+    add(0)
+    
+    while frontier:
+        # Swap-remove a random frontier cell
+        position = rng.randrange(len(frontier))
+        cell = frontier[position]
+        frontier[position] = frontier[-1]
+        frontier.pop()
+        
+        lattice.neighbors(cell, neighbors)
+        linked.clear()
+        for neighbor in neighbors:
+            if state[neighbor] == IN_MAZE:
+                linked.append(neighbor)
+        lattice.carve_passage(rng.choice(linked), cell)
+        add(cell)
+    
+    maze.touch()
+
+def carve_wilson(maze, rng):
+    """Wilson's algorithm: loop-erased random walks (uniform spanning tree)
+    
+    Unbiased mazes, but the first walks wander a long time, so it is the
+    slowest generator on large mazes.
+    """
+    lattice = _Lattice(maze)
+    count = lattice.count
+    if not count:
+        return
+    in_maze = bytearray(count)
+    next_cell = array('i', [-1]) * count  # Last exit taken from each cell on the walk
+    neighbors = []
+    
+    first = rng.randrange(count)
+    in_maze[first] = 1
+    lattice.carve(first)
+    
+    for start in range(count):
+        if in_maze[start]:
+            continue
+        
+        # Random walk until the maze is hit; overwriting exits erases loops
+        cell = start
+        while not in_maze[cell]:
+            lattice.neighbors(cell, neighbors)
+            step = rng.choice(neighbors)
+            next_cell[cell] = step
+            cell = step
+        
+        # Carve the loop-erased path
+        cell = start
+        while not in_maze[cell]:
+            in_maze[cell] = 1
+            lattice.carve_passage(cell, next_cell[cell])
+            cell = next_cell[cell]
+    
+    maze.touch()
+
+def eller_rows(width, height, rng):
+    """Yield the tile rows of an Eller's-algorithm maze from top to bottom
+    
+    Each row is a width-long bytearray of WALL/FLOOR values. Only the set
+    membership of the current cell row is kept, so memory is O(width) no
+    matter how tall the maze is and rows can be written out as they come.
+    """
+    cols, rows = lattice_size(width, height)
+    wall_row = bytes([WALL]) * width
+    
+    if not cols or not rows:
+        for _ in range(height):
+            yield bytearray(wall_row)
+        return
+    yield bytearray(wall_row)
+    
+    sets = list(range(cols))  # Set id of each cell in the current row
+    members = {column: [column] for column in range(cols)}  # Set id -> columns
+    next_set = cols
+    
+    for cy in range(rows):
+        last_row = cy == rows - 1
+        cell_row = bytearray(wall_row)
+        for cx in range(cols):
+            cell_row[2 * cx + 1] = FLOOR
+        
+        # Join neighbours in different sets, always on the last row
+        for cx in range(cols - 1):
+            left, right = sets[cx], sets[cx + 1]
+            if left != right and (last_row or rng.random() < 0.5):
+                # Relabel the smaller set into the larger one
+                if len(members[left]) < len(members[right]):
+                    left, right = right, left
+                for column in members[right]:
+                    sets[column] = left
+                members[left].extend(members.pop(right))
+                cell_row[2 * cx + 2] = FLOOR
+        yield cell_row
+        
+        if last_row:
+            break
+        
+        # Every set continues down through at least one of its cells
+        link_row = bytearray(wall_row)
+        next_sets = [-1] * cols
+        next_members = {}
+        for set_id, columns in members.items():
+            down = [column for column in columns if rng.random() < 0.5]
+            if not down:
+                down = [rng.choice(columns)]
+            for column in down:
+                link_row[2 * column + 1] = FLOOR
+                next_sets[column] = set_id
+            next_members[set_id] = down
+        yield link_row
+        
+        # Cells with no passage from above start their own sets
+        for column in range(cols):
+            if next_sets[column] == -1:
+                next_sets[column] = next_set
+                next_members[next_set] = [column]
+                next_set += 1
+        sets = next_sets
+        members = next_members
+    
+    for _ in range(height - 2 * rows):
+        yield bytearray(wall_row)
+
+def carve_eller(maze, rng):
+    """Eller's algorithm, streamed into the maze one row at a time"""
+    for y, row in enumerate(eller_rows(maze.width, maze.height, rng)):
+        maze.set_row(y, row)
+
+GENERATORS = {
+    'backtracker': carve_backtracker,
+    'kruskal': carve_kruskal,
+    'prim': carve_prim,
+    'wilson': carve_wilson,
+    'eller': carve_eller,
+}
+
+def register_generator(name, generator):
+    """Make a generator function (maze, rng) selectable by name"""
+    GENERATORS[name] = generator
+
+def get_generator(name):
+    """Look up a generator by name"""
+    try:
+        return GENERATORS[name]
+    except KeyError:
+        raise ValueError(f"unknown maze generator {name!r} "
+                         f"(choose from {', '.join(sorted(GENERATORS))})") from None
+
+def generate(maze, rng, name='backtracker'):
+    """Carve a maze into a freshly created (all WALL) MazeGrid"""
+    get_generator(name)(maze, rng)
@@ -0,0 +1,139 @@
+"""
+Compact maze grid for Zombie Dungeon Escape
+Stores the labyrinth as one flat bytearray with a wall border around it
+"""
+
+import itertools
+
+WALL = 1
+FLOOR = 0
+
+# Unique id per grid, so caches can tell levels apart even if memory is reused
+_grid_ids = itertools.count(1)
+
+class MazeGrid:
+    """Flat row-major maze storage shared by every subsystem
+    
+    The buffer is (width + 2) x (height + 2) cells: the extra ring of WALL
+    cells means a step from any in-bounds tile never leaves the buffer, so
+    neighbour checks done through index offsets need no bounds test.
+    """
+    
+    def __init__(self, width, height, fill=WALL):
+        self.grid_id = next(_grid_ids)
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        self.cells = bytearray([WALL]) * (self.stride * (height + 2))
+        
+        # Bumped on every write so dependent caches can detect maze edits
+        self.version = 0
+        
+        # Index offsets for the four orthogonal neighbours: Up, Right, Down, Left
+        self.neighbor_offsets = (-self.stride, 1, self.stride, -1)
+        
+        if fill != WALL:
+            self.fill(fill)
+    
+    def index(self, x, y):
+        """Get the buffer index of tile (x, y)"""
+        return (y + 1) * self.stride + x + 1
+    
+    def position(self, index):
+        """Get the tile (x, y) stored at a buffer index"""
+        y, x = divmod(index, self.stride)
+        return (x - 1, y - 1)
+    
+    def in_bounds(self, x, y):
+        """Check if (x, y) lies inside the maze"""
+        return 0 <= x < self.width and 0 <= y < self.height
+    
+    def get(self, x, y):
+        """Get tile value, treating anything outside the maze as wall"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[(y + 1) * self.stride + x + 1]
+        return WALL
+    
+    def set(self, x, y, value):
+        """Set tile value inside the maze"""
+        self.cells[(y + 1) * self.stride + x + 1] = value
+        self.version += 1
+    
+    def set_row(self, y, values):
+        """Overwrite row y from a width-long sequence of tile values"""
+        start = (y + 1) * self.stride + 1
+        self.cells[start:start + self.width] = values
+        self.version += 1
+    
+    def touch(self):
+        """Bump the version after writing to cells directly"""
+        self.version += 1
+    
+    def is_wall(self, x, y):
+        """Check if tile is a wall (out of bounds counts as wall)"""
+        return self.get(x, y) == WALL
+    
+    def is_walkable(self, x, y):
+        """Check if tile is inside the maze and not a wall"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[(y + 1) * self.stride + x + 1] == FLOOR
+        return False
+    
+    def is_walkable_index(self, index):
+        """Check walkability by buffer index (border cells are walls)"""
+        return self.cells[index] == FLOOR
+    
+    def fill(self, value):
+        """Fill the interior of the maze, leaving the wall border intact"""
+        row = bytes([value]) * self.width
+        for y in range(self.height):
+            start = (y + 1) * self.stride + 1
+            self.cells[start:start + self.width] = row
+        self.version += 1
+    
+    def row(self, y):
+        """Get a zero-copy view of row y (without the border)"""
+        start = (y + 1) * self.stride + 1
+        return memoryview(self.cells)[start:start + self.width]
+    
+    def rows(self):
+        """Iterate zero-copy views of every row"""
+        for y in range(self.height):
+            yield self.row(y)
+    
+    def walkable_mask(self):
+        """Get a width*height row-major bytearray with 1 for walkable tiles"""
+        mask = bytearray(self.width * self.height)
+        for y in range(self.height):
+            start = (y + 1) * self.stride + 1
+            row = self.cells[start:start + self.width]
+            mask[y * self.width:(y + 1) * self.width] = row.translate(_WALKABLE_TABLE)
+        return mask
+    
+    def wall_mask(self):
+        """Get a width*height row-major bytearray with 1 for wall tiles"""
+        mask = bytearray(self.width * self.height)
+        for y in range(self.height):
+            start = (y + 1) * self.stride + 1
+            mask[y * self.width:(y + 1) * self.width] = self.cells[start:start + self.width]
+        return mask
+    
+    def floor_count(self):
+        """Count walkable tiles"""
+        return self.cells.count(FLOOR)
+    
+    def to_lists(self):
+        """Get the maze as a list of lists (maze[y][x]) for legacy callers"""
+        return [list(row) for row in self.rows()]
+    
+    def __getitem__(self, y):
+        """Support legacy maze[y][x] indexing through a row view"""
+        if not 0 <= y < self.height:
+            raise IndexError("maze row out of range")
+        return self.row(y)
+    
+    def __len__(self):
+        return self.height
+
+# Translation table mapping FLOOR -> 1 and everything else -> 0
+_WALKABLE_TABLE = bytes(1 if value == FLOOR else 0 for value in range(256))
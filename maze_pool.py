@@ -0,0 +1,240 @@
+"""
+Pre-generated maze pool for Zombie Dungeon Escape
+A compact binary maze format and a memory-mapped file of many mazes
+
+Maze record (little-endian):
+    header   magic b'ZMZ1', width u32, height u32, seed u64,
+             exit x u32, exit y u32, exit distance i32 (-1 if unknown),
+             chest count u32
+    chests   chest count x (x u32, y u32)
+    tiles    one bit per tile, bit index y * width + x, least significant
+             bit first, 1 = WALL
+
+Pool file:
+    header   magic b'ZMPL', format version u32, record count u32
+    offsets  record count x u64, byte offset of each record
+    records  the maze records back to back
+
+A pool is opened with mmap and records are read in place: only the fixed
+headers are unpacked, and the tile bits are expanded into a MazeGrid with
+numpy in one pass. Build and check pools from the command line:
+    python maze_pool.py build mazes.pool --sizes 20x15 81x61 --count 100
+    python maze_pool.py validate mazes.pool
+    python maze_pool.py info mazes.pool
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import numpy as np
+from settings import *
+from maze_grid import MazeGrid, WALL
+from maze_tree import MazeTreeIndex
+from rng import RandomStreams
+
+MAZE_MAGIC = b'ZMZ1'
+POOL_MAGIC = b'ZMPL'
+POOL_VERSION = 1
+
+MAZE_HEADER = struct.Struct('<4sIIQIIiI')
+CHEST_ENTRY = struct.Struct('<II')
+POOL_HEADER = struct.Struct('<4sII')
+POOL_OFFSET = struct.Struct('<Q')
+
+class MazeRecord:
+    """One stored maze, read in place from a buffer (bytes or mmap)"""
+    
+    def __init__(self, buffer, offset=0):
+        (magic, self.width, self.height, self.seed, exit_x, exit_y,
+         exit_distance, self.chest_count) = MAZE_HEADER.unpack_from(buffer, offset)
+        if magic != MAZE_MAGIC:
+            raise ValueError(f"not a maze record at offset {offset}")
+        self.buffer = buffer
+        self.offset = offset
+        self.exit_pos = (exit_x, exit_y)
+        self.exit_distance = None if exit_distance < 0 else exit_distance
+        self.chests_offset = offset + MAZE_HEADER.size
+        self.bits_offset = self.chests_offset + self.chest_count * CHEST_ENTRY.size
+        self.size = self.bits_offset + bits_size(self.width, self.height) - offset
+    
+    @property
+    def chest_positions(self):
+        """Chest tiles as a list of (x, y)"""
+        return [CHEST_ENTRY.unpack_from(self.buffer, self.chests_offset + i * CHEST_ENTRY.size)
+                for i in range(self.chest_count)]
+    
+    def to_grid(self):
+        """Expand the tile bits into a new MazeGrid"""
+        width, height = self.width, self.height
+        maze = MazeGrid(width, height)
+        packed = np.frombuffer(self.buffer, np.uint8, bits_size(width, height), self.bits_offset)
+        walls = np.unpackbits(packed, count=width * height, bitorder='little')
+        cells = np.frombuffer(maze.cells, np.uint8).reshape(height + 2, width + 2)
+        cells[1:-1, 1:-1] = walls.reshape(height, width)
+        maze.touch()
+        return maze
+
+def bits_size(width, height):
+    """Bytes of tile bits in a record"""
+    return (width * height + 7) // 8
+
+def encode_maze(maze, exit_pos, chest_positions, seed=0, exit_distance=None):
+    """Pack a maze and its layout into a record"""
+    walls = np.frombuffer(maze.wall_mask(), np.uint8)
+    bits = np.packbits(walls == WALL, bitorder='little')
+    header = MAZE_HEADER.pack(MAZE_MAGIC, maze.width, maze.height, seed, exit_pos[0], exit_pos[1],
+                              -1 if exit_distance is None else exit_distance, len(chest_positions))
+    chests = b''.join(CHEST_ENTRY.pack(x, y) for x, y in chest_positions)
+    return header + chests + bits.tobytes()
+
+def encode_labyrinth(labyrinth, seed=0):
+    """Pack a generated Labyrinth into a record"""
+    return encode_maze(labyrinth.maze, labyrinth.exit_pos,
+                       [(chest.x, chest.y) for chest in labyrinth.chests],
+                       seed, labyrinth.exit_distance)
+
+def generate_record(width, height, seed, generator='backtracker'):
+    """Generate one maze from a seed and pack it (runs in worker processes)"""
+    from labyrinth import Labyrinth
+    streams = RandomStreams(seed)
+    labyrinth = Labyrinth(width, height, rng=streams.stream('maze'),
+                          chest_rng=streams.stream('chests'), generator=generator)
+    return encode_labyrinth(labyrinth, seed)
+
+def _generate_job(job):
+    return generate_record(*job)
+
+def validate_record(record):
+    """List what is wrong with a stored maze (empty if it is playable)"""
+    problems = []
+    maze = record.to_grid()
+    tree = MazeTreeIndex(maze)
+    if not tree.is_tree:
+        problems.append("maze is not a perfect maze (loops or disconnected areas)")
+    exit_x, exit_y = record.exit_pos
+    if not maze.is_walkable(1, 1):
+        problems.append("start tile (1, 1) is not a floor tile")
+    if not maze.is_walkable(exit_x, exit_y):
+        problems.append(f"exit {record.exit_pos} is not a floor tile")
+    if not problems and record.exit_distance != tree.distance(1, 1, exit_x, exit_y):
+        problems.append("stored exit distance does not match the maze")
+    for x, y in record.chest_positions:
+        if not maze.is_walkable(x, y) or (x, y) == record.exit_pos:
+            problems.append(f"chest at {(x, y)} is not on a free floor tile")
+    return problems
+
+class MazePool:
+    """A pool file of maze records, memory-mapped and read in place"""
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = POOL_HEADER.unpack_from(self.buffer, 0)
+        if magic != POOL_MAGIC:
+            raise ValueError(f"{path} is not a maze pool")
+        if version != POOL_VERSION:
+            raise ValueError(f"{path} has pool format version {version}, expected {POOL_VERSION}")
+        self._by_size = None
+    
+    def __len__(self):
+        return self.count
+    
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError("maze pool index out of range")
+        offset, = POOL_OFFSET.unpack_from(self.buffer, POOL_HEADER.size + index * POOL_OFFSET.size)
+        return MazeRecord(self.buffer, offset)
+    
+    def by_size(self):
+        """Record indices grouped by (width, height), read once from the headers"""
+        if self._by_size is None:
+            self._by_size = {}
+            for index in range(self.count):
+                record = self[index]
+                self._by_size.setdefault((record.width, record.height), []).append(index)
+        return self._by_size
+    
+    def pick(self, width, height, rng):
+        """Choose a random record of the given size, or None if there is none"""
+        indices = self.by_size().get((width, height))
+        if not indices:
+            return None
+        return self[rng.choice(indices)]
+    
+    def close(self):
+        self.buffer.close()
+
+def write_pool(path, records):
+    """Write encoded records (bytes) to a pool file"""
+    offset = POOL_HEADER.size + len(records) * POOL_OFFSET.size
+    with open(path, 'wb') as f:
+        f.write(POOL_HEADER.pack(POOL_MAGIC, POOL_VERSION, len(records)))
+        for record in records:
+            f.write(POOL_OFFSET.pack(offset))
+            offset += len(record)
+        for record in records:
+            f.write(record)
+
+def build_pool(path, sizes, count, generator='backtracker', seed=0, workers=None):
+    """Generate count mazes per size across worker processes and write a pool
+    
+    Maze i of a size is generated from seed + i, so a pool can be rebuilt
+    exactly and any maze in it regenerated from its stored seed.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    jobs = [(width, height, seed + i, generator) for width, height in sizes for i in range(count)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        records = list(executor.map(_generate_job, jobs, chunksize=max(1, len(jobs) // 64)))
+    write_pool(path, records)
+    return len(records)
+
+def parse_size(text):
+    """Parse a WIDTHxHEIGHT command-line size"""
+    width, _, height = text.lower().partition('x')
+    return int(width), int(height or width)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and check pre-generated maze pools")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    build = commands.add_parser('build', help="generate a pool in parallel")
+    build.add_argument('path')
+    build.add_argument('--sizes', nargs='+', type=parse_size, default=[(MAZE_WIDTH, MAZE_HEIGHT)],
+                       metavar='WxH', help="maze sizes to generate (default: the first level's)")
+    build.add_argument('--count', type=int, default=100, help="mazes per size (default: 100)")
+    build.add_argument('--generator', default='backtracker', help="maze generator name")
+    build.add_argument('--seed', type=int, default=0, help="seed of the first maze of each size")
+    build.add_argument('--workers', type=int, default=None,
+                       help="worker processes (default: one per core)")
+    
+    validate = commands.add_parser('validate', help="check every maze in a pool")
+    validate.add_argument('path')
+    
+    info = commands.add_parser('info', help="list the sizes in a pool")
+    info.add_argument('path')
+    args = parser.parse_args()
+    
+    if args.command == 'build':
+        written = build_pool(args.path, args.sizes, args.count, args.generator, args.seed, args.workers)
+        print(f"Wrote {written} mazes ({os.path.getsize(args.path) / 1024:.0f} KiB) to {args.path}")
+        return
+    
+    pool = MazePool(args.path)
+    if args.command == 'info':
+        for (width, height), indices in sorted(pool.by_size().items()):
+            print(f"{width}x{height}: {len(indices)} mazes")
+    else:
+        failures = 0
+        for index in range(len(pool)):
+            for problem in validate_record(pool[index]):
+                print(f"maze {index}: {problem}")
+                failures += 1
+        print(f"{len(pool)} mazes checked, {failures} problem(s)")
+        if failures:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
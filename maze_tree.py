@@ -0,0 +1,233 @@
+"""
+Tree distance oracle for Zombie Dungeon Escape
+Exact path distances on perfect mazes via lowest common ancestors
+
+A maze carved by a spanning-tree generator has exactly one path between any
+two tiles, so the walking distance is depth(a) + depth(b) - 2 * depth(lca).
+The index roots the tree once, then answers distance and next-step queries
+in O(log n) with binary lifting and no per-query search.
+"""
+
+from array import array
+import numpy as np
+from maze_grid import FLOOR
+
+class MazeTreeIndex:
+    """LCA index over the walkable tiles of a perfect maze
+    
+    If the maze has loops or disconnected areas the index marks itself as
+    not a tree and every query returns None, so callers can fall back to a
+    real search. Editing the maze afterwards invalidates it the same way.
+    """
+    
+    def __init__(self, maze, root=None):
+        self.maze = maze
+        self.maze_version = maze.version
+        self.node_of = array('i', [-1]) * len(maze.cells)  # buffer index -> node
+        self.cell_of = array('i')  # node -> buffer index
+        self.depth = array('i')
+        self.ancestors = []  # ancestors[k][node] is the 2**k-th ancestor
+        self.chain_head = None  # Heavy path decomposition, see build_chains
+        self.is_tree = self._build(root)
+    
+    def _build(self, root):
+        """Root the maze at a floor tile and build the lifting tables"""
+        maze = self.maze
+        cells = maze.cells
+        offsets = maze.neighbor_offsets
+        node_of = self.node_of
+        cell_of = self.cell_of
+        depth = self.depth
+        
+        root_index = maze.index(*root) if root else cells.find(FLOOR)
+        if root_index < 0 or cells[root_index] != FLOOR:
+            return False
+        
+        # BFS assigns node ids in visiting order, so parents come first
+        parents = array('i', [0])
+        node_of[root_index] = 0
+        cell_of.append(root_index)
+        depth.append(0)
+        degree_total = 0
+        node = 0
+        
+        while node < len(cell_of):
+            index = cell_of[node]
+            for offset in offsets:
+                neighbor = index + offset
+                if cells[neighbor] != FLOOR:
+                    continue
+                degree_total += 1
+                if node_of[neighbor] == -1:
+                    node_of[neighbor] = len(cell_of)
+                    cell_of.append(neighbor)
+                    parents.append(node)
+                    depth.append(depth[node] + 1)
+            node += 1
+        
+        # A tree is connected and has exactly one edge fewer than nodes
+        node_count = len(cell_of)
+        if node_count != maze.floor_count() or degree_total // 2 != node_count - 1:
+            return False
+        
+        self.ancestors = [parents]
+        max_depth = max(depth)
+        while (1 << len(self.ancestors)) <= max_depth:
+            previous = self.ancestors[-1]
+            self.ancestors.append(array('i', [previous[parent] for parent in previous]))
+        return True
+    
+    def is_valid(self):
+        """Check if the index can answer queries for the maze as it is now"""
+        return self.is_tree and self.maze_version == self.maze.version
+    
+    def _node(self, x, y):
+        """Get the node id of a tile, or -1 if it is not walkable"""
+        if not self.maze.in_bounds(x, y):
+            return -1
+        return self.node_of[self.maze.index(x, y)]
+    
+    def _lift(self, node, steps):
+        """Climb the given number of steps towards the root"""
+        level = 0
+        while steps:
+            if steps & 1:
+                node = self.ancestors[level][node]
+            steps >>= 1
+            level += 1
+        return node
+    
+    def _lca(self, a, b):
+        """Lowest common ancestor of two nodes"""
+        depth = self.depth
+        if depth[a] < depth[b]:
+            a, b = b, a
+        a = self._lift(a, depth[a] - depth[b])
+        if a == b:
+            return a
+        
+        for up in reversed(self.ancestors):
+            if up[a] != up[b]:
+                a = up[a]
+                b = up[b]
+        return self.ancestors[0][a]
+    
+    def distance(self, x1, y1, x2, y2):
+        """Exact walking distance between two tiles, or None"""
+        if not self.is_valid():
+            return None
+        a = self._node(x1, y1)
+        b = self._node(x2, y2)
+        if a < 0 or b < 0:
+            return None
+        
+        depth = self.depth
+        return depth[a] + depth[b] - 2 * depth[self._lca(a, b)]
+    
+    def next_step(self, x1, y1, x2, y2):
+        """Tile one step from (x1, y1) along the path to (x2, y2), or None"""
+        if not self.is_valid():
+            return None
+        a = self._node(x1, y1)
+        b = self._node(x2, y2)
+        if a < 0 or b < 0 or a == b:
+            return None
+        
+        if self._lca(a, b) != a:
+            # The target is not below us: the path starts towards the root
+            step = self.ancestors[0][a]
+        else:
+            # The target is in our subtree: step to the child on its branch
+            step = self._lift(b, self.depth[b] - self.depth[a] - 1)
+        return self.maze.position(self.cell_of[step])
+    
+    def build_chains(self):
+        """Split the tree into heavy paths for path(), built on first use
+        
+        Takes about half a second on a 1001x1001 maze, so callers with big
+        mazes build them ahead of time (see Labyrinth.prepare_paths).
+        
+        Every node continues the chain of its largest subtree child, so any
+        path crosses O(log n) chains. Chains are laid out back to back, so
+        the tiles of a chain segment are a contiguous slice of chain_x and
+        chain_y.
+        """
+        parents = self.ancestors[0]
+        cell_of = self.cell_of
+        stride = self.maze.stride
+        node_count = len(parents)
+        
+        # Nodes are in BFS order, so children always come after parents
+        subtree = array('i', [1]) * node_count
+        for node in range(node_count - 1, 0, -1):
+            subtree[parents[node]] += subtree[node]
+        heavy = array('i', [-1]) * node_count
+        largest = array('i', [0]) * node_count
+        for node in range(1, node_count):
+            parent = parents[node]
+            if subtree[node] > largest[parent]:
+                largest[parent] = subtree[node]
+                heavy[parent] = node
+        
+        head = array('i', [0]) * node_count
+        chain_pos = array('i', [0]) * node_count
+        chain_x = array('i', [0]) * node_count
+        chain_y = array('i', [0]) * node_count
+        position = 0
+        for start in range(node_count):
+            if start and heavy[parents[start]] == start:
+                continue  # Laid out with its parent's chain
+            node = start
+            while node >= 0:
+                head[node] = start
+                chain_pos[node] = position
+                y, x = divmod(cell_of[node], stride)
+                chain_x[position] = x - 1
+                chain_y[position] = y - 1
+                position += 1
+                node = heavy[node]
+        
+        self.chain_head = head
+        self.chain_pos = chain_pos
+        self.chain_x = np.frombuffer(chain_x, np.int32)
+        self.chain_y = np.frombuffer(chain_y, np.int32)
+    
+    def path(self, x1, y1, x2, y2):
+        """Tiles after (x1, y1) up to (x2, y2) along the maze's only path, or None
+        
+        The path is cut into chain segments (see build_chains) and read as
+        array slices, so a path thousands of tiles long costs little more
+        than building its list of tiles.
+        """
+        if not self.is_valid():
+            return None
+        a = self._node(x1, y1)
+        b = self._node(x2, y2)
+        if a < 0 or b < 0:
+            return None
+        if self.chain_head is None:
+            self.build_chains()
+        
+        parents = self.ancestors[0]
+        depth = self.depth
+        head = self.chain_head
+        chain_pos = self.chain_pos
+        up = []  # Segments climbed from a, in walking order
+        down = []  # Segments climbed from b, walked in reverse
+        while head[a] != head[b]:
+            if depth[head[a]] >= depth[head[b]]:
+                up.append(np.arange(chain_pos[a], chain_pos[head[a]] - 1, -1))
+                a = parents[head[a]]
+            else:
+                down.append(np.arange(chain_pos[head[b]], chain_pos[b] + 1))
+                b = parents[head[b]]
+        
+        # a and b are now on one chain, and the shallower is the common ancestor
+        if depth[a] >= depth[b]:
+            up.append(np.arange(chain_pos[a], chain_pos[b] - 1, -1))
+        else:
+            up.append(np.arange(chain_pos[a], chain_pos[b] + 1))
+        down.reverse()
+        
+        order = np.concatenate(up + down)[1:]
+        return list(zip(self.chain_x[order].tolist(), self.chain_y[order].tolist()))
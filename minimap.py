@@ -0,0 +1,135 @@
+"""
+Minimap for Zombie Dungeon Escape
+Keeps the explored maze at one pixel per tile and scales it into the panel
+"""
+
+import pygame
+from settings import *
+from maze_grid import WALL
+
+MINIMAP_BACKGROUND = (20, 20, 20)
+# Tile colors by (is wall, is visible)
+MINIMAP_COLORS = {
+    (True, True): (100, 100, 100),
+    (True, False): (60, 60, 60),  # Darker for explored but not visible
+    (False, True): (150, 150, 150),
+    (False, False): (100, 100, 100),
+}
+
+class Minimap:
+    """Minimap panel drawn from a persistent tile-resolution surface
+    
+    The tile surface holds one pixel per maze tile and is only repainted
+    where a tile's explored or visible state changed: newly explored tiles
+    are read from the fog's explored_log, and tiles entering or leaving the
+    view are the difference between the fog's visible tiles and the ones
+    painted as visible. When it changed it is scaled into the panel with a
+    single transform.scale, and the exit, player and zombie markers are
+    drawn on top, so a frame costs the same on any maze size.
+    """
+    
+    def __init__(self, rect):
+        self.rect = rect
+        self.tiles = None  # One pixel per tile
+        self.panel = pygame.Surface(rect.size)  # tiles scaled to the panel
+        self.key = None  # Maze and fog state the tile surface was built for
+        self.log_position = 0
+        self.painted_visible = set()
+        self.visible_version = None  # fog delta_version painted_visible matches
+        self.panel_dirty = True
+    
+    def sync(self, labyrinth, fog_of_war=None):
+        """Repaint the tiles whose explored or visible state changed"""
+        maze = labyrinth.maze
+        key = (id(maze), maze.version, id(fog_of_war), fog_of_war.generation if fog_of_war else None)
+        if key != self.key:
+            self.rebuild(labyrinth, fog_of_war)
+            self.key = key
+            return
+        if fog_of_war is None:
+            return
+        
+        explored_log = fog_of_war.explored_log
+        if self.log_position < len(explored_log):
+            width = labyrinth.width
+            for index in explored_log[self.log_position:]:
+                y, x = divmod(index, width)
+                self.paint_tile(maze, fog_of_war, x, y)
+            self.log_position = len(explored_log)
+        
+        if fog_of_war.delta_version != self.visible_version:
+            visible_tiles = fog_of_war.visible_tiles
+            for x, y in visible_tiles ^ self.painted_visible:
+                self.paint_tile(maze, fog_of_war, x, y)
+            self.painted_visible = set(visible_tiles)
+            self.visible_version = fog_of_war.delta_version
+    
+    def rebuild(self, labyrinth, fog_of_war=None):
+        """Paint the tile surface from scratch for a new level"""
+        maze = labyrinth.maze
+        size = (labyrinth.width, labyrinth.height)
+        if self.tiles is None or self.tiles.get_size() != size:
+            self.tiles = pygame.Surface(size)
+        self.tiles.fill(MINIMAP_BACKGROUND)
+        self.panel_dirty = True
+        
+        if fog_of_war is None:
+            # Everything is shown as visible
+            for y in range(labyrinth.height):
+                maze_row = maze.row(y)
+                for x in range(labyrinth.width):
+                    self.tiles.set_at((x, y), MINIMAP_COLORS[(maze_row[x] == WALL, True)])
+            return
+        
+        width = labyrinth.width
+        for index in fog_of_war.explored_log:
+            y, x = divmod(index, width)
+            self.paint_tile(maze, fog_of_war, x, y)
+        self.log_position = len(fog_of_war.explored_log)
+        self.painted_visible = set(fog_of_war.visible_tiles)
+        self.visible_version = fog_of_war.delta_version
+    
+    def paint_tile(self, maze, fog_of_war, x, y):
+        """Paint one tile's current state"""
+        if fog_of_war.is_explored(x, y):
+            color = MINIMAP_COLORS[(maze.is_wall(x, y), fog_of_war.is_visible(x, y))]
+        else:
+            color = MINIMAP_BACKGROUND
+        self.tiles.set_at((x, y), color)
+        self.panel_dirty = True
+    
+    def draw(self, screen, labyrinth, player, zombies, fog_of_war=None):
+        """Draw the panel and its markers"""
+        self.sync(labyrinth, fog_of_war)
+        if self.panel_dirty:
+            pygame.transform.scale(self.tiles, self.rect.size, self.panel)
+            self.panel_dirty = False
+        
+        rect = self.rect
+        screen.blit(self.panel, rect)
+        pygame.draw.rect(screen, WHITE, rect, 2)
+        
+        scale_x = rect.width / labyrinth.width
+        scale_y = rect.height / labyrinth.height
+        
+        # Draw exit (only if explored)
+        exit_x, exit_y = labyrinth.exit_pos
+        if not fog_of_war or fog_of_war.is_explored(exit_x, exit_y):
+            color = GREEN
+            if fog_of_war and not fog_of_war.is_visible(exit_x, exit_y):
+                color = DARK_GREEN  # Darker if not currently visible
+            pygame.draw.rect(screen, color,
+                             pygame.Rect(rect.x + int(exit_x * scale_x), rect.y + int(exit_y * scale_y),
+                                         max(2, int(scale_x)), max(2, int(scale_y))))
+        
+        # Draw player (always visible)
+        pygame.draw.rect(screen, BLUE,
+                         pygame.Rect(rect.x + int(player.x * scale_x), rect.y + int(player.y * scale_y),
+                                     max(3, int(scale_x)), max(3, int(scale_y))))
+        
+        # Draw zombies (only if currently visible)
+        for zombie in zombies:
+            if not fog_of_war or fog_of_war.should_show_entity(int(zombie.x), int(zombie.y)):
+                pygame.draw.rect(screen, RED,
+                                 pygame.Rect(rect.x + int(zombie.x * scale_x), rect.y + int(zombie.y * scale_y),
+                                             max(2, int(scale_x)), max(2, int(scale_y))))
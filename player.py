@@ -44,9 +44,7 @@ class Player:
         new_y = self.y + dy
         
         # Check bounds and walls
-        if (0 <= new_x < len(maze[0]) and 
-            0 <= new_y < len(maze) and 
-            maze[new_y][new_x] == 0):
+        if maze.is_walkable(new_x, new_y):
             self.x = new_x
             self.y = new_y
             return True
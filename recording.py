@@ -0,0 +1,68 @@
+"""
+Input recording for Zombie Dungeon Escape
+Compact tick-stamped key log that replays a session exactly
+"""
+
+import json
+
+FORMAT_NAME = 'zde-replay'
+FORMAT_VERSION = 1
+
+class InputRecording:
+    """Seed plus every key press of a session, stamped with its tick
+    
+    A key stamped with tick t was handled after t simulation ticks had run,
+    so replaying a Game built from the same seed and tick rate, feeding each
+    key at its tick, reproduces the session exactly.
+    
+    On disk the first line is a JSON header; every following line is one
+    tick that had input: the tick number and its key codes separated by
+    spaces, e.g. "412 1073741906 1073741906".
+    """
+    
+    def __init__(self, seed, tick_rate, ticks=0, events=None):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.ticks = ticks  # Total ticks the session ran
+        self.events = events if events is not None else []  # [(tick, [keys])]
+    
+    def record(self, tick, key):
+        """Append a key press handled at the given tick"""
+        if self.events and self.events[-1][0] == tick:
+            self.events[-1][1].append(key)
+        else:
+            self.events.append((tick, [key]))
+        self.ticks = max(self.ticks, tick)
+    
+    def keys_by_tick(self):
+        """Get a {tick: [keys]} lookup for playback"""
+        return {tick: keys for tick, keys in self.events}
+    
+    def key_count(self):
+        """Total number of recorded key presses"""
+        return sum(len(keys) for _, keys in self.events)
+    
+    def save(self, path):
+        """Write the recording to a file"""
+        header = {'format': FORMAT_NAME, 'version': FORMAT_VERSION,
+                  'seed': self.seed, 'tick_rate': self.tick_rate, 'ticks': self.ticks}
+        with open(path, 'w') as file:
+            file.write(json.dumps(header) + '\n')
+            for tick, keys in self.events:
+                file.write(f"{tick} {' '.join(str(key) for key in keys)}\n")
+    
+    @classmethod
+    def load(cls, path):
+        """Read a recording written by save()"""
+        with open(path) as file:
+            header = json.loads(file.readline())
+            if header.get('format') != FORMAT_NAME or header.get('version') != FORMAT_VERSION:
+                raise ValueError(f"{path} is not a version {FORMAT_VERSION} {FORMAT_NAME} file")
+            
+            events = []
+            for line in file:
+                fields = line.split()
+                if fields:
+                    events.append((int(fields[0]), [int(key) for key in fields[1:]]))
+        
+        return cls(header['seed'], header['tick_rate'], header['ticks'], events)
@@ -0,0 +1,167 @@
+"""
+Replay runner for Zombie Dungeon Escape
+Plays an input recording back deterministically and times each phase
+
+Usage:
+    python main.py --record session.zrec          # record a session
+    python replay.py --generate session.zrec      # or let a bot record one
+    python replay.py session.zrec                 # headless playback
+    python replay.py session.zrec --render        # rendered playback
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import time
+import pygame
+from settings import *
+from recording import InputRecording
+from main import Game
+
+PHASES = ('input', 'simulation', 'render')
+
+def state_checksum(game):
+    """Short hash of the simulation state, equal for identical replays"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(repr((game.tick, game.level, game.run_number, game.game_state,
+                        game.player.x, game.player.y, game.player.hp,
+                        game.level_timer)).encode())
+    count = game.zombies.count
+    for column in (game.zombies.xs, game.zombies.ys, game.zombies.hp):
+        digest.update(column[:count].tobytes())
+    digest.update(game.labyrinth.maze.cells)
+    return digest.hexdigest()
+
+def replay(recording, render=False, render_every=1):
+    """Play a recording back as fast as possible and return stats
+    
+    Headless playback never touches the display. Rendered playback draws a
+    frame every render_every ticks (without sleeping) on whatever display
+    SDL provides, so it also works with SDL_VIDEODRIVER=dummy.
+    """
+    game = Game(headless=not render, seed=recording.seed, tick_rate=recording.tick_rate)
+    keys_by_tick = recording.keys_by_tick()
+    timer = time.perf_counter
+    totals = dict.fromkeys(PHASES, 0.0)
+    worst = dict.fromkeys(PHASES, 0.0)
+    frames = 0
+    
+    start = timer()
+    for tick in range(recording.ticks + 1):
+        # Keys stamped with this tick were handled after `tick` ticks had run
+        phase_start = timer()
+        if render:
+            pygame.event.pump()
+        for key in keys_by_tick.get(tick, ()):
+            game.handle_key(key)
+        input_done = timer()
+        
+        if tick < recording.ticks and game.running:
+            game.update(game.tick_dt)
+        simulation_done = timer()
+        
+        if render and tick % render_every == 0:
+            game.draw()
+            frames += 1
+        render_done = timer()
+        
+        for phase, elapsed in (('input', input_done - phase_start),
+                               ('simulation', simulation_done - input_done),
+                               ('render', render_done - simulation_done)):
+            totals[phase] += elapsed
+            worst[phase] = max(worst[phase], elapsed)
+        
+        if not game.running:
+            break
+    wall_time = timer() - start
+    
+    if render:
+        pygame.quit()
+    
+    return {
+        'ticks': game.tick,
+        'frames': frames,
+        'keys': recording.key_count(),
+        'wall_time_s': wall_time,
+        'phases': {
+            phase: {
+                'total_ms': totals[phase] * 1000,
+                'per_tick_us': totals[phase] * 1e6 / max(game.tick, 1),
+                'max_ms': worst[phase] * 1000,
+            }
+            for phase in PHASES
+        },
+        'final': {
+            'state': game.game_state,
+            'level': game.level,
+            'hp': game.player.hp,
+            'zombies': len(game.zombies),
+            'checksum': state_checksum(game),
+        },
+    }
+
+def generate_session(seed, ticks, bot_seed=0, think_ticks=6):
+    """Record a session played by a simple random bot in headless mode
+    
+    The bot presses a random direction every think_ticks ticks, attacks in
+    battle and restarts after a game over, which exercises every subsystem.
+    """
+    bot = random.Random(bot_seed)
+    directions = [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT]
+    game = Game(headless=True, seed=seed, record=True)
+    
+    while game.tick < ticks:
+        if game.game_state == "PLAYING":
+            actions = [bot.choice(directions)]
+        elif game.game_state == "BATTLE":
+            actions = [pygame.K_q]
+        else:
+            actions = [pygame.K_r]
+        game.step(actions, min(think_ticks, ticks - game.tick))
+    
+    game.recording.ticks = game.tick
+    return game.recording
+
+def print_report(stats, label):
+    """Print replay stats as a small table"""
+    print(f"{label}: {stats['ticks']} ticks, {stats['frames']} frames, "
+          f"{stats['keys']} keys in {stats['wall_time_s']:.3f}s")
+    print(f"{'phase':<12}{'total ms':>12}{'us/tick':>12}{'max ms':>10}")
+    for phase, row in stats['phases'].items():
+        print(f"{phase:<12}{row['total_ms']:>12.2f}{row['per_tick_us']:>12.2f}{row['max_ms']:>10.3f}")
+    final = stats['final']
+    print(f"final: state={final['state']} level={final['level']} hp={final['hp']} "
+          f"zombies={final['zombies']} checksum={final['checksum']}")
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Replay a recorded Zombie Dungeon Escape session")
+    parser.add_argument('recording', help="recording file (written by main.py --record)")
+    parser.add_argument('--generate', action='store_true',
+                        help="record a bot session into the file instead of replaying it")
+    parser.add_argument('--seed', type=int, default=1, help="game seed for --generate")
+    parser.add_argument('--ticks', type=int, default=LEVEL_TIME * TICK_RATE,
+                        help="session length for --generate")
+    parser.add_argument('--render', action='store_true', help="draw frames while replaying")
+    parser.add_argument('--render-every', type=int, default=1, metavar='N',
+                        help="draw one frame every N ticks when rendering")
+    parser.add_argument('--json', metavar='PATH', help="also write the stats as JSON")
+    args = parser.parse_args()
+    
+    if args.generate:
+        recording = generate_session(args.seed, args.ticks)
+        recording.save(args.recording)
+        print(f"Recorded {recording.ticks} ticks, {recording.key_count()} keys "
+              f"with seed {recording.seed} to {args.recording}")
+        return
+    
+    recording = InputRecording.load(args.recording)
+    stats = replay(recording, render=args.render, render_every=args.render_every)
+    print_report(stats, args.recording)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(stats, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Random number streams for Zombie Dungeon Escape
+Independent seeded generators per subsystem so a run can be reproduced
+"""
+
+import hashlib
+import random
+import numpy as np
+
+class RandomStreams:
+    """Every random generator a Game uses, all derived from one seed
+    
+    Each subsystem draws from its own stream, so changing how often one of
+    them rolls (say, an extra battle dice roll) does not shift the numbers
+    any other subsystem sees. Level content (maze carving, chests, zombie
+    spawns) gets a fresh stream per level from stream(), which keeps every
+    level the same regardless of what happened on the previous ones.
+    """
+    
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(32)
+        self.seed = seed
+        
+        # Streams consumed throughout a run, in game order
+        self.battle = random.Random(self.derive('battle'))
+        self.rewards = random.Random(self.derive('rewards'))
+        self.zombies = np.random.default_rng(self.derive('zombies'))
+    
+    def derive(self, *keys):
+        """Stable 64-bit seed for a stream name plus optional keys
+        
+        Uses a hash rather than hash(), which is salted per process.
+        """
+        text = ':'.join(str(key) for key in (self.seed,) + keys)
+        return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little')
+    
+    def stream(self, *keys):
+        """New generator for one piece of content, e.g. stream('maze', run, level)"""
+        return random.Random(self.derive(*keys))
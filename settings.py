@@ -3,6 +3,7 @@
 # Screen dimensions
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
+TOOLBAR_HEIGHT = 80  # Skill toolbar along the bottom; the maze view sits above it
 
 # Colors (RGB)
 BLACK = (0, 0, 0)
@@ -19,7 +20,10 @@ DARK_GREEN = (0, 128, 0)
 LIGHT_BLUE = (173, 216, 230)
 
 # Game settings
-FPS = 60
+FPS = 60  # Render rate cap
+TICK_RATE = 60  # Simulation ticks per second, independent of FPS
+MAX_CATCHUP_TICKS = 8  # Most ticks run per frame before dropping the backlog
+PRELOAD_DELAY_TICKS = 30  # Ticks into a level before the next one starts building in the background
 CELL_SIZE = 32  # Size of each maze cell in pixels (changed to 32 for better textures)
 TEXTURE_SIZE = 32  # Size of textures in pixels
 SKILL_ICON_SIZE = 40  # Size of skill icons
@@ -27,6 +31,9 @@ SKILL_ICON_SIZE = 40  # Size of skill icons
 # Maze settings
 MAZE_WIDTH = 20
 MAZE_HEIGHT = 15
+MAZE_GENERATORS = ('backtracker',)  # Generator per level, cycled (see maze_generators.GENERATORS)
+MAX_MAZE_WIDTH = 81  # Largest maze later levels grow to (scrolled by the camera)
+MAX_MAZE_HEIGHT = 61
 
 # Player settings
 PLAYER_SPEED = 1.0
@@ -37,6 +44,14 @@ PLAYER_BASE_ATTACK = 10
 ZOMBIE_BASE_SPEED = 0.8
 ZOMBIE_BASE_HP = 30
 ZOMBIE_BASE_ATTACK = 8
+MAX_ZOMBIES = 10  # Cap on zombies spawned per level, for balance (main.py --zombies overrides it)
+
+# Pathfinding settings
+PATH_CACHE_SIZE = 256  # Number of A* results kept in the LRU cache
+# Tiles one A* search may expand before giving up (about 8 ms). Every level
+# maze (at most MAX_MAZE_WIDTH x MAX_MAZE_HEIGHT) has fewer tiles, so only
+# bigger mazes with loops can hit it.
+PATH_SEARCH_LIMIT = 5000
 
 # Boss settings
 BOSS_HP = 80
@@ -59,3 +74,26 @@ SHIELD_DEFENSE_BONUS = 3
 VISION_RADIUS = 5  # Player can see 5 tiles in each direction
 FOG_ALPHA = 180  # Transparency of fog overlay
 SHADOW_ALPHA = 120  # Transparency of shadow overlay
+FOG_SOFT_EDGES = False  # Smooth the fog mask edges (rescales the mask when fog changes)
+
+# Text rendering settings
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept in the LRU cache (see fonts.render_text)
+WRAP_CACHE_SIZE = 128  # wrap_text layouts kept in the LRU cache
+
+# Rendering cache settings
+TILEMAP_CHUNK_TILES = 32  # Tiles per side of each cached tilemap chunk surface
+
+# Endless dungeon settings
+ENDLESS_CHUNK_TILES = 32  # Tiles per side of each world chunk (must be even)
+ENDLESS_GENERATOR = 'backtracker'  # Maze generator used inside each chunk
+ENDLESS_LOAD_RADIUS = 1  # Chunks kept loaded (and populated) around the player's chunk
+ENDLESS_MAZE_BUDGET = 1024 * 1024  # Bytes of maze chunks kept in memory
+ENDLESS_FOG_BUDGET = 64 * 1024  # Bytes of explored-tile bits kept in memory
+ENDLESS_SURFACE_BUDGET = 64 * 1024 * 1024  # Bytes of cached chunk surfaces
+ENDLESS_ZOMBIES_PER_CHUNK = 2  # Most zombies spawned when a chunk is populated
+ENDLESS_CHASE_RADIUS = 24  # Zombies this close (in tiles) follow the flow field
+
+# Dirty-rectangle rendering settings
+DIRTY_RECTS = True  # Redraw and push only the parts of the playing screen that changed
+DIRTY_RECT_MAX_COUNT = 24  # More separate changed rects than this redraws the whole screen
+DIRTY_RECT_MAX_AREA = 0.5  # So does a changed area above this fraction of the screen
@@ -0,0 +1,142 @@
+"""
+Occupancy index for Zombie Dungeon Escape
+Buckets entities (zombies, chests, loot drops) by the tile they stand on
+"""
+
+class OccupancyIndex:
+    """Per-level map from tile to the entities standing on it
+    
+    Entities only need integer-convertible x and y attributes. Callers keep
+    the index in sync by calling add() on spawn, move() after an entity may
+    have moved and remove() when it leaves the level.
+    """
+    
+    def __init__(self):
+        self.buckets = {}    # (x, y) -> list of entities
+        self.positions = {}  # entity -> (x, y) it is bucketed under
+    
+    def add(self, entity):
+        """Start tracking an entity at its current tile"""
+        tile = (int(entity.x), int(entity.y))
+        self.positions[entity] = tile
+        self.buckets.setdefault(tile, []).append(entity)
+    
+    def remove(self, entity):
+        """Stop tracking an entity"""
+        tile = self.positions.pop(entity, None)
+        if tile is None:
+            return
+        bucket = self.buckets[tile]
+        bucket.remove(entity)
+        if not bucket:
+            del self.buckets[tile]
+    
+    def move(self, entity):
+        """Re-bucket an entity if its tile changed (cheap when it did not)"""
+        tile = (int(entity.x), int(entity.y))
+        old_tile = self.positions.get(entity)
+        if old_tile == tile:
+            return
+        if old_tile is not None:
+            self.remove(entity)
+        self.add(entity)
+    
+    def clear(self):
+        """Forget every entity"""
+        self.buckets.clear()
+        self.positions.clear()
+    
+    def at(self, x, y, kind=None):
+        """Get the entities on a tile, optionally only those of one class"""
+        bucket = self.buckets.get((x, y), ())
+        if kind is None:
+            return list(bucket)
+        return [entity for entity in bucket if isinstance(entity, kind)]
+    
+    def first_at(self, x, y, kind=None):
+        """Get one entity on a tile, or None"""
+        for entity in self.buckets.get((x, y), ()):
+            if kind is None or isinstance(entity, kind):
+                return entity
+        return None
+    
+    def within_square(self, x, y, half_size, kind=None):
+        """Get entities whose tile is at most half_size away on both axes"""
+        found = []
+        side = 2 * half_size + 1
+        if side * side <= len(self.buckets):
+            # Small area: probe each tile in it
+            for tile_y in range(y - half_size, y + half_size + 1):
+                for tile_x in range(x - half_size, x + half_size + 1):
+                    bucket = self.buckets.get((tile_x, tile_y))
+                    if bucket:
+                        found.extend(bucket)
+        else:
+            # Few occupied tiles: scan those instead
+            for (tile_x, tile_y), bucket in self.buckets.items():
+                if abs(tile_x - x) <= half_size and abs(tile_y - y) <= half_size:
+                    found.extend(bucket)
+        
+        if kind is not None:
+            found = [entity for entity in found if isinstance(entity, kind)]
+        return found
+    
+    def within_radius(self, x, y, radius, kind=None):
+        """Get entities whose tile is within a Euclidean radius"""
+        radius_sq = radius * radius
+        return [entity for entity in self.within_square(x, y, int(radius), kind)
+                if (self.positions[entity][0] - x) ** 2 +
+                   (self.positions[entity][1] - y) ** 2 <= radius_sq]
+    
+    def __len__(self):
+        return len(self.positions)
+    
+    def __contains__(self, entity):
+        return entity in self.positions
+
+class ChunkedOccupancyIndex(OccupancyIndex):
+    """Occupancy index that also groups entities by world chunk
+    
+    Used by the endless dungeon, where a chunk's entities are dropped
+    together when the chunk is evicted.
+    """
+    
+    def __init__(self, chunk_tiles):
+        super().__init__()
+        self.chunk_tiles = chunk_tiles
+        self.chunk_members = {}  # (chunk_x, chunk_y) -> set of entities
+    
+    def chunk_of(self, tile):
+        """Get the chunk coordinate containing a tile"""
+        return (tile[0] // self.chunk_tiles, tile[1] // self.chunk_tiles)
+    
+    def add(self, entity):
+        super().add(entity)
+        chunk = self.chunk_of(self.positions[entity])
+        self.chunk_members.setdefault(chunk, set()).add(entity)
+    
+    def remove(self, entity):
+        tile = self.positions.get(entity)
+        if tile is None:
+            return
+        super().remove(entity)
+        chunk = self.chunk_of(tile)
+        members = self.chunk_members[chunk]
+        members.discard(entity)
+        if not members:
+            del self.chunk_members[chunk]
+    
+    def clear(self):
+        super().clear()
+        self.chunk_members.clear()
+    
+    def in_chunk(self, chunk_x, chunk_y):
+        """Get the entities standing in one chunk"""
+        return list(self.chunk_members.get((chunk_x, chunk_y), ()))
+    
+    def drop_chunk(self, chunk_x, chunk_y):
+        """Stop tracking every entity in a chunk and return them"""
+        dropped = self.in_chunk(chunk_x, chunk_y)
+        for entity in dropped:
+            self.remove(entity)
+        return dropped
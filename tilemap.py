@@ -0,0 +1,182 @@
+"""
+Cached tilemap layer for Zombie Dungeon Escape
+Pre-renders maze tiles once per level and reveals them as fog of war clears
+"""
+
+import pygame
+from settings import *
+from maze_grid import WALL
+from chunked_world import ChunkLRU, chunk_capacity
+
+class TilemapCache:
+    """Persistent tile layer for one level
+    
+    Tiles are painted into chunk surfaces the first time they are explored,
+    so a steady-state frame costs one blit per on-screen chunk instead of one
+    blit per tile. Chunks are allocated lazily, which keeps memory
+    proportional to the explored area on large mazes.
+    """
+    
+    def __init__(self, assets, chunk_tiles=TILEMAP_CHUNK_TILES):
+        self.assets = assets
+        self.chunk_tiles = chunk_tiles
+        self.chunk_pixels = chunk_tiles * CELL_SIZE
+        self.labyrinth = None
+        self.fog_generation = None
+        self.log_position = 0
+        self.chunks = {}
+        self.spare_chunks = {}  # Surfaces from earlier levels by size, reused before allocating
+    
+    def is_current(self, labyrinth, fog_of_war=None):
+        """Check if the cache was built for this level"""
+        generation = fog_of_war.generation if fog_of_war else None
+        return self.labyrinth is labyrinth and self.fog_generation == generation
+    
+    def build(self, labyrinth, fog_of_war=None):
+        """Start a fresh cache for a new level"""
+        self.labyrinth = labyrinth
+        self.fog_generation = fog_of_war.generation if fog_of_war else None
+        self.log_position = 0
+        for chunk in self.chunks.values():
+            self.spare_chunks.setdefault(chunk.get_size(), []).append(chunk)
+        self.chunks = {}
+        
+        if fog_of_war is None:
+            self.reveal_all()
+        else:
+            self.sync(fog_of_war)
+    
+    def sync(self, fog_of_war):
+        """Reveal every tile explored since the last sync"""
+        explored_log = fog_of_war.explored_log
+        if self.log_position < len(explored_log):
+            width = fog_of_war.width
+            for index in explored_log[self.log_position:]:
+                y, x = divmod(index, width)
+                self.reveal_tile(x, y)
+            self.log_position = len(explored_log)
+    
+    def reveal_all(self):
+        """Reveal the whole maze (used when fog of war is disabled)"""
+        for y in range(self.labyrinth.height):
+            for x in range(self.labyrinth.width):
+                self.reveal_tile(x, y)
+    
+    def reveal_tile(self, x, y):
+        """Paint one tile into its chunk surface"""
+        chunk = self._get_chunk(x // self.chunk_tiles, y // self.chunk_tiles)
+        local_x = (x % self.chunk_tiles) * CELL_SIZE
+        local_y = (y % self.chunk_tiles) * CELL_SIZE
+        
+        if (x, y) == self.labyrinth.exit_pos:
+            texture = self.assets.get_texture('exit')
+        elif self.labyrinth.maze.get(x, y) == WALL:
+            texture = self.assets.get_texture('wall')
+        else:
+            texture = self.assets.get_texture('floor')
+        
+        chunk.blit(texture, (local_x, local_y))
+    
+    def _get_chunk(self, chunk_x, chunk_y):
+        """Get chunk surface, creating it (filled black) on first use"""
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            tiles_w = min(self.chunk_tiles, self.labyrinth.width - chunk_x * self.chunk_tiles)
+            tiles_h = min(self.chunk_tiles, self.labyrinth.height - chunk_y * self.chunk_tiles)
+            size = (tiles_w * CELL_SIZE, tiles_h * CELL_SIZE)
+            spares = self.spare_chunks.get(size)
+            if spares:
+                chunk = spares.pop()
+            else:
+                chunk = pygame.Surface(size)
+                if pygame.display.get_surface():
+                    chunk = chunk.convert()
+            chunk.fill(BLACK)
+            self.chunks[key] = chunk
+        return chunk
+    
+    def draw(self, screen, camera):
+        """Blit the cached chunks inside the camera's view"""
+        first_x, first_y, last_x, last_y = visible_chunks(camera, self.chunk_tiles)
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk is not None:
+                    screen.blit(chunk, camera.world_to_screen(chunk_x * self.chunk_tiles,
+                                                              chunk_y * self.chunk_tiles))
+
+class ChunkedTilemap:
+    """Tile layer for the endless dungeon, one cached surface per world chunk
+    
+    A chunk surface is painted as its tiles are explored, found by comparing
+    the fog's explored bits with the bits already painted, so several ticks
+    between frames never lose a reveal. Surfaces live in an LRU bounded by a
+    byte budget and are dropped when the fog forgets their chunk.
+    """
+    
+    def __init__(self, assets, chunk_tiles=ENDLESS_CHUNK_TILES, budget=ENDLESS_SURFACE_BUDGET):
+        self.assets = assets
+        self.chunk_tiles = chunk_tiles
+        self.chunk_pixels = chunk_tiles * CELL_SIZE
+        
+        # A screen never shows more than a few chunks at once
+        surface_bytes = self.chunk_pixels * self.chunk_pixels * 4
+        self.chunks = ChunkLRU(chunk_capacity(budget, surface_bytes, 9))  # -> [surface, painted bits, fog bits]
+    
+    def draw(self, screen, maze, fog_of_war, camera):
+        """Blit the explored part of every chunk inside the camera's view"""
+        chunk_pixels = self.chunk_pixels
+        size = self.chunk_tiles
+        first_x, first_y, last_x, last_y = visible_chunks(camera, size)
+        
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                key = (chunk_x, chunk_y)
+                bits = fog_of_war.explored_bits(chunk_x, chunk_y)
+                if bits is None:
+                    self.chunks.pop(key)
+                    continue
+                
+                entry = self.chunks.get(key)
+                if entry is None or entry[2] is not bits:
+                    surface = pygame.Surface((chunk_pixels, chunk_pixels))
+                    if pygame.display.get_surface():
+                        surface = surface.convert()
+                    surface.fill(BLACK)
+                    entry = [surface, bytearray(len(bits)), bits]
+                    self.chunks.put(key, entry)
+                if entry[1] != bits:
+                    self._paint_new_tiles(maze, chunk_x, chunk_y, entry)
+                
+                screen.blit(entry[0], camera.world_to_screen(chunk_x * size, chunk_y * size))
+    
+    def _paint_new_tiles(self, maze, chunk_x, chunk_y, entry):
+        """Paint the tiles explored since this chunk was last drawn"""
+        surface, painted, bits = entry
+        size = self.chunk_tiles
+        tiles = maze.chunk(chunk_x, chunk_y)
+        wall = self.assets.get_texture('wall')
+        floor = self.assets.get_texture('floor')
+        
+        for byte_index in range(len(bits)):
+            new_bits = bits[byte_index] & ~painted[byte_index]
+            if not new_bits:
+                continue
+            for bit in range(8):
+                if new_bits & (1 << bit):
+                    index = byte_index * 8 + bit
+                    local_y, local_x = divmod(index, size)
+                    texture = wall if tiles[index] == WALL else floor
+                    surface.blit(texture, (local_x * CELL_SIZE, local_y * CELL_SIZE))
+            painted[byte_index] = bits[byte_index]
+    
+    def clear(self):
+        """Drop every cached surface"""
+        self.chunks.clear()
+
+def visible_chunks(camera, chunk_tiles):
+    """Inclusive range (first_x, first_y, last_x, last_y) of chunks in view"""
+    first_x, first_y, last_x, last_y = camera.visible_tiles()
+    return (first_x // chunk_tiles, first_y // chunk_tiles,
+            last_x // chunk_tiles, last_y // chunk_tiles)
@@ -2,30 +2,44 @@ import pygame
 import math
 from settings import *
 from assets import AssetManager
+from tilemap import TilemapCache, ChunkedTilemap
+from camera import Camera
+from minimap import Minimap
+from fonts import get_font, render_text, glyph_atlas
 
 class UI:
     def __init__(self):
         """Initialize the modern UI system with asset manager"""
-        self.font = pygame.font.Font(None, 24)
-        self.small_font = pygame.font.Font(None, 18)
-        self.large_font = pygame.font.Font(None, 36)
+        self.font = get_font(24)
+        self.small_font = get_font(18)
+        self.large_font = get_font(36)
         
         # Initialize asset manager
         self.assets = AssetManager()
         
         # Skill icons are now handled by the asset manager
         
+        # Pre-rendered tile layer for the current level
+        self.tilemap_cache = TilemapCache(self.assets)
+        self.endless_tilemap = None  # Created on first endless-dungeon frame
+        
+        # Viewport onto the maze; the game points it at the player each frame
+        self.camera = Camera()
+        
+        # Minimap panel in the top-right corner
+        self.minimap_rect = pygame.Rect(SCREEN_WIDTH - 150 - 20, 60, 150, 150)
+        self.minimap = Minimap(self.minimap_rect)
+        
         # Animation states
         self.damage_flash = {}
         self.heal_flash = {}
-        
+    
     def draw_skill_toolbar(self, screen, player, in_battle=False):
         """Draw the MOBA-style skill toolbar at bottom of screen"""
-        toolbar_height = 80
-        toolbar_y = SCREEN_HEIGHT - toolbar_height
+        toolbar_y = SCREEN_HEIGHT - TOOLBAR_HEIGHT
         
         # Toolbar background
-        toolbar_rect = pygame.Rect(0, toolbar_y, SCREEN_WIDTH, toolbar_height)
+        toolbar_rect = pygame.Rect(0, toolbar_y, SCREEN_WIDTH, TOOLBAR_HEIGHT)
         pygame.draw.rect(screen, (40, 40, 40), toolbar_rect)
         pygame.draw.rect(screen, WHITE, toolbar_rect, 2)
         
@@ -49,12 +63,12 @@ class UI:
             screen.blit(skill_icon, icon_rect)
             
             # Key binding
-            key_text = self.small_font.render(skill, True, WHITE)
+            key_text = render_text(self.small_font, skill, WHITE)
             screen.blit(key_text, (x + 18, y - 15))
             
             # Description (only show in battle)
             if in_battle:
-                desc_text = self.small_font.render(desc, True, WHITE)
+                desc_text = render_text(self.small_font, desc, WHITE)
                 screen.blit(desc_text, (x - 5, y + 50))
         
         # Item slots
@@ -79,11 +93,11 @@ class UI:
                     pygame.draw.rect(screen, GRAY, pygame.Rect(x + 5, y + 5, 35, 35))
                 
                 # Item name
-                item_text = self.small_font.render(item.name[:8], True, WHITE)
+                item_text = render_text(self.small_font, item.name[:8], WHITE)
                 screen.blit(item_text, (x - 10, y + 50))
             
             # Key binding
-            key_text = self.small_font.render(str(i + 1), True, WHITE)
+            key_text = render_text(self.small_font, str(i + 1), WHITE)
             screen.blit(key_text, (x + 18, y - 15))
     
     def draw_health_bars(self, screen, player, zombie=None):
@@ -114,9 +128,11 @@ class UI:
         
         pygame.draw.rect(screen, hp_color, fill_rect)
         
-        # HP text
-        hp_text = self.font.render(f"HP: {player.hp}/{player.max_hp}", True, WHITE)
-        screen.blit(hp_text, (player_hp_x + 5, player_hp_y + 2))
+        # HP text: a cached label, then the numbers from the digit glyphs
+        hp_label = render_text(self.font, "HP: ", WHITE)
+        screen.blit(hp_label, (player_hp_x + 5, player_hp_y + 2))
+        glyph_atlas(self.font, WHITE).draw(screen, f"{player.hp}/{player.max_hp}",
+                                           (player_hp_x + 5 + hp_label.get_width(), player_hp_y + 2))
         
         # Zombie health bar (in battle)
         if zombie:
@@ -137,107 +153,51 @@ class UI:
             pygame.draw.rect(screen, RED, fill_rect)
             
             # HP text
-            hp_text = self.font.render(f"{zombie['name']}: {zombie['hp']}/{zombie['max_hp']}", True, WHITE)
+            hp_text = render_text(self.font, f"{zombie['name']}: {zombie['hp']}/{zombie['max_hp']}", WHITE)
             screen.blit(hp_text, (zombie_hp_x + 5, zombie_hp_y + 2))
     
     def draw_minimap(self, screen, labyrinth, player, zombies, fog_of_war=None):
         """Draw minimap with fog of war support"""
-        minimap_size = 150
-        minimap_x = SCREEN_WIDTH - minimap_size - 20
-        minimap_y = 60
-        
-        # Minimap background
-        minimap_rect = pygame.Rect(minimap_x, minimap_y, minimap_size, minimap_size)
-        pygame.draw.rect(screen, (20, 20, 20), minimap_rect)
-        pygame.draw.rect(screen, WHITE, minimap_rect, 2)
-        
-        # Calculate scale
-        scale_x = minimap_size / labyrinth.width
-        scale_y = minimap_size / labyrinth.height
-        
-        # Draw maze on minimap (only explored areas)
-        for y in range(labyrinth.height):
-            for x in range(labyrinth.width):
-                mini_x = minimap_x + int(x * scale_x)
-                mini_y = minimap_y + int(y * scale_y)
-                mini_w = max(1, int(scale_x))
-                mini_h = max(1, int(scale_y))
-                
-                # Only draw if explored (fog of war)
-                if fog_of_war and not fog_of_war.is_explored(x, y):
-                    continue
-                
-                if labyrinth.maze[y][x] == 1:  # Wall
-                    color = (100, 100, 100)
-                    if fog_of_war and not fog_of_war.is_visible(x, y):
-                        color = (60, 60, 60)  # Darker for explored but not visible
-                    pygame.draw.rect(screen, color, 
-                                   pygame.Rect(mini_x, mini_y, mini_w, mini_h))
-                else:  # Floor
-                    color = (150, 150, 150)
-                    if fog_of_war and not fog_of_war.is_visible(x, y):
-                        color = (100, 100, 100)  # Darker for explored but not visible
-                    pygame.draw.rect(screen, color, 
-                                   pygame.Rect(mini_x, mini_y, mini_w, mini_h))
-        
-        # Draw exit (only if explored)
-        exit_x, exit_y = labyrinth.exit_pos
-        if not fog_of_war or fog_of_war.is_explored(exit_x, exit_y):
-            exit_mini_x = minimap_x + int(exit_x * scale_x)
-            exit_mini_y = minimap_y + int(exit_y * scale_y)
-            color = GREEN
-            if fog_of_war and not fog_of_war.is_visible(exit_x, exit_y):
-                color = DARK_GREEN  # Darker if not currently visible
-            pygame.draw.rect(screen, color, 
-                            pygame.Rect(exit_mini_x, exit_mini_y, max(2, int(scale_x)), max(2, int(scale_y))))
-        
-        # Draw player (always visible)
-        player_mini_x = minimap_x + int(player.x * scale_x)
-        player_mini_y = minimap_y + int(player.y * scale_y)
-        pygame.draw.rect(screen, BLUE, 
-                        pygame.Rect(player_mini_x, player_mini_y, max(3, int(scale_x)), max(3, int(scale_y))))
-        
-        # Draw zombies (only if currently visible)
-        for zombie in zombies:
-            if not fog_of_war or fog_of_war.should_show_entity(int(zombie.x), int(zombie.y)):
-                zombie_mini_x = minimap_x + int(zombie.x * scale_x)
-                zombie_mini_y = minimap_y + int(zombie.y * scale_y)
-                pygame.draw.rect(screen, RED, 
-                                pygame.Rect(zombie_mini_x, zombie_mini_y, max(2, int(scale_x)), max(2, int(scale_y))))
+        self.minimap.draw(screen, labyrinth, player, zombies, fog_of_war)
         
         # Minimap title
-        title_text = self.small_font.render("Map", True, WHITE)
-        screen.blit(title_text, (minimap_x + 5, minimap_y - 20))
+        title_text = render_text(self.small_font, "Map", WHITE)
+        screen.blit(title_text, (self.minimap_rect.x + 5, self.minimap_rect.y - 20))
     
     def draw_timer(self, screen, time_left):
         """Draw digital-style timer at top center"""
-        minutes = int(time_left // 60)
-        seconds = int(time_left % 60)
-        time_str = f"{minutes:02d}:{seconds:02d}"
+        time_str, color = self.timer_style(time_left)
+        timer_rect = self.timer_rect(time_str)
         
         # Timer background
-        timer_text = self.large_font.render(time_str, True, WHITE)
-        timer_rect = timer_text.get_rect(center=(SCREEN_WIDTH // 2, 30))
-        
-        bg_rect = timer_rect.copy()
-        bg_rect.inflate_ip(20, 10)
+        bg_rect = timer_rect.inflate(20, 10)
         pygame.draw.rect(screen, (40, 40, 40), bg_rect)
         pygame.draw.rect(screen, WHITE, bg_rect, 2)
         
-        # Color based on time left
+        # Digits from pre-rendered glyphs; the text changes every second
+        glyph_atlas(self.large_font, color).draw(screen, time_str, timer_rect.topleft)
+    
+    def timer_rect(self, time_str):
+        """Screen rect of the timer text, centred at the top"""
+        timer_rect = pygame.Rect((0, 0), glyph_atlas(self.large_font, WHITE).size(time_str))
+        timer_rect.center = (SCREEN_WIDTH // 2, 30)
+        return timer_rect
+    
+    def timer_style(self, time_left):
+        """Timer text and its color (based on time left)"""
+        minutes = int(time_left // 60)
+        seconds = int(time_left % 60)
         if time_left > 60:
             color = WHITE
         elif time_left > 30:
             color = YELLOW
         else:
             color = RED
-        
-        timer_text = self.large_font.render(time_str, True, color)
-        screen.blit(timer_text, timer_rect)
+        return f"{minutes:02d}:{seconds:02d}", color
     
     def draw_level_info(self, screen, level):
         """Draw level information"""
-        level_text = self.font.render(f"Level: {level}", True, WHITE)
+        level_text = render_text(self.font, f"Level: {level}", WHITE)
         level_rect = pygame.Rect(20, 50, 100, 25)
         pygame.draw.rect(screen, (40, 40, 40), level_rect)
         pygame.draw.rect(screen, WHITE, level_rect, 1)
@@ -257,18 +217,18 @@ class UI:
         pygame.draw.rect(screen, WHITE, overlay_rect, 2)
         
         # Battle title
-        title_text = self.large_font.render("BATTLE MODE", True, RED)
+        title_text = render_text(self.large_font, "BATTLE MODE", RED)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, overlay_y + 30))
         screen.blit(title_text, title_rect)
         
         # Turn indicator
-        turn_text = self.font.render(f"Turn: {current_turn.capitalize()}", True, YELLOW)
+        turn_text = render_text(self.font, f"Turn: {current_turn.capitalize()}", YELLOW)
         screen.blit(turn_text, (overlay_rect.x + 20, overlay_y + 60))
         
         # Battle log
         log_y = overlay_y + 90
         for line in battle_log[-4:]:  # Show last 4 lines
-            log_text = self.small_font.render(line, True, WHITE)
+            log_text = render_text(self.small_font, line, WHITE)
             screen.blit(log_text, (overlay_rect.x + 20, log_y))
             log_y += 20
     
@@ -290,106 +250,185 @@ class UI:
             return int(100 * (remaining / 500))  # Fade out
         return 0
     
-    def draw_sprites(self, screen, labyrinth, player, zombies, fog_of_war=None):
-        """Draw sprites with texture assets and fog of war support"""
-        # Calculate maze offset
-        maze_pixel_width = labyrinth.width * CELL_SIZE
-        maze_pixel_height = labyrinth.height * CELL_SIZE
-        offset_x = (SCREEN_WIDTH - maze_pixel_width) // 2
-        offset_y = (SCREEN_HEIGHT - maze_pixel_height) // 2
-        
-        # Draw player (always visible)
-        player_x = offset_x + player.x * CELL_SIZE
-        player_y = offset_y + player.y * CELL_SIZE
-        
-        # Use player sprite from asset manager
-        player_sprite = self.assets.get_sprite('player')
-        screen.blit(player_sprite, (player_x, player_y))
-        
-        # Equipment indicators
-        weapon = player.get_equipped_item('weapon')
-        shield = player.get_equipped_item('shield')
-        if weapon:
-            pygame.draw.circle(screen, RED, (player_x + CELL_SIZE - 6, player_y + 6), 4)
-        if shield:
-            pygame.draw.circle(screen, GRAY, (player_x + 6, player_y + 6), 4)
-        
-        # Heal flash animation
-        heal_alpha = self.get_flash_alpha('player', 'heal')
-        if heal_alpha > 0:
-            heal_surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
-            heal_surface.set_alpha(heal_alpha)
-            heal_surface.fill(GREEN)
-            screen.blit(heal_surface, (player_x, player_y))
-        
-        # Draw zombies (only if visible through fog of war)
-        for i, zombie in enumerate(zombies):
+    def draw_sprites(self, screen, labyrinth, player, zombies, fog_of_war=None, alpha=1.0):
+        """Draw sprites with texture assets and fog of war support
+        
+        alpha (0..1) interpolates zombies between their last two tick positions.
+        Only zombies inside the camera's view are drawn.
+        """
+        self.blit_sprites(screen, self.sprite_states(player, zombies, fog_of_war, alpha))
+    
+    def sprite_states(self, player, zombies, fog_of_war=None, alpha=1.0):
+        """Everything that decides how each sprite looks this frame, keyed by entity
+        
+        Each state is (screen rect, sprite name, weapon shown, shield shown,
+        flash color, flash alpha), in draw order: the player, then the
+        zombies in view that fog of war lets through.
+        """
+        camera = self.camera
+        
+        # Player (always visible) with equipment indicators and heal flash
+        player_x, player_y = camera.world_to_screen(player.x, player.y)
+        states = {'player': (pygame.Rect(player_x, player_y, CELL_SIZE, CELL_SIZE), 'player',
+                             player.get_equipped_item('weapon') is not None,
+                             player.get_equipped_item('shield') is not None,
+                             GREEN, self.get_flash_alpha('player', 'heal'))}
+        
+        # Zombies (only if visible through fog of war) with damage flash
+        for zombie in zombies:
             zombie_tile_x = int(zombie.x)
             zombie_tile_y = int(zombie.y)
             
-            # Check fog of war visibility
+            # Check the view and fog of war visibility
+            if not camera.is_visible(zombie_tile_x, zombie_tile_y):
+                continue
             if fog_of_war and not fog_of_war.should_show_entity(zombie_tile_x, zombie_tile_y):
                 continue
             
-            zombie_x = offset_x + zombie.x * CELL_SIZE
-            zombie_y = offset_y + zombie.y * CELL_SIZE
+            render_x, render_y = zombie.render_position(alpha)
+            zombie_x, zombie_y = camera.world_to_screen(render_x, render_y)
             
             # Choose appropriate zombie sprite
             is_boss = hasattr(zombie, 'is_boss') and zombie.is_boss
-            zombie_sprite = self.assets.get_sprite('boss' if is_boss else 'zombie')
-            screen.blit(zombie_sprite, (int(zombie_x), int(zombie_y)))
+            states[zombie.uid] = (pygame.Rect(int(zombie_x), int(zombie_y), CELL_SIZE, CELL_SIZE),
+                                  'boss' if is_boss else 'zombie', False, False,
+                                  WHITE, self.get_flash_alpha(f'zombie_{zombie.uid}', 'damage'))
+        return states
+    
+    def blit_sprites(self, screen, states):
+        """Draw the sprites described by sprite_states()"""
+        for rect, sprite_name, weapon, shield, flash_color, flash_alpha in states.values():
+            screen.blit(self.assets.get_sprite(sprite_name), rect)
             
-            # Damage flash animation
-            damage_alpha = self.get_flash_alpha(f'zombie_{i}', 'damage')
-            if damage_alpha > 0:
-                damage_surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
-                damage_surface.set_alpha(damage_alpha)
-                damage_surface.fill(WHITE)
-                screen.blit(damage_surface, (int(zombie_x), int(zombie_y)))
+            # Equipment indicators
+            if weapon:
+                pygame.draw.circle(screen, RED, (rect.x + CELL_SIZE - 6, rect.y + 6), 4)
+            if shield:
+                pygame.draw.circle(screen, GRAY, (rect.x + 6, rect.y + 6), 4)
+            
+            # Heal / damage flash animation
+            if flash_alpha > 0:
+                flash_surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
+                flash_surface.set_alpha(flash_alpha)
+                flash_surface.fill(flash_color)
+                screen.blit(flash_surface, rect)
+    
+    def prepare_level(self, labyrinth, fog_of_war=None):
+        """Build per-level render caches as soon as a level is created"""
+        self.tilemap_cache.build(labyrinth, fog_of_war)
     
     def draw_tilemap(self, screen, labyrinth, fog_of_war=None):
-        """Draw tilemap with textures and fog of war support"""
-        maze_pixel_width = labyrinth.width * CELL_SIZE
-        maze_pixel_height = labyrinth.height * CELL_SIZE
-        offset_x = (SCREEN_WIDTH - maze_pixel_width) // 2
-        offset_y = (SCREEN_HEIGHT - maze_pixel_height) // 2
-        
-        for y in range(labyrinth.height):
-            for x in range(labyrinth.width):
-                # Only draw explored tiles
-                if fog_of_war and not fog_of_war.is_explored(x, y):
-                    continue
-                
-                tile_x = offset_x + x * CELL_SIZE
-                tile_y = offset_y + y * CELL_SIZE
-                
-                # Choose texture based on tile type
-                if labyrinth.maze[y][x] == 1:
-                    texture = self.assets.get_texture('wall')
-                else:
-                    texture = self.assets.get_texture('floor')
-                
-                # Draw the texture
-                screen.blit(texture, (tile_x, tile_y))
-        
-        # Draw exit with animated texture (only if explored)
+        """Draw the tiles in the camera's view with fog of war support"""
+        self.sync_tilemap(labyrinth, fog_of_war)
+        self.blit_tilemap(screen, fog_of_war, self.exit_glow(labyrinth, fog_of_war))
+    
+    def sync_tilemap(self, labyrinth, fog_of_war=None):
+        """Bring the cached tile layer up to date with the level and fog"""
+        if not self.tilemap_cache.is_current(labyrinth, fog_of_war):
+            self.tilemap_cache.build(labyrinth, fog_of_war)
+        elif fog_of_war:
+            self.tilemap_cache.sync(fog_of_war)
+    
+    def exit_glow(self, labyrinth, fog_of_war=None):
+        """Screen rect and pulse alpha of the exit glow, or None when it is not shown"""
+        camera = self.camera
         exit_x, exit_y = labyrinth.exit_pos
-        if not fog_of_war or fog_of_war.is_explored(exit_x, exit_y):
-            exit_tile_x = offset_x + exit_x * CELL_SIZE
-            exit_tile_y = offset_y + exit_y * CELL_SIZE
-            
-            # Use exit texture
-            exit_texture = self.assets.get_texture('exit')
-            screen.blit(exit_texture, (exit_tile_x, exit_tile_y))
-            
-            # Add pulsing glow effect
-            time_factor = pygame.time.get_ticks() / 500
-            pulse = int(64 + 63 * math.sin(time_factor))
+        if not camera.is_visible(exit_x, exit_y):
+            return None
+        if fog_of_war and not fog_of_war.is_explored(exit_x, exit_y):
+            return None
+        exit_tile_x, exit_tile_y = camera.world_to_screen(exit_x, exit_y)
+        time_factor = pygame.time.get_ticks() / 500
+        pulse = int(64 + 63 * math.sin(time_factor))
+        return pygame.Rect(exit_tile_x, exit_tile_y, CELL_SIZE, CELL_SIZE), pulse
+    
+    def blit_tilemap(self, screen, fog_of_war=None, glow=None):
+        """Draw the cached tile layer, the exit glow and the fog in the camera's view"""
+        camera = self.camera
+        
+        # Explored tiles (and the exit texture) come from the cached layer
+        self.tilemap_cache.draw(screen, camera)
+        
+        # Add pulsing glow effect
+        if glow is not None:
+            glow_rect, pulse = glow
             glow_surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
             glow_surface.set_alpha(pulse)
             glow_surface.fill((0, 255, 0))
-            screen.blit(glow_surface, (exit_tile_x, exit_tile_y))
+            screen.blit(glow_surface, glow_rect)
         
         # Draw fog of war overlay
         if fog_of_war:
-            fog_of_war.draw_fog(screen, offset_x, offset_y)
\ No newline at end of file
+            fog_of_war.draw_fog(screen, camera)
+    
+    def fog_change_rects(self, fog_of_war):
+        """Screen rects of the tiles in view whose fog is repainted on the next draw"""
+        camera = self.camera
+        grow = 2 * CELL_SIZE if fog_of_war.soft_edges else 0  # Smoothing bleeds into neighbours
+        return [camera.tile_rect(x, y).inflate(grow, grow)
+                for x, y in fog_of_war.mask_dirty_tiles if camera.is_visible(x, y)]
+    
+    def hud_widgets(self, screen, labyrinth, player, zombies, fog_of_war, level, time_left):
+        """Playing-screen HUD in draw order, as (name, rect, key, draw) tuples
+        
+        rect covers every pixel the widget paints, key changes whenever
+        those pixels would, and draw() paints it on screen. The endless
+        dungeon passes labyrinth and time_left as None: it has no minimap
+        and no timer.
+        """
+        widgets = []
+        
+        hp_text = f"HP: {player.hp}/{player.max_hp}"
+        rect = pygame.Rect(20, 20, 200, 20).union(pygame.Rect((25, 22), self.font.size(hp_text)))
+        widgets.append(('health', rect, hp_text,
+                        lambda: self.draw_health_bars(screen, player)))
+        
+        if time_left is not None:
+            time_str, color = self.timer_style(time_left)
+            widgets.append(('timer', self.timer_rect(time_str).inflate(20, 10), (time_str, color),
+                            lambda: self.draw_timer(screen, time_left)))
+        
+        rect = pygame.Rect(20, 50, 100, 25).union(pygame.Rect((25, 55), self.font.size(f"Level: {level}")))
+        widgets.append(('level', rect, level, lambda: self.draw_level_info(screen, level)))
+        
+        if labyrinth is not None:
+            # Markers may stick out past the panel by a few pixels; the title sits above it
+            rect = self.minimap_rect.inflate(6, 6).union(
+                pygame.Rect((self.minimap_rect.x + 5, self.minimap_rect.y - 20), self.small_font.size("Map")))
+            widgets.append(('minimap', rect, self.minimap_key(labyrinth, player, zombies, fog_of_war),
+                            lambda: self.draw_minimap(screen, labyrinth, player, zombies, fog_of_war)))
+        
+        items = tuple((item.type, item.name[:8]) for item in player.inventory.items[:3])
+        widgets.append(('toolbar', pygame.Rect(0, SCREEN_HEIGHT - TOOLBAR_HEIGHT, SCREEN_WIDTH, TOOLBAR_HEIGHT),
+                        items, lambda: self.draw_skill_toolbar(screen, player, in_battle=False)))
+        return widgets
+    
+    def minimap_key(self, labyrinth, player, zombies, fog_of_war=None):
+        """Everything the minimap shows: the maze and fog state and the marker positions"""
+        scale_x = self.minimap_rect.width / labyrinth.width
+        scale_y = self.minimap_rect.height / labyrinth.height
+        markers = tuple((int(zombie.x * scale_x), int(zombie.y * scale_y)) for zombie in zombies
+                        if not fog_of_war or fog_of_war.should_show_entity(int(zombie.x), int(zombie.y)))
+        fog_key = (fog_of_war.generation, fog_of_war.delta_version) if fog_of_war else None
+        return (id(labyrinth.maze), labyrinth.maze.version, fog_key,
+                int(player.x * scale_x), int(player.y * scale_y), markers)
+    
+    def draw_endless(self, screen, labyrinth, player, zombies, fog_of_war):
+        """Draw the endless dungeon around the player
+        
+        Only the world chunks in the camera's view are drawn, from cached
+        per-chunk surfaces (see ChunkedTilemap).
+        """
+        if self.endless_tilemap is None or self.endless_tilemap.chunk_tiles != labyrinth.chunk_tiles:
+            self.endless_tilemap = ChunkedTilemap(self.assets, labyrinth.chunk_tiles)
+        camera = self.camera
+        
+        self.endless_tilemap.draw(screen, labyrinth.maze, fog_of_war, camera)
+        fog_of_war.draw_fog(screen, camera)
+        
+        # Zombies in view, then the player on top
+        zombie_sprite = self.assets.get_sprite('zombie')
+        for zombie in zombies:
+            if fog_of_war.should_show_entity(int(zombie.x), int(zombie.y)):
+                screen.blit(zombie_sprite, camera.world_to_screen(zombie.x, zombie.y))
+        screen.blit(self.assets.get_sprite('player'), camera.world_to_screen(player.x, player.y))
\ No newline at end of file
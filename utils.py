@@ -1,7 +1,13 @@
 import pygame
 import math
 import random
+import threading
+from array import array
+from collections import OrderedDict
 from settings import *
+from maze_grid import FLOOR
+from maze_tree import MazeTreeIndex
+from fonts import render_text, register_cache
 
 def calculate_distance(x1, y1, x2, y2):
     """Calculate Euclidean distance between two points"""
@@ -22,16 +28,18 @@ def clamp(value, min_value, max_value):
     """Clamp a value between min and max"""
     return max(min_value, min(value, max_value))
 
-def roll_dice(sides=6):
-    """Roll a dice with specified number of sides"""
-    return random.randint(1, sides)
+def roll_dice(sides=6, rng=None):
+    """Roll a dice with specified number of sides (rng defaults to the global random module)"""
+    rng = rng if rng is not None else random
+    return rng.randint(1, sides)
 
-def roll_multiple_dice(count, sides=6):
+def roll_multiple_dice(count, sides=6, rng=None):
     """Roll multiple dice and return the sum"""
-    return sum(roll_dice(sides) for _ in range(count))
+    return sum(roll_dice(sides, rng) for _ in range(count))
 
-def get_random_spawn_position(maze_width, maze_height, exclude_positions=None):
+def get_random_spawn_position(maze_width, maze_height, exclude_positions=None, rng=None):
     """Get a random valid spawn position in the maze"""
+    rng = rng if rng is not None else random
     if exclude_positions is None:
         exclude_positions = []
     
@@ -39,8 +47,8 @@ def get_random_spawn_position(maze_width, maze_height, exclude_positions=None):
     max_attempts = 100
     
     while attempts < max_attempts:
-        x = random.randint(1, maze_width - 2)
-        y = random.randint(1, maze_height - 2)
+        x = rng.randint(1, maze_width - 2)
+        y = rng.randint(1, maze_height - 2)
         
         # Check if position is not in exclude list
         if (x, y) not in exclude_positions:
@@ -53,7 +61,7 @@ def get_random_spawn_position(maze_width, maze_height, exclude_positions=None):
 
 def draw_text_with_background(screen, text, font, text_color, bg_color, position):
     """Draw text with a background rectangle"""
-    text_surface = font.render(text, True, text_color)
+    text_surface = render_text(font, text, text_color)
     text_rect = text_surface.get_rect()
     text_rect.topleft = position
     
@@ -68,7 +76,7 @@ def draw_text_with_background(screen, text, font, text_color, bg_color, position
 
 def create_button(screen, text, font, text_color, bg_color, position, padding=10):
     """Create a clickable button and return its rectangle"""
-    text_surface = font.render(text, True, text_color)
+    text_surface = render_text(font, text, text_color)
     text_rect = text_surface.get_rect()
     text_rect.center = position
     
@@ -88,9 +96,10 @@ def is_point_in_rect(point, rect):
     return (rect.left <= x <= rect.right and 
             rect.top <= y <= rect.bottom)
 
-def generate_random_color():
+def generate_random_color(rng=None):
     """Generate a random RGB color"""
-    return (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
+    rng = rng if rng is not None else random
+    return (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))
 
 def lerp(start, end, t):
     """Linear interpolation between start and end by factor t (0-1)"""
@@ -100,8 +109,15 @@ def ease_in_out(t):
     """Ease-in-out function for smooth animations"""
     return t * t * (3 - 2 * t)
 
+_wrap_cache = register_cache(OrderedDict())  # Emptied on pygame.quit() with the fonts
+
 def wrap_text(text, font, max_width):
-    """Wrap text to fit within specified width"""
+    """Wrap text to fit within specified width (memoized per text, font and width)"""
+    key = (text, font, max_width)
+    if key in _wrap_cache:
+        _wrap_cache.move_to_end(key)
+        return list(_wrap_cache[key])
+    
     words = text.split(' ')
     lines = []
     current_line = []
@@ -120,6 +136,9 @@ def wrap_text(text, font, max_width):
     if current_line:
         lines.append(' '.join(current_line))
     
+    _wrap_cache[key] = tuple(lines)
+    if len(_wrap_cache) > WRAP_CACHE_SIZE:
+        _wrap_cache.popitem(last=False)
     return lines
 
 def format_time(seconds):
@@ -148,21 +167,219 @@ def get_neighbors(x, y, width, height, include_diagonal=False):
     
     return neighbors
 
+class AStarPathfinder:
+    """A* search over a MazeGrid with reusable scratch buffers
+    
+    Per-tile scores live in flat arrays indexed like the maze buffer. Entries
+    are only trusted when their stamp matches the current search id, so the
+    arrays never need clearing between searches. An unbounded search across
+    a 1001x1001 maze still takes hundreds of milliseconds; pass limit to
+    keep one inside a frame.
+    """
+    
+    def __init__(self):
+        self.size = 0
+        self.search_id = 0
+        self.g_scores = array('i')
+        self.parents = array('i')
+        self.open_stamps = array('I')
+        self.closed_stamps = array('I')
+        
+        # Buffer index -> tile column / row, for the heuristic without divmod
+        self.shape = None
+        self.columns = array('i')
+        self.rows = array('i')
+    
+    def _coordinates(self, maze):
+        """Get the column and row tables for a maze's buffer layout"""
+        shape = (maze.stride, len(maze.cells))
+        if shape != self.shape:
+            stride, size = shape
+            self.columns = array('i', range(stride)) * (size // stride)
+            self.rows = array('i', [row for row in range(size // stride) for _ in range(stride)])
+            self.shape = shape
+        return self.columns, self.rows
+    
+    def _prepare(self, size):
+        """Grow the scratch buffers if needed and start a new search id"""
+        if size > self.size or self.search_id >= 0xFFFFFFFF:
+            self.size = max(size, self.size)
+            self.g_scores = array('i', [0]) * self.size
+            self.parents = array('i', [-1]) * self.size
+            self.open_stamps = array('I', [0]) * self.size
+            self.closed_stamps = array('I', [0]) * self.size
+            self.search_id = 0
+        self.search_id += 1
+        return self.search_id
+    
+    def find_path(self, maze, start, goal, limit=None):
+        """Find a shortest path from start to goal
+        
+        Returns the list of tiles after start up to and including goal,
+        an empty list if start == goal, or None if goal is unreachable.
+        limit caps the tiles expanded; a search that reaches it gives up
+        and returns None as well.
+        """
+        if not (maze.is_walkable(*start) and maze.is_walkable(*goal)):
+            return None
+        if start == goal:
+            return []
+        
+        search_id = self._prepare(len(maze.cells))
+        columns, rows = self._coordinates(maze)
+        g_scores = self.g_scores
+        parents = self.parents
+        open_stamps = self.open_stamps
+        closed_stamps = self.closed_stamps
+        cells = maze.cells
+        offsets = maze.neighbor_offsets
+        
+        start_index = maze.index(*start)
+        goal_index = maze.index(*goal)
+        goal_x = columns[goal_index]
+        goal_y = rows[goal_index]
+        
+        g_scores[start_index] = 0
+        parents[start_index] = -1
+        open_stamps[start_index] = search_id
+        
+        # With unit steps and the Manhattan heuristic a step changes h by
+        # exactly one, so a neighbour's f is either the current f or f + 2.
+        # Two buckets replace the heap: tiles with the current f and tiles
+        # with the next. Popping the current bucket last-in first-out
+        # follows the newest (closest to the goal) tile on equal f.
+        current = [start_index]
+        following = []
+        budget = -1 if limit is None else limit
+        
+        while current:
+            while current:
+                index = current.pop()
+                if closed_stamps[index] == search_id:
+                    continue
+                if index == goal_index:
+                    return self._build_path(maze, start_index, goal_index)
+                if budget == 0:
+                    return None
+                budget -= 1
+                closed_stamps[index] = search_id
+                
+                h = abs(goal_x - columns[index]) + abs(goal_y - rows[index])
+                next_g = g_scores[index] + 1
+                for offset in offsets:
+                    neighbor = index + offset
+                    if cells[neighbor] != FLOOR or closed_stamps[neighbor] == search_id:
+                        continue
+                    if open_stamps[neighbor] == search_id and g_scores[neighbor] <= next_g:
+                        continue
+                    
+                    open_stamps[neighbor] = search_id
+                    g_scores[neighbor] = next_g
+                    parents[neighbor] = index
+                    if abs(goal_x - columns[neighbor]) + abs(goal_y - rows[neighbor]) < h:
+                        current.append(neighbor)
+                    else:
+                        following.append(neighbor)
+            current, following = following, current
+        
+        return None
+    
+    def _build_path(self, maze, start_index, goal_index):
+        """Walk parent links back from the goal"""
+        path = []
+        index = goal_index
+        while index != start_index:
+            path.append(maze.position(index))
+            index = self.parents[index]
+        path.reverse()
+        return path
+
+class PathfindingState:
+    """One thread's A* scratch buffers, path cache and last tree index"""
+    
+    def __init__(self):
+        self.pathfinder = AStarPathfinder()
+        self.path_cache = OrderedDict()
+        self.tree_index = None  # MazeTreeIndex of the last maze find_path was asked about
+
+# The level preloader builds labyrinths (which may path-find) on a worker
+# thread, so every thread gets its own scratch buffers and caches
+_thread_state = threading.local()
+
+def pathfinding_state():
+    """Get the calling thread's PathfindingState"""
+    state = getattr(_thread_state, 'state', None)
+    if state is None:
+        state = _thread_state.state = PathfindingState()
+    return state
+
+def tree_index_for(maze):
+    """Get a MazeTreeIndex for the maze as it is now (kept for one maze per thread)"""
+    state = pathfinding_state()
+    tree_index = state.tree_index
+    if tree_index is None or tree_index.maze is not maze or tree_index.maze_version != maze.version:
+        tree_index = state.tree_index = MazeTreeIndex(maze)
+    return tree_index
+
+def find_path(start_x, start_y, target_x, target_y, maze, tree_index=None):
+    """Find a shortest path, memoized per (start, goal, level)
+    
+    Perfect mazes (every generator carves one) have a single path between
+    two tiles, which is read from the maze's tree index in time linear in
+    its length; tree_index passes an index the caller already has (see
+    Labyrinth.prepare_paths), else one is built for the maze on first use,
+    which takes seconds on a 1001x1001 maze. Mazes with loops or edits fall
+    back to A*, which gives up after PATH_SEARCH_LIMIT tiles: far targets
+    on big looped mazes then come back as None, like unreachable ones.
+    
+    Paths are memoized per thread (see PathfindingState), so it is safe to
+    call from the level preloader's worker.
+    
+    Returns a tuple of tiles from the step after start up to the target,
+    an empty tuple if already there, or None if the target is unreachable.
+    """
+    start = (int(start_x), int(start_y))
+    goal = (int(target_x), int(target_y))
+    key = (start, goal, maze.grid_id, maze.version)
+    state = pathfinding_state()
+    path_cache = state.path_cache
+    
+    if key in path_cache:
+        path_cache.move_to_end(key)
+        return path_cache[key]
+    
+    if tree_index is None or tree_index.maze is not maze:
+        tree_index = tree_index_for(maze)
+    if tree_index.is_valid():
+        path = tree_index.path(start[0], start[1], goal[0], goal[1])
+    else:
+        path = state.pathfinder.find_path(maze, start, goal, PATH_SEARCH_LIMIT)
+    if path is not None:
+        path = tuple(path)
+    
+    path_cache[key] = path
+    if len(path_cache) > PATH_CACHE_SIZE:
+        path_cache.popitem(last=False)
+    return path
+
+def clear_path_cache():
+    """Drop the calling thread's memoized paths"""
+    pathfinding_state().path_cache.clear()
+
 def pathfind_simple(start_x, start_y, target_x, target_y, maze):
-    """Simple A* pathfinding implementation"""
-    # This is a simplified version - for full A* implementation,
-    # you would need priority queues and more complex logic
+    """Shortest path (see find_path) as a list of (dx, dy) moves
     
-    # For now, return the direct path preference
-    dx = target_x - start_x
-    dy = target_y - start_y
+    The list is empty if the start is the target or the target cannot be
+    reached.
+    """
+    path = find_path(start_x, start_y, target_x, target_y, maze)
+    if not path:
+        return []
     
     moves = []
-    if abs(dx) > abs(dy):
-        moves.append((1 if dx > 0 else -1, 0))
-        moves.append((0, 1 if dy > 0 else -1))
-    else:
-        moves.append((0, 1 if dy > 0 else -1))
-        moves.append((1 if dx > 0 else -1, 0))
+    previous_x, previous_y = int(start_x), int(start_y)
+    for x, y in path:
+        moves.append((x - previous_x, y - previous_y))
+        previous_x, previous_y = x, y
     
     return moves
@@ -1,12 +1,20 @@
 import pygame
+import itertools
 import math
 import random
 from settings import *
 from items import generate_zombie_loot
 
+# Stable ids for zombies (used for battle animations)
+_zombie_ids = itertools.count(1)
+
 class Zombie:
-    def __init__(self, x, y, speed, level=1):
-        """Initialize zombie with position, speed, and level-based stats"""
+    def __init__(self, x, y, speed, level=1, rng=None):
+        """Initialize zombie with position, speed, and level-based stats
+        rng orders the random fallback moves (defaults to the global random module)
+        """
+        self.uid = next(_zombie_ids)
+        self.rng = rng if rng is not None else random
         self.x = x
         self.y = y
         self.speed = speed
@@ -22,17 +30,24 @@ class Zombie:
         
         # Loot generation
         self.can_drop_loot = True
-        
-    def update(self, player_x, player_y, maze, dt):
+    
+    def update(self, player_x, player_y, maze, dt, flow_field=None):
         """Update zombie AI - chase player through maze"""
         self.last_move_time += dt
         
         if self.last_move_time >= self.move_cooldown:
-            self.chase_player(player_x, player_y, maze)
+            self.chase_player(player_x, player_y, maze, flow_field)
             self.last_move_time = 0
     
-    def chase_player(self, player_x, player_y, maze):
-        """Simple AI to chase player through the maze"""
+    def chase_player(self, player_x, player_y, maze, flow_field=None):
+        """Chase the player, following the shared flow field when available"""
+        if flow_field is not None:
+            step = flow_field.next_step(self.x, self.y)
+            if step is not None:
+                self.x, self.y = step
+                return
+        
+        # Fallback: greedy move towards the player
         # Calculate distance to player
         dx = player_x - self.x
         dy = player_y - self.y
@@ -76,7 +91,7 @@ class Zombie:
         
         # If no preferred move works, try random movement
         directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        random.shuffle(directions)
+        self.rng.shuffle(directions)
         
         for move_dx, move_dy in directions:
             new_x = self.x + move_dx
@@ -89,26 +104,14 @@ class Zombie:
     
     def is_valid_move(self, x, y, maze):
         """Check if the zombie can move to this position"""
-        # Check bounds
-        if x < 0 or x >= len(maze[0]) or y < 0 or y >= len(maze):
-            return False
-        
-        # Check for walls
-        if maze[y][x] == 1:
-            return False
-        
-        return True
+        # Bounds and walls are both handled by the maze grid
+        return maze.is_walkable(x, y)
     
-    def draw(self, screen):
-        """Draw the zombie on screen"""
-        # Calculate screen position
-        maze_pixel_width = MAZE_WIDTH * CELL_SIZE
-        maze_pixel_height = MAZE_HEIGHT * CELL_SIZE
-        offset_x = (SCREEN_WIDTH - maze_pixel_width) // 2
-        offset_y = (SCREEN_HEIGHT - maze_pixel_height) // 2
-        
-        screen_x = offset_x + self.x * CELL_SIZE
-        screen_y = offset_y + self.y * CELL_SIZE
+    def draw(self, screen, camera):
+        """Draw the zombie on screen if it is inside the camera's view"""
+        if not camera.is_visible(self.x, self.y):
+            return
+        screen_x, screen_y = camera.world_to_screen(self.x, self.y)
         
         # Draw zombie as red rectangle with animation
         zombie_rect = pygame.Rect(screen_x + 3, screen_y + 3, CELL_SIZE - 6, CELL_SIZE - 6)
@@ -125,11 +128,11 @@ class Zombie:
         """Calculate distance to player"""
         return math.sqrt((self.x - player_x)**2 + (self.y - player_y)**2)
     
-    def drop_loot(self):
+    def drop_loot(self, rng=None):
         """Generate loot when zombie is killed"""
         if self.can_drop_loot:
             self.can_drop_loot = False  # Prevent multiple drops
-            return generate_zombie_loot()
+            return generate_zombie_loot(rng)
         return None
     
     def take_damage(self, damage):
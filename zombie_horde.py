@@ -0,0 +1,342 @@
+"""
+Zombie horde for Zombie Dungeon Escape
+Structure-of-arrays zombie storage with batched NumPy updates
+"""
+
+import math
+import numpy as np
+from settings import *
+from maze_grid import FLOOR
+from items import generate_zombie_loot
+
+_NO_MOVE = np.iinfo(np.int32).max
+_DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+class ZombieHorde:
+    """All zombies of a level stored in parallel NumPy arrays
+    
+    Slots [0, count) are live. Removing a zombie moves the last one into its
+    slot, so each zombie also has a stable uid. ZombieView objects give the
+    per-zombie interface (x, y, hp, take_damage, ...) that BattleSystem, the
+    occupancy index and the renderer expect.
+    """
+    
+    def __init__(self, capacity=16, rng=None):
+        self.count = 0
+        self.capacity = 0
+        self.next_uid = 1
+        self.slot_of = {}  # uid -> slot
+        self.views = {}    # uid -> ZombieView
+        self.rng = rng if rng is not None else np.random.default_rng()
+        
+        self.uids = np.zeros(0, dtype=np.int64)
+        self.xs = np.zeros(0, dtype=np.int32)
+        self.ys = np.zeros(0, dtype=np.int32)
+        self.prev_xs = np.zeros(0, dtype=np.int32)  # Position one tick ago
+        self.prev_ys = np.zeros(0, dtype=np.int32)
+        self.hp = np.zeros(0, dtype=np.int32)
+        self.max_hp = np.zeros(0, dtype=np.int32)
+        self.attack = np.zeros(0, dtype=np.int32)
+        self.defense = np.zeros(0, dtype=np.int32)
+        self.level = np.zeros(0, dtype=np.int32)
+        self.speed = np.zeros(0, dtype=np.float32)
+        self.move_timers = np.zeros(0, dtype=np.float64)
+        self.move_cooldowns = np.zeros(0, dtype=np.float64)
+        self.can_drop_loot = np.zeros(0, dtype=bool)
+        self._grow(capacity)
+    
+    _COLUMNS = ('uids', 'xs', 'ys', 'prev_xs', 'prev_ys', 'hp', 'max_hp', 'attack', 'defense', 'level',
+                'speed', 'move_timers', 'move_cooldowns', 'can_drop_loot')
+    
+    def _grow(self, capacity):
+        """Resize every column to hold at least capacity zombies"""
+        capacity = max(capacity, self.capacity * 2)
+        for name in self._COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+    
+    def spawn(self, x, y, speed, level=1):
+        """Add a zombie and return its view"""
+        if self.count == self.capacity:
+            self._grow(self.count + 1)
+        
+        slot = self.count
+        uid = self.next_uid
+        self.next_uid += 1
+        
+        self.uids[slot] = uid
+        self.xs[slot] = x
+        self.ys[slot] = y
+        self.prev_xs[slot] = x
+        self.prev_ys[slot] = y
+        self.speed[slot] = speed
+        self.level[slot] = level
+        self.max_hp[slot] = ZOMBIE_BASE_HP + (level * 5)
+        self.hp[slot] = self.max_hp[slot]
+        self.attack[slot] = ZOMBIE_BASE_ATTACK + (level * 2)
+        self.defense[slot] = max(0, level - 1)
+        self.move_timers[slot] = 0
+        self.move_cooldowns[slot] = 0.5  # Seconds between moves
+        self.can_drop_loot[slot] = True
+        
+        self.count += 1
+        self.slot_of[uid] = slot
+        view = ZombieView(self, uid)
+        self.views[uid] = view
+        return view
+    
+    def remove(self, zombie):
+        """Remove a zombie (given its view) by swapping the last one in"""
+        slot = self.slot_of.pop(zombie.uid, None)
+        if slot is None:
+            return False
+        del self.views[zombie.uid]
+        
+        last = self.count - 1
+        if slot != last:
+            for name in self._COLUMNS:
+                column = getattr(self, name)
+                column[slot] = column[last]
+            self.slot_of[int(self.uids[slot])] = slot
+        self.count = last
+        return True
+    
+    def clear(self):
+        """Remove every zombie, keeping the allocated arrays"""
+        self.count = 0
+        self.slot_of.clear()
+        self.views.clear()
+    
+    def update(self, dt, flow_field):
+        """Advance move timers and step every ready zombie down the flow field
+        
+        Returns the slots of the zombies that moved.
+        """
+        ready = self._ready(dt)
+        return self._follow_field(ready, flow_field, 0, 0)
+    
+    def update_windowed(self, dt, flow_field, target_x, target_y):
+        """Like update, for a WindowedFlowField over an unbounded maze
+        
+        Zombies inside the field's window follow it; the rest step greedily
+        towards the target (the player). Returns the slots that moved.
+        """
+        ready = self._ready(dt)
+        if ready.size == 0:
+            return ready
+        
+        origin_x, origin_y = flow_field.origin
+        local_x = self.xs[ready] - origin_x
+        local_y = self.ys[ready] - origin_y
+        side = flow_field.side
+        inside = (local_x >= 0) & (local_x < side) & (local_y >= 0) & (local_y < side)
+        
+        moved = self._follow_field(ready[inside], flow_field.field, origin_x, origin_y)
+        maze = flow_field.maze
+        greedy = [slot for slot in ready[~inside] if self._step_greedy(slot, maze, target_x, target_y)]
+        if not greedy:
+            return moved
+        return np.concatenate((moved, np.array(greedy, dtype=np.intp)))
+    
+    def _ready(self, dt):
+        """Start a tick: advance move timers and return the slots due to move"""
+        count = self.count
+        if count == 0:
+            return np.zeros(0, dtype=np.intp)
+        
+        # Remember where this tick started for render interpolation
+        self.prev_xs[:count] = self.xs[:count]
+        self.prev_ys[:count] = self.ys[:count]
+        
+        timers = self.move_timers[:count]
+        timers += dt
+        ready = np.flatnonzero(timers >= self.move_cooldowns[:count])
+        timers[ready] = 0
+        return ready
+    
+    def _follow_field(self, ready, flow_field, origin_x, origin_y):
+        """Step the given zombies down a flow field whose tile (0, 0) is world (origin_x, origin_y)"""
+        if ready.size == 0:
+            return ready
+        
+        maze = flow_field.maze
+        stride = maze.stride
+        distances = np.frombuffer(flow_field.distances, dtype=np.int32)
+        cells = np.frombuffer(maze.cells, dtype=np.uint8)
+        offsets = np.array(maze.neighbor_offsets, dtype=np.int64)
+        
+        # Buffer index of each ready zombie and of its four neighbours
+        index = ((self.ys[ready].astype(np.int64) - origin_y + 1) * stride
+                 + self.xs[ready] - origin_x + 1)
+        neighbors = index[:, None] + offsets[None, :]
+        current = distances[index]
+        neighbor_distances = distances[neighbors]
+        
+        # Downhill move: the reachable neighbour with the smallest distance
+        downhill = (neighbor_distances >= 0) & (neighbor_distances < current[:, None])
+        choice = np.where(downhill, neighbor_distances, _NO_MOVE).argmin(axis=1)
+        rows = np.arange(ready.size)
+        has_move = downhill[rows, choice]
+        target = neighbors[rows, choice]
+        
+        # Zombies the field cannot reach wander to a random open neighbour
+        stuck = np.flatnonzero(~has_move & (current != 0))
+        if stuck.size:
+            open_tiles = cells[neighbors[stuck]] == FLOOR
+            keys = np.where(open_tiles, self.rng.random(open_tiles.shape), -1.0)
+            pick = keys.argmax(axis=1)
+            can_move = open_tiles[np.arange(stuck.size), pick]
+            wanderers = stuck[can_move]
+            target[wanderers] = neighbors[wanderers, pick[can_move]]
+            has_move[wanderers] = True
+        
+        moved = ready[has_move]
+        new_y, new_x = np.divmod(target[has_move], stride)
+        self.xs[moved] = new_x - 1 + origin_x
+        self.ys[moved] = new_y - 1 + origin_y
+        return moved
+    
+    def _step_greedy(self, slot, maze, target_x, target_y):
+        """Move one zombie a tile towards the target without a field
+        
+        Tries the axis with the larger gap first, then the other, then the
+        four directions in an order drawn from the horde's rng. Returns True
+        if the zombie moved.
+        """
+        x = int(self.xs[slot])
+        y = int(self.ys[slot])
+        dx = target_x - x
+        dy = target_y - y
+        horizontal = (1 if dx > 0 else -1, 0)
+        vertical = (0, 1 if dy > 0 else -1)
+        moves = [horizontal, vertical] if abs(dx) > abs(dy) else [vertical, horizontal]
+        
+        for move_x, move_y in moves:
+            if maze.is_walkable(x + move_x, y + move_y):
+                self.xs[slot] = x + move_x
+                self.ys[slot] = y + move_y
+                return True
+        
+        for direction in self.rng.permutation(len(_DIRECTIONS)):
+            move_x, move_y = _DIRECTIONS[direction]
+            if maze.is_walkable(x + move_x, y + move_y):
+                self.xs[slot] = x + move_x
+                self.ys[slot] = y + move_y
+                return True
+        return False
+    
+    def find_at(self, x, y):
+        """Get the view of a zombie standing on (x, y), or None"""
+        count = self.count
+        hits = np.flatnonzero((self.xs[:count] == x) & (self.ys[:count] == y))
+        if hits.size == 0:
+            return None
+        return self.views[int(self.uids[hits[0]])]
+    
+    def views_for(self, slots):
+        """Get views for an array of slots"""
+        uids = self.uids
+        return [self.views[int(uids[slot])] for slot in slots]
+    
+    def __iter__(self):
+        return iter(self.views_for(range(self.count)))
+    
+    def __len__(self):
+        return self.count
+    
+    def __contains__(self, zombie):
+        return getattr(zombie, 'uid', None) in self.slot_of
+
+class ZombieView:
+    """Per-zombie handle onto one slot of a ZombieHorde"""
+    
+    def __init__(self, horde, uid):
+        self.horde = horde
+        self.uid = uid
+    
+    @property
+    def slot(self):
+        return self.horde.slot_of[self.uid]
+    
+    def _get(self, column):
+        return getattr(self.horde, column)[self.horde.slot_of[self.uid]]
+    
+    def _set(self, column, value):
+        getattr(self.horde, column)[self.horde.slot_of[self.uid]] = value
+    
+    @property
+    def x(self):
+        return int(self._get('xs'))
+    
+    @x.setter
+    def x(self, value):
+        self._set('xs', value)
+    
+    @property
+    def y(self):
+        return int(self._get('ys'))
+    
+    @y.setter
+    def y(self, value):
+        self._set('ys', value)
+    
+    @property
+    def hp(self):
+        return int(self._get('hp'))
+    
+    @hp.setter
+    def hp(self, value):
+        self._set('hp', value)
+    
+    @property
+    def max_hp(self):
+        return int(self._get('max_hp'))
+    
+    @property
+    def attack(self):
+        return int(self._get('attack'))
+    
+    @property
+    def defense(self):
+        return int(self._get('defense'))
+    
+    @property
+    def level(self):
+        return int(self._get('level'))
+    
+    @property
+    def speed(self):
+        return float(self._get('speed'))
+    
+    def render_position(self, alpha):
+        """Position interpolated between the last two ticks (alpha 0..1)"""
+        slot = self.slot
+        horde = self.horde
+        x = int(horde.prev_xs[slot])
+        y = int(horde.prev_ys[slot])
+        return (x + (int(horde.xs[slot]) - x) * alpha,
+                y + (int(horde.ys[slot]) - y) * alpha)
+    
+    def get_distance_to_player(self, player_x, player_y):
+        """Calculate distance to player"""
+        return math.sqrt((self.x - player_x)**2 + (self.y - player_y)**2)
+    
+    def drop_loot(self, rng=None):
+        """Generate loot when zombie is killed"""
+        if self._get('can_drop_loot'):
+            self._set('can_drop_loot', False)  # Prevent multiple drops
+            return generate_zombie_loot(rng)
+        return None
+    
+    def take_damage(self, damage):
+        """Take damage and return True if zombie dies"""
+        actual_damage = max(1, damage - self.defense)
+        self.hp = max(0, self.hp - actual_damage)
+        return self.hp <= 0
+    
+    def is_alive(self):
+        """Check if zombie is still alive"""
+        return self.hp > 0